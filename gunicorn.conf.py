@@ -0,0 +1,31 @@
+"""Gunicorn settings for production serving of ``server:app`` with uvicorn workers."""
+
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+# OCR is CPU-bound, so default to one worker per core; override with WEB_CONCURRENCY.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# Exported before the app is preloaded so each worker sizes its OCR scheduler
+# to its share of the cores (see src.utils.scheduler.per_process).
+os.environ["WEB_CONCURRENCY"] = str(workers)
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "300"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+accesslog = "-"
+
+
+def on_starting(server):
+    from src.utils.warmup import preload
+
+    preload()
+
+
+def post_worker_init(worker):
+    from src.utils.warmup import warm_worker
+
+    warm_worker()
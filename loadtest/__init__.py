@@ -0,0 +1 @@
+"""End-to-end load-testing harness for the recruiter API."""
@@ -0,0 +1,14 @@
+"""ASGI entrypoint used by the harness: ``server:app`` with an optional Mongo stand-in."""
+
+from __future__ import annotations
+
+import os
+
+if os.getenv("LOADTEST_MONGO", "stub") == "stub":
+    from loadtest import mongo_stub
+
+    mongo_stub.install()
+
+from server import app  # noqa: E402
+
+__all__ = ["app"]
@@ -0,0 +1,165 @@
+"""OpenAI-compatible mock server with latency, rate-limit and error injection."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+MOCK_ANSWER = (
+    "Candidato com experiência em Python, liderança técnica e arquiteturas com LLMs. "
+    "Atende aos requisitos informados."
+)
+
+
+@dataclass(slots=True)
+class MockLLMConfig:
+    latency_ms: float = 800.0
+    jitter_ms: float = 200.0
+    rate_limit: float = 0.0
+    error_rate: float = 0.0
+    answer: str = MOCK_ANSWER
+
+    @classmethod
+    def from_env(cls) -> "MockLLMConfig":
+        return cls(
+            latency_ms=float(os.getenv("MOCK_LLM_LATENCY_MS", "800")),
+            jitter_ms=float(os.getenv("MOCK_LLM_JITTER_MS", "200")),
+            rate_limit=float(os.getenv("MOCK_LLM_RATE_LIMIT", "0")),
+            error_rate=float(os.getenv("MOCK_LLM_ERROR_RATE", "0")),
+            answer=os.getenv("MOCK_LLM_ANSWER", MOCK_ANSWER),
+        )
+
+
+class _TokenBucket:
+    """Requests-per-second limiter; ``rate <= 0`` disables it.
+
+    The bucket holds at least one token, so rates below 1/s still let a
+    request through every ``1 / rate`` seconds.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+def create_app(config: MockLLMConfig | None = None) -> FastAPI:
+    """Build the mock app exposing the endpoints used by ``LLMClient``."""
+    settings = config or MockLLMConfig.from_env()
+    bucket = _TokenBucket(settings.rate_limit)
+    mock = FastAPI(title="Mock LLM")
+
+    async def _simulate() -> JSONResponse | None:
+        if not bucket.acquire():
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": "1"},
+                content={"error": {"message": "Rate limit exceeded", "type": "rate_limit"}},
+            )
+        delay = max(0.0, random.gauss(settings.latency_ms, settings.jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+        if settings.error_rate and random.random() < settings.error_rate:
+            return JSONResponse(
+                status_code=500,
+                content={"error": {"message": "Injected failure", "type": "server_error"}},
+            )
+        return None
+
+    def _usage(prompt: str) -> dict[str, int]:
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = max(1, len(settings.answer) // 4)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    @mock.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        failure = await _simulate()
+        if failure is not None:
+            return failure
+        prompt = "".join(str(m.get("content", "")) for m in body.get("messages", []))
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": settings.answer},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": _usage(prompt),
+        }
+
+    @mock.post("/v1/responses")
+    async def responses(request: Request):
+        body = await request.json()
+        failure = await _simulate()
+        if failure is not None:
+            return failure
+        prompt = str(body.get("input", ""))
+        usage = _usage(prompt)
+        return {
+            "id": f"resp_{uuid.uuid4().hex}",
+            "object": "response",
+            "created_at": int(time.time()),
+            "model": body.get("model", "mock"),
+            "status": "completed",
+            "output": [
+                {
+                    "type": "message",
+                    "id": f"msg_{uuid.uuid4().hex}",
+                    "status": "completed",
+                    "role": "assistant",
+                    "content": [
+                        {"type": "output_text", "text": settings.answer, "annotations": []}
+                    ],
+                }
+            ],
+            "parallel_tool_calls": False,
+            "tool_choice": "auto",
+            "tools": [],
+            "usage": {
+                "input_tokens": usage["prompt_tokens"],
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens": usage["completion_tokens"],
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": usage["total_tokens"],
+            },
+        }
+
+    @mock.get("/v1/models")
+    def models() -> dict:
+        return {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "loadtest"}]}
+
+    return mock
+
+
+app = create_app()
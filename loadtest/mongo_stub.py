@@ -0,0 +1,285 @@
+"""In-memory stand-in for the subset of ``pymongo`` used by the application."""
+
+from __future__ import annotations
+
+import copy
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from bson import ObjectId
+
+_MISSING = object()
+
+
+def _resolve(document: Dict[str, Any], dotted_key: str) -> Any:
+    value: Any = document
+    for part in dotted_key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _match_value(value: Any, condition: Any) -> bool:
+    if isinstance(condition, dict) and any(key.startswith("$") for key in condition):
+        for operator, operand in condition.items():
+            if operator == "$in":
+                if isinstance(value, list):
+                    if not any(item in operand for item in value):
+                        return False
+                elif value not in operand:
+                    return False
+                continue
+            if operator == "$all":
+                if not isinstance(value, list) or not all(item in value for item in operand):
+                    return False
+                continue
+            if value is _MISSING or value is None:
+                return False
+            if operator == "$gte" and not value >= operand:
+                return False
+            if operator == "$lt" and not value < operand:
+                return False
+        return True
+    if isinstance(value, list) and not isinstance(condition, list):
+        return condition in value
+    return value == condition
+
+
+def _matches(document: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    for key, condition in (query or {}).items():
+        if key == "$and":
+            if not all(_matches(document, clause) for clause in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(_matches(document, clause) for clause in condition):
+                return False
+            continue
+        if not _match_value(_resolve(document, key), condition):
+            return False
+    return True
+
+
+def _project(document: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not projection:
+        return copy.deepcopy(document)
+    included = {key for key, flag in projection.items() if flag}
+    if not included:
+        return {
+            key: copy.deepcopy(value)
+            for key, value in document.items()
+            if projection.get(key, 1)
+        }
+    result = {key: copy.deepcopy(document[key]) for key in included if key in document}
+    if projection.get("_id", 1) and "_id" in document:
+        result["_id"] = document["_id"]
+    return result
+
+
+def _sort_key(field_name: str):
+    def key(document: Dict[str, Any]) -> tuple:
+        value = _resolve(document, field_name)
+        if value is _MISSING or value is None:
+            return (0, 0)
+        return (1, value)
+
+    return key
+
+
+@dataclass(slots=True)
+class InsertOneResult:
+    inserted_id: Any
+
+
+@dataclass(slots=True)
+class InsertManyResult:
+    inserted_ids: List[Any]
+
+
+@dataclass(slots=True)
+class UpdateResult:
+    matched_count: int
+    modified_count: int
+    upserted_id: Any = None
+
+
+@dataclass(slots=True)
+class BulkWriteResult:
+    matched_count: int
+    modified_count: int
+    upserted_count: int
+
+
+@dataclass(slots=True)
+class DeleteResult:
+    deleted_count: int
+
+
+class Cursor:
+    """Lazy cursor supporting ``sort``, ``limit`` and ``batch_size``."""
+
+    def __init__(self, documents: List[Dict[str, Any]]) -> None:
+        self._documents = documents
+        self._limit = 0
+
+    def sort(self, key: Any, direction: int = 1) -> "Cursor":
+        keys = key if isinstance(key, list) else [(key, direction)]
+        for field_name, field_direction in reversed(keys):
+            self._documents.sort(key=_sort_key(field_name), reverse=field_direction < 0)
+        return self
+
+    def limit(self, count: int) -> "Cursor":
+        self._limit = count
+        return self
+
+    def batch_size(self, _size: int) -> "Cursor":
+        return self
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self._limit:
+            return iter(self._documents[: self._limit])
+        return iter(self._documents)
+
+    def close(self) -> None:
+        self._documents = []
+
+
+class Collection:
+    """Thread-safe in-memory collection."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._documents: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def create_index(self, keys: Any, **_kwargs: Any) -> str:
+        return str(keys)
+
+    def insert_one(self, document: Dict[str, Any]) -> InsertOneResult:
+        stored = copy.deepcopy(document)
+        stored.setdefault("_id", ObjectId())
+        document.setdefault("_id", stored["_id"])
+        with self._lock:
+            self._documents.append(stored)
+        return InsertOneResult(inserted_id=stored["_id"])
+
+    def insert_many(self, documents: List[Dict[str, Any]], **_kwargs: Any) -> InsertManyResult:
+        return InsertManyResult(
+            inserted_ids=[self.insert_one(document).inserted_id for document in documents]
+        )
+
+    def find(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+        **_kwargs: Any,
+    ) -> Cursor:
+        with self._lock:
+            documents = [
+                _project(doc, projection) for doc in self._documents if _matches(doc, query)
+            ]
+        return Cursor(documents)
+
+    def find_one(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for document in self._documents:
+                if _matches(document, query):
+                    return _project(document, projection)
+        return None
+
+    def update_one(
+        self,
+        query: Dict[str, Any],
+        update: Dict[str, Any],
+        upsert: bool = False,
+    ) -> UpdateResult:
+        with self._lock:
+            for document in self._documents:
+                if _matches(document, query):
+                    before = copy.deepcopy(document)
+                    _apply_update(document, update, inserting=False)
+                    return UpdateResult(matched_count=1, modified_count=int(before != document))
+            if not upsert:
+                return UpdateResult(matched_count=0, modified_count=0)
+            document = {
+                key: value
+                for key, value in query.items()
+                if not key.startswith("$") and not isinstance(value, dict)
+            }
+            _apply_update(document, update, inserting=True)
+            document.setdefault("_id", ObjectId())
+            self._documents.append(document)
+            return UpdateResult(matched_count=0, modified_count=0, upserted_id=document["_id"])
+
+    def bulk_write(self, requests: List[Any], **_kwargs: Any) -> BulkWriteResult:
+        """Apply ``pymongo.UpdateOne`` requests, the only kind the app issues."""
+        results = [
+            self.update_one(request._filter, request._doc, upsert=request._upsert)
+            for request in requests
+        ]
+        return BulkWriteResult(
+            matched_count=sum(result.matched_count for result in results),
+            modified_count=sum(result.modified_count for result in results),
+            upserted_count=sum(result.upserted_id is not None for result in results),
+        )
+
+    def delete_one(self, query: Dict[str, Any]) -> DeleteResult:
+        with self._lock:
+            for index, document in enumerate(self._documents):
+                if _matches(document, query):
+                    del self._documents[index]
+                    return DeleteResult(deleted_count=1)
+        return DeleteResult(deleted_count=0)
+
+
+def _apply_update(document: Dict[str, Any], update: Dict[str, Any], *, inserting: bool) -> None:
+    for key, value in update.get("$set", {}).items():
+        document[key] = copy.deepcopy(value)
+    if inserting:
+        for key, value in update.get("$setOnInsert", {}).items():
+            document[key] = copy.deepcopy(value)
+
+
+class Database:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._collections: Dict[str, Collection] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> Collection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = Collection(name)
+            return self._collections[name]
+
+
+class MongoClient:
+    """Drop-in replacement for ``pymongo.MongoClient`` backed by process memory."""
+
+    def __init__(self, *_args: Any, **_kwargs: Any) -> None:
+        self._databases: Dict[str, Database] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> Database:
+        with self._lock:
+            if name not in self._databases:
+                self._databases[name] = Database(name)
+            return self._databases[name]
+
+
+def install() -> MongoClient:
+    """Route ``src.infra.database.script`` to a shared in-memory client."""
+    from src.infra.database import script
+
+    client = MongoClient()
+    script.get_client = lambda uri=None: client  # type: ignore[assignment]
+    return client
+
+
+__all__ = ["MongoClient", "install"]
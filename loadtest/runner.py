@@ -0,0 +1,290 @@
+"""Drive ``/api/pipeline/`` and ``/api/logs/`` concurrently and report latency stats."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+SAMPLE_LINES = [
+    "Lucas Rodrigues",
+    "Tech Lead de Inteligência Artificial",
+    "São Paulo - SP",
+    "Experiência: 8 anos com Python, FastAPI, Docker e Kubernetes.",
+    "Projetos com LLMs, LangChain, RAG e bases vetoriais (FAISS, Pinecone).",
+    "MLOps: MLflow, DVC, CI/CD, monitoramento de modelos em AWS.",
+    "Idiomas: Português nativo, Inglês fluente.",
+    "Formação: Bacharelado em Ciência da Computação.",
+]
+
+
+@dataclass(slots=True)
+class Sample:
+    endpoint: str
+    status: int
+    latency: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 300
+
+
+@dataclass(slots=True)
+class LoadReport:
+    duration: float
+    samples: List[Sample] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, object]:
+        endpoints: Dict[str, object] = {}
+        for name in sorted({sample.endpoint for sample in self.samples}):
+            endpoints[name] = _summarize([s for s in self.samples if s.endpoint == name], self.duration)
+        return {
+            "duration_s": round(self.duration, 3),
+            "overall": _summarize(self.samples, self.duration),
+            "endpoints": endpoints,
+        }
+
+
+def _percentile(values: Sequence[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _summarize(samples: Sequence[Sample], duration: float) -> Dict[str, object]:
+    latencies = [sample.latency * 1000 for sample in samples]
+    errors = [sample for sample in samples if not sample.ok]
+    statuses: Dict[str, int] = {}
+    for sample in samples:
+        key = str(sample.status) if sample.status else (sample.error or "error")
+        statuses[key] = statuses.get(key, 0) + 1
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / duration, 3) if duration else 0.0,
+        "error_rate": round(len(errors) / len(samples), 4) if samples else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 1),
+            "p90": round(_percentile(latencies, 90), 1),
+            "p95": round(_percentile(latencies, 95), 1),
+            "p99": round(_percentile(latencies, 99), 1),
+            "max": round(max(latencies), 1) if latencies else 0.0,
+        },
+        "statuses": statuses,
+    }
+
+
+def synthetic_resume() -> bytes:
+    """Render a small PNG resume so the harness works without fixtures."""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("L", (1240, 900), color=255)
+    draw = ImageDraw.Draw(image)
+    for index, line in enumerate(SAMPLE_LINES):
+        draw.text((60, 60 + index * 90), line, fill=0)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Process serving {url} exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"{url} did not become ready in {timeout:.0f}s")
+
+
+@contextmanager
+def _serve(app_path: str, port: int, env: Dict[str, str], ready_path: str, workers: int = 1) -> Iterator[str]:
+    base_url = f"http://127.0.0.1:{port}"
+    command = [
+        sys.executable, "-m", "uvicorn", app_path,
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    process = subprocess.Popen(command, env={**os.environ, **env})
+    try:
+        _wait_ready(base_url + ready_path, process)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def _run_load(
+    base_url: str,
+    files: Sequence[Tuple[str, bytes]],
+    args: argparse.Namespace,
+) -> LoadReport:
+    weights = _parse_mix(args.mix)
+    endpoints = list(weights)
+    budget = {"remaining": args.requests}
+    deadline = time.monotonic() + args.duration if args.duration else None
+    samples: List[Sample] = []
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+
+        async def worker(worker_id: int) -> None:
+            while True:
+                if deadline is not None:
+                    if time.monotonic() >= deadline:
+                        return
+                elif budget["remaining"] <= 0:
+                    return
+                else:
+                    budget["remaining"] -= 1
+                endpoint = random.choices(endpoints, weights=[weights[e] for e in endpoints])[0]
+                started = time.perf_counter()
+                try:
+                    if endpoint == "pipeline":
+                        picked = random.sample(list(files), k=min(args.files_per_request, len(files)))
+                        response = await client.post(
+                            "/api/pipeline/",
+                            data={
+                                "request_id": str(uuid.uuid4()),
+                                "user_id": f"loadtest-{worker_id % args.users}",
+                                **({"query": args.query} if args.query else {}),
+                                # Every request repeats the same files and query, so
+                                # the answer cache would serve all but the first.
+                                "use_cache": "true" if args.use_cache else "false",
+                            },
+                            files=[("files", (name, content)) for name, content in picked],
+                        )
+                    else:
+                        response = await client.get("/api/logs/")
+                    samples.append(Sample(endpoint, response.status_code, time.perf_counter() - started))
+                except httpx.HTTPError as exc:
+                    samples.append(
+                        Sample(endpoint, 0, time.perf_counter() - started, error=type(exc).__name__)
+                    )
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(index) for index in range(args.concurrency)))
+        return LoadReport(duration=time.perf_counter() - started, samples=samples)
+
+
+def _parse_mix(raw: str) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for item in raw.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in {"pipeline", "logs"}:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint in --mix: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def _load_files(paths: Sequence[str]) -> List[Tuple[str, bytes]]:
+    if not paths:
+        return [("synthetic_resume.png", synthetic_resume())]
+    return [(Path(path).name, Path(path).read_bytes()) for path in paths]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Load test the recruiter API end to end.")
+    parser.add_argument("--target", help="Use an already running API instead of spawning server:app")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the spawned API")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="Total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, default=0.0, help="Run for N seconds instead")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--mix", default="pipeline=4,logs=1", help="Endpoint weights, e.g. pipeline=4,logs=1")
+    parser.add_argument("--files", nargs="*", default=[], help="Resume files to upload (PDF/PNG/JPG)")
+    parser.add_argument("--files-per-request", type=int, default=1)
+    parser.add_argument("--users", type=int, default=4, help="Distinct user_id values")
+    parser.add_argument("--query", default=None, help="Optional query sent with pipeline requests")
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="Let repeated queries be answered from the answer cache (measures cached runs)",
+    )
+    parser.add_argument("--mongo", choices=["stub", "real"], default="stub")
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=200.0)
+    parser.add_argument("--llm-rate-limit", type=float, default=0.0, help="Mock LLM requests/s (0 = off)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Fraction of mock LLM 500s")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    files = _load_files(args.files)
+
+    with ExitStack() as stack:
+        base_url = args.target
+        if not base_url:
+            mock_url = stack.enter_context(
+                _serve(
+                    "loadtest.mock_llm:app",
+                    _free_port(),
+                    {
+                        "MOCK_LLM_LATENCY_MS": str(args.llm_latency_ms),
+                        "MOCK_LLM_JITTER_MS": str(args.llm_jitter_ms),
+                        "MOCK_LLM_RATE_LIMIT": str(args.llm_rate_limit),
+                        "MOCK_LLM_ERROR_RATE": str(args.llm_error_rate),
+                    },
+                    ready_path="/v1/models",
+                )
+            )
+            base_url = stack.enter_context(
+                _serve(
+                    "loadtest.app:app",
+                    _free_port(),
+                    {
+                        "LLM_PROVIDER": "openai",
+                        "LLM_API_KEY": "loadtest",
+                        "LLM_MODEL": "mock",
+                        "LLM_BASE_URL": f"{mock_url}/v1",
+                        "LOADTEST_MONGO": args.mongo,
+                    },
+                    ready_path="/health",
+                    workers=args.workers,
+                )
+            )
+        report = asyncio.run(_run_load(base_url, files, args))
+
+    summary = report.summary()
+    rendered = json.dumps(summary, indent=2, ensure_ascii=False)
+    print(rendered)
+    if args.output:
+        Path(args.output).write_text(rendered, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
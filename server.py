@@ -1,17 +1,34 @@
 from fastapi import FastAPI
 
-from src.modules.logs.log_controller import router as log_router
-from src.modules.pipeline.pipeline_controller import router as pipeline_router
+from src.utils.env import load_environment
+
+load_environment()
+
+from src.modules.ingestion.ingestion_controller import router as ingestion_router  # noqa: E402
+from src.modules.logs.log_controller import router as log_router  # noqa: E402
+from src.modules.pipeline.pipeline_controller import router as pipeline_router  # noqa: E402
+from src.modules.profiling.profiling_controller import get_service as get_profile_service  # noqa: E402
+from src.modules.profiling.profiling_controller import router as profiling_router  # noqa: E402
+from src.modules.profiling.profiling_middleware import ProfilingMiddleware  # noqa: E402
+from src.modules.profiling.profiling_service import get_settings as get_profiling_settings  # noqa: E402
 
 tags_metadata = [
     {
         "name": "Pipeline",
         "description": "Processamento completo de currículos: upload, OCR, uso de LLM e registro de logs.",
     },
+    {
+        "name": "Ingestion",
+        "description": "Ingestão em lote de arquivos ZIP com currículos, com progresso e retomada.",
+    },
     {
         "name": "Logs",
         "description": "Consulta e manutenção dos logs de uso registrados no MongoDB.",
     },
+    {
+        "name": "Profiling",
+        "description": "Perfis de requisições sinalizadas por um administrador (habilitado por configuração).",
+    },
 ]
 
 app = FastAPI(
@@ -25,8 +42,18 @@ app = FastAPI(
 )
 
 app.include_router(pipeline_router, prefix="/api")
+app.include_router(ingestion_router, prefix="/api")
 app.include_router(log_router, prefix="/api")
 
+# Profiling is opt-in: without PROFILING_ENABLED and PROFILING_ADMIN_TOKEN
+# neither the middleware nor the endpoints exist.
+profiling_settings = get_profiling_settings()
+if profiling_settings.enabled:
+    app.add_middleware(
+        ProfilingMiddleware, settings=profiling_settings, service_factory=get_profile_service
+    )
+    app.include_router(profiling_router, prefix="/api")
+
 
 @app.get("/health")
 def health_check() -> dict[str, str]:
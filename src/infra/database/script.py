@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import os
 from functools import lru_cache
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from pymongo import MongoClient
-from pymongo.collection import Collection
-from pymongo.database import Database
+from src.utils.env import load_environment
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+    from pymongo.collection import Collection
+    from pymongo.database import Database
 
 DEFAULT_URI = "mongodb://localhost:27017"
 DEFAULT_DB = "recruiter"
@@ -17,6 +20,9 @@ DEFAULT_DB = "recruiter"
 @lru_cache(maxsize=1)
 def get_client(uri: Optional[str] = None) -> MongoClient:
     """Return a cached MongoClient using env vars or provided URI."""
+    from pymongo import MongoClient
+
+    load_environment()
     mongo_uri = uri or os.getenv("MONGODB_URI", DEFAULT_URI)
     return MongoClient(mongo_uri)
 
@@ -0,0 +1,129 @@
+"""Domain service that persists and queries structured candidate profiles."""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from src.infra.database.script import get_collection
+
+from .entity.candidate_entity import CandidateProfile, ProfileConstraints
+from .profile_extractor import EXTRACTOR_VERSION
+
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
+INDEXED_FIELDS = (
+    "profile.skills",
+    "profile.languages",
+    "profile.locations",
+    "profile.years_experience",
+)
+
+
+def build_query(
+    constraints: ProfileConstraints, content_hashes: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """Translate hard constraints into a Mongo filter over the indexed profile fields.
+
+    Candidates whose years of experience, languages or location are unknown are
+    kept, so the LLM still gets to judge them.
+    """
+    clauses: List[Dict[str, Any]] = []
+    if content_hashes is not None:
+        clauses.append({"content_hash": {"$in": list(content_hashes)}})
+    for group in constraints.skill_groups:
+        clauses.append({"profile.skills": {"$in": list(group)}})
+    for group in constraints.language_groups:
+        clauses.append(
+            {"$or": [{"profile.languages": []}, {"profile.languages": {"$in": list(group)}}]}
+        )
+    if constraints.min_years:
+        clauses.append(
+            {
+                "$or": [
+                    {"profile.years_experience": None},
+                    {"profile.years_experience": {"$gte": constraints.min_years}},
+                ]
+            }
+        )
+    if constraints.locations:
+        clauses.append(
+            {
+                "$or": [
+                    {"profile.locations": []},
+                    {"profile.locations": {"$in": [*constraints.locations, "remoto"]}},
+                ]
+            }
+        )
+    if not clauses:
+        return {}
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+class CandidateService:
+    """Stores one profile per distinct document, keyed by its content hash."""
+
+    def __init__(self, collection: Optional[Collection] = None) -> None:
+        collection_name = os.getenv("MONGODB_CANDIDATES_COLLECTION", "candidates")
+        self._collection: Collection = collection or get_collection(collection_name)
+        self._indexed = False
+
+    def _ensure_indexes(self) -> None:
+        if self._indexed:
+            return
+        self._collection.create_index("content_hash", unique=True)
+        for field_name in INDEXED_FIELDS:
+            self._collection.create_index(field_name)
+        self._indexed = True
+
+    def create(
+        self, content_hash: str, profile: CandidateProfile, filename: Optional[str] = None
+    ) -> None:
+        self._ensure_indexes()
+        self._collection.update_one(
+            {"content_hash": content_hash},
+            {
+                "$set": {
+                    "profile": profile.to_document(),
+                    "extractor_version": EXTRACTOR_VERSION,
+                    "filename": filename,
+                    "updated_at": datetime.utcnow(),
+                }
+            },
+            upsert=True,
+        )
+
+    def findOne(self, content_hash: str) -> Optional[CandidateProfile]:
+        document = self._collection.find_one({"content_hash": content_hash}, {"profile": 1})
+        if document is None:
+            return None
+        return CandidateProfile.from_document(document.get("profile") or {})
+
+    def findMany(self, content_hashes: Iterable[str]) -> Dict[str, CandidateProfile]:
+        """Stored profiles for the given hashes; unknown or outdated documents are absent."""
+        documents = self._collection.find(
+            {
+                "content_hash": {"$in": list(content_hashes)},
+                "extractor_version": EXTRACTOR_VERSION,
+            },
+            {"content_hash": 1, "profile": 1},
+        )
+        return {
+            doc["content_hash"]: CandidateProfile.from_document(doc.get("profile") or {})
+            for doc in documents
+        }
+
+    def findAll(
+        self,
+        constraints: ProfileConstraints,
+        content_hashes: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """Content hashes of stored candidates that satisfy every hard constraint."""
+        documents = self._collection.find(
+            build_query(constraints, content_hashes), {"content_hash": 1}
+        )
+        return [doc["content_hash"] for doc in documents]
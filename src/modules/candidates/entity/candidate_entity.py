@@ -0,0 +1,51 @@
+"""Entities for structured candidate profiles."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass(slots=True)
+class CandidateProfile:
+    skills: List[str] = field(default_factory=list)
+    years_experience: Optional[float] = None
+    languages: List[str] = field(default_factory=list)
+    locations: List[str] = field(default_factory=list)
+    seniority: Optional[str] = None
+    education: Optional[str] = None
+
+    def to_document(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_document(cls, document: Dict[str, Any]) -> "CandidateProfile":
+        return cls(
+            skills=list(document.get("skills") or []),
+            years_experience=document.get("years_experience"),
+            languages=list(document.get("languages") or []),
+            locations=list(document.get("locations") or []),
+            seniority=document.get("seniority"),
+            education=document.get("education"),
+        )
+
+
+@dataclass(slots=True)
+class ProfileConstraints:
+    """Hard requirements parsed from a recruiter query.
+
+    ``skill_groups`` and ``language_groups`` are conjunctions of alternatives:
+    every group must have at least one entry present in the profile.
+    """
+
+    skill_groups: List[List[str]] = field(default_factory=list)
+    min_years: Optional[float] = None
+    language_groups: List[List[str]] = field(default_factory=list)
+    locations: List[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.skill_groups or self.min_years or self.language_groups or self.locations)
+
+    def to_document(self) -> Dict[str, Any]:
+        return asdict(self)
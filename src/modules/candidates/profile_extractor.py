@@ -0,0 +1,452 @@
+"""Deterministic extraction of candidate profiles and query constraints."""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+from .entity.candidate_entity import CandidateProfile, ProfileConstraints
+
+
+# Bump whenever extraction rules change. Stored profiles with another version
+# (or none, from before versioning) are ignored, so documents are re-extracted.
+EXTRACTOR_VERSION = 3
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents so 'Inglês' and 'ingles' compare equal."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _compile(patterns: Dict[str, str]) -> List[Tuple[str, Pattern[str]]]:
+    return [(name, re.compile(pattern)) for name, pattern in patterns.items()]
+
+
+# Patterns run against accent-folded, lowercased text.
+SKILL_PATTERNS = _compile(
+    {
+        "python": r"\bpython\b",
+        "java": r"\bjava\b(?!\s*script)",
+        "javascript": r"\bjavascript\b|\bjs\b",
+        "typescript": r"\btypescript\b",
+        "go": r"\bgolang\b",
+        "c#": r"(?<!\w)c#",
+        "c++": r"(?<!\w)c\+\+",
+        "php": r"\bphp\b",
+        "ruby": r"\bruby\b",
+        "rust": r"\brust\b",
+        "kotlin": r"\bkotlin\b",
+        "swift": r"\bswift\b",
+        "scala": r"\bscala\b",
+        "sql": r"\bsql\b",
+        "postgresql": r"\bpostgres(?:ql)?\b",
+        "mysql": r"\bmysql\b",
+        "sqlite": r"\bsqlite\b",
+        "mongodb": r"\bmongo(?:db)?\b",
+        "redis": r"\bredis\b",
+        "docker": r"\bdocker\b",
+        "kubernetes": r"\bkubernetes\b|\bk8s\b",
+        "terraform": r"\bterraform\b",
+        "aws": r"\baws\b|amazon web services",
+        "azure": r"\bazure\b",
+        "gcp": r"\bgcp\b|google cloud",
+        "react": r"\breact(?:\.?js)?\b",
+        "angular": r"\bangular\b",
+        "vue": r"\bvue(?:\.?js)?\b",
+        "node.js": r"\bnode(?:\.?js)?\b",
+        "django": r"\bdjango\b",
+        "flask": r"\bflask\b",
+        "fastapi": r"\bfastapi\b",
+        "spring": r"\bspring(?:\s*boot)?\b",
+        ".net": r"(?<!\w)\.net\b|\bdotnet\b",
+        "pandas": r"\bpandas\b",
+        "pytorch": r"\bpytorch\b",
+        "tensorflow": r"\btensorflow\b",
+        "scikit-learn": r"\bscikit[- ]?learn\b|\bsklearn\b",
+        "langchain": r"\blangchain\b",
+        "llm": r"\bllms?\b|large language models?",
+        "rag": r"\brag\b|retrieval[- ]augmented",
+        "nlp": r"\bnlp\b|\bpln\b|processamento de linguagem natural|natural language processing",
+        "machine learning": r"machine learning|aprendizado de maquina",
+        "mlops": r"\bmlops\b",
+        "mlflow": r"\bmlflow\b",
+        "airflow": r"\bairflow\b",
+        "spark": r"\bspark\b",
+        "kafka": r"\bkafka\b",
+        "git": r"\bgit\b",
+        "ci/cd": r"\bci\s*/\s*cd\b",
+        "linux": r"\blinux\b",
+        "power bi": r"\bpower\s*bi\b",
+        "excel": r"\bexcel\b",
+        "figma": r"\bfigma\b",
+        "scrum": r"\bscrum\b",
+    }
+)
+
+# Skills a CV shows without naming them: whoever lists Django knows Python.
+# Applied to profiles only, so a query naming React does not also demand JavaScript.
+SKILL_IMPLICATIONS: Dict[str, Tuple[str, ...]] = {
+    "postgresql": ("sql",),
+    "mysql": ("sql",),
+    "sqlite": ("sql",),
+    "typescript": ("javascript",),
+    "react": ("javascript",),
+    "vue": ("javascript",),
+    "angular": ("javascript",),
+    "node.js": ("javascript",),
+    "django": ("python",),
+    "flask": ("python",),
+    "fastapi": ("python",),
+    "pandas": ("python",),
+    "pytorch": ("python", "machine learning"),
+    "tensorflow": ("machine learning",),
+    "scikit-learn": ("python", "machine learning"),
+    "mlops": ("machine learning",),
+    "spring": ("java",),
+    "langchain": ("llm",),
+    "rag": ("llm",),
+}
+
+LANGUAGE_PATTERNS = _compile(
+    {
+        "pt": r"\bportugues\b|\bportuguese\b",
+        "en": r"\bingles\b|\benglish\b",
+        "es": r"\bespanhol\b|\bspanish\b",
+        "fr": r"\bfrances\b|\bfrench\b",
+        "de": r"\balemao\b|\bgerman\b",
+        "it": r"\bitaliano\b|\bitalian\b",
+        "zh": r"\bmandarim\b|\bchines\b|\bmandarin\b|\bchinese\b",
+        "ja": r"\bjapones\b|\bjapanese\b",
+    }
+)
+
+# Ordered from lowest to highest; the highest level found wins.
+SENIORITY_LEVELS = _compile(
+    {
+        "intern": r"\bestagi(?:ario|aria|o)\b|\bintern(?:ship)?\b",
+        "junior": r"\bjunior\b|\bjr\b",
+        "mid": r"\bpleno\b|\bmid[- ]level\b",
+        "senior": r"\bsenior\b|\bsr\b",
+        "specialist": r"\bespecialista\b|\bstaff\b|\bprincipal\b",
+        "lead": r"\btech ?lead\b|\blider tecnic[oa]\b|\bteam ?lead\b|\blead\b",
+        "manager": r"\bgerente\b|\bhead\b|\bdiretor(?:a)?\b|\bmanager\b|\bcto\b",
+    }
+)
+
+EDUCATION_LEVELS = _compile(
+    {
+        "high_school": r"ensino medio|\btecnico em\b",
+        "bachelor": r"\bbacharel(?:ado)?\b|\bgraduacao\b|\bgraduado\b|\blicenciatura\b"
+        r"|\btecnologo\b|ensino superior|\bbachelor",
+        "postgraduate": r"pos[- ]graduacao|\bmba\b|\bespecializacao\b",
+        "masters": r"\bmestrado\b|\bmestre\b|\bmaster'?s?\b|\bmsc\b",
+        "doctorate": r"\bdoutorado\b|\bdoutor(?:a)?\b|\bph\.?d\b",
+    }
+)
+
+BRAZILIAN_STATES = (
+    "AC AL AP AM BA CE DF ES GO MA MT MS MG PA PB PR PE PI RJ RN RS RO RR SC SP SE TO"
+).split()
+
+CITIES = (
+    "sao paulo", "rio de janeiro", "belo horizonte", "brasilia", "curitiba", "porto alegre",
+    "florianopolis", "recife", "salvador", "fortaleza", "manaus", "belem", "goiania",
+    "campinas", "vitoria", "natal", "joao pessoa", "maceio", "teresina", "sao luis",
+    "aracaju", "cuiaba", "campo grande", "porto velho", "macapa", "boa vista", "palmas",
+    "rio branco", "santos", "sorocaba", "ribeirao preto", "joinville", "londrina", "uberlandia",
+    "sao jose dos campos", "niteroi", "blumenau", "lisboa", "porto",
+)
+
+# State codes are uppercase acronyms like many others ("MS Excel", "abrir PR",
+# "Python e GO"), so they only count in a location context: right after a
+# place name ("Recife - PE", "São Paulo/SP", "Campinas (SP)") or after "em"
+# ("presencial em SP", "em SP ou RJ") when no product name follows.
+_STATE_CODES = "|".join(BRAZILIAN_STATES)
+STATE_AFTER_PLACE = re.compile(
+    rf"([^\W\d_]+)\s*(?:-|–|—|/|,|\()\s*({_STATE_CODES})\b(?!\.\w)"
+)
+STATE_AFTER_PREPOSITION = re.compile(
+    rf"(?i:\bem)\s+((?:{_STATE_CODES})(?:\s*(?:,|/|(?i:e|ou))\s*(?:{_STATE_CODES}))*)\b"
+    r"(?!\.\w|\s+[A-Z])"
+)
+STATE_CODE = re.compile(rf"\b({_STATE_CODES})\b")
+# "Go" the language, in the original casing so the verb "go" is not a skill;
+# "golang" is matched with the other skills.
+GO_PATTERN = re.compile(r"(?<![\w.-])(?:Go|GO)(?![\w.+#-])")
+# Longest first, so "porto alegre" is matched before "porto" can fire inside it.
+CITY_PATTERNS = [
+    (city, re.compile(rf"\b{re.escape(city)}\b")) for city in sorted(CITIES, key=len, reverse=True)
+]
+REMOTE_PATTERN = re.compile(r"\bremot[oa]\b|\bremote\b|home ?office")
+
+EXPLICIT_YEARS = [
+    re.compile(r"(\d{1,2})\s*\+?\s*anos?\s+(?:de\s+)?(?:experiencia|atuacao)"),
+    re.compile(r"experiencia\s+(?:profissional\s+)?de\s+(?:mais\s+de\s+)?(\d{1,2})\s*\+?\s*anos?"),
+    re.compile(r"(\d{1,2})\s*\+?\s*years?\s+(?:of\s+)?experience"),
+]
+DATE_RANGE = re.compile(
+    r"\b((?:19|20)\d{2})\s*(?:-|–|—|a|ate|to)\s*((?:19|20)\d{2}|atual|atualmente|presente"
+    r"|hoje|o momento|current|present|now)\b"
+)
+ONGOING = {"atual", "atualmente", "presente", "hoje", "o momento", "current", "present", "now"}
+# Date ranges of degrees and courses are not work experience: they are skipped
+# on lines that mention education, under an education heading, and when the
+# range stands alone right below such a line ("Bacharel em Computação\n2010 - 2014").
+EDUCATION_CONTEXT = re.compile(
+    r"\bformacao\b|\beducacao\b|\bescolaridade\b|\bgraduacao\b|\bgraduad[oa]\b|\bbacharel\w*"
+    r"|\blicenciatura\b|\btecnologo\b|\bmestrado\b|\bdoutorado\b|\bmba\b|\buniversi\w+"
+    r"|\bfaculdade\b|\bescola\b|\bcolegio\b|\bensino\b|\bcursos?\b|\beducation\b|\bdegree\b"
+    r"|\bbachelor\w*|\bcollege\b|\bschool\b"
+)
+# Short lines without digits are read as section headings.
+MAX_HEADING_LENGTH = 40
+
+# Upper bounds ("menos de 2 anos", "até 3 anos") are not minimums; such
+# clauses set no years filter and are left to the LLM.
+MAX_YEARS_QUERY = re.compile(
+    r"(?:menos de|ate|no maximo|maximo de|inferior a|abaixo de|less than|up to|at most|under)"
+    r"\s+(\d{1,2})\s*(?:anos?|years?)"
+)
+MIN_YEARS_QUERY = [
+    re.compile(r"(\d{1,2})\s*\+\s*(?:anos?|years?)"),
+    re.compile(r"(?:pelo menos|no minimo|minimo de|mais de|acima de|at least|over)\s+(\d{1,2})\s*(?:anos?|years?)"),
+    re.compile(r"(\d{1,2})\s*(?:anos?|years?)\s+(?:ou mais|or more)"),
+    re.compile(r"(\d{1,2})\s*(?:anos?|years?)\s+(?:de\s+)?(?:experiencia|experience)"),
+]
+# Skills named in a query only rank candidates unless the clause says they are
+# required ("Tech Lead com Python e RAG" ranks; "Python obrigatório" filters).
+REQUIRED_MARKERS = re.compile(
+    r"obrigatori[oa]s?|\brequisitos?\b|\bexig\w*|\bnecessari[oa]s?\b|imprescindive(?:l|is)"
+    r"|indispensave(?:l|is)|\bessencia(?:l|is)\b|\b(?:precisa|precisam|deve|devem) (?:ter|saber|conhecer)\b"
+    r"|\b(?:preciso|precisamos) de\b|\bquem (?:tem|possui|sabe|conhece|domina)\b"
+    r"|\bque (?:tenha|tenham|possua|possuam)\b|\b(?:apenas|somente)\b"
+    r"|\bmust\b|\brequired\b|\bmandatory\b|\bwho (?:has|have|knows?)\b|\bonly\b"
+)
+# Negated clauses ("não falam inglês", "sem Java") would invert the filter;
+# their skills and languages are left to the LLM.
+NEGATION_MARKERS = re.compile(r"\b(?:nao|sem|nenhum\w*|nunca|not|without|never)\b")
+# Languages only filter when the clause asks whether candidates speak them;
+# "Responda em inglês" is about the answer, not the candidates.
+LANGUAGE_MARKERS = re.compile(r"\bfala(?:m|r|nte)?\b|\bfluen\w*|\bspeaks?\b|\bfluent\b")
+_LANGUAGE_WORDS = "|".join(pattern.pattern for _name, pattern in LANGUAGE_PATTERNS)
+RESPONSE_LANGUAGE = re.compile(
+    rf"\b(?:respond\w*|respost\w*|escrev\w*|redij\w*|answer\w*|reply|write)\b[^:]*?"
+    rf"\b(?:em|in)\s+(?:{_LANGUAGE_WORDS})"
+)
+SOFT_MARKERS = re.compile(r"desejavel|diferencia(?:l|is)|\bplus\b|nice to have|preferencialmente|bonus")
+ALTERNATIVE_MARKERS = re.compile(r"\bou\b|\bor\b|/")
+CLAUSE_SPLIT = re.compile(r"[.;\n]+")
+
+# Long job descriptions list many technologies as context rather than as
+# must-haves; beyond this many skill groups the skill filter is not applied.
+MAX_HARD_SKILL_GROUPS = 5
+
+_PORTUGUESE_HINTS = re.compile(r"\b(?:experiencia|formacao|empresa|atuacao|desenvolvimento)\b")
+
+
+def _found(patterns: Iterable[Tuple[str, Pattern[str]]], text: str) -> List[str]:
+    return [name for name, pattern in patterns if pattern.search(text)]
+
+
+def _highest(levels: Sequence[Tuple[str, Pattern[str]]], text: str) -> Optional[str]:
+    found = _found(levels, text)
+    return found[-1] if found else None
+
+
+def _state_spans(original: str) -> List[Tuple[str, Tuple[int, int]]]:
+    """State codes used as locations in ``original``, with their positions.
+
+    Matching is case-sensitive so words like "para" or "se" never count.
+    """
+    spans: List[Tuple[str, Tuple[int, int]]] = []
+    for match in STATE_AFTER_PLACE.finditer(original):
+        place = match.group(1)
+        if place[0].isupper() and not _found(SKILL_PATTERNS, _fold(place)):
+            spans.append((match.group(2), match.span(2)))
+    for match in STATE_AFTER_PREPOSITION.finditer(original):
+        offset = match.start(1)
+        for code in STATE_CODE.finditer(match.group(1)):
+            spans.append((code.group(1), (offset + code.start(1), offset + code.end(1))))
+    return sorted(spans, key=lambda item: item[1])
+
+
+def _skills(folded: str, original: str) -> List[str]:
+    found = set(_found(SKILL_PATTERNS, folded))
+    if "go" not in found:
+        without_states = list(original)
+        for _code, (start, end) in _state_spans(original):
+            without_states[start:end] = " " * (end - start)
+        if GO_PATTERN.search("".join(without_states)):
+            found.add("go")
+    return [name for name, _ in SKILL_PATTERNS if name in found]
+
+
+def _implied(skills: Iterable[str]) -> List[str]:
+    """``skills`` plus every skill they imply, in ``SKILL_PATTERNS`` order."""
+    found = set(skills)
+    for skill in list(found):
+        found.update(SKILL_IMPLICATIONS.get(skill, ()))
+    return [name for name, _ in SKILL_PATTERNS if name in found]
+
+
+def _cities(folded: str) -> List[str]:
+    cities: List[str] = []
+    for city, pattern in CITY_PATTERNS:
+        if pattern.search(folded):
+            cities.append(city)
+            folded = pattern.sub(lambda match: " " * len(match.group()), folded)
+    return sorted(cities, key=CITIES.index)
+
+
+def _locations(folded: str, original: str) -> List[str]:
+    locations = _cities(folded)
+    locations.extend(
+        code.lower() for code in dict.fromkeys(code for code, _ in _state_spans(original))
+    )
+    if REMOTE_PATTERN.search(folded):
+        locations.append("remoto")
+    return locations
+
+
+def _years_experience(folded: str) -> Optional[float]:
+    explicit = [int(match) for pattern in EXPLICIT_YEARS for match in pattern.findall(folded)]
+    if explicit:
+        return float(max(explicit))
+
+    current_year = date.today().year
+    spans: List[Tuple[int, int]] = []
+    in_education = False
+    previous = ""
+    for line in folded.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if len(line) <= MAX_HEADING_LENGTH and not any(char.isdigit() for char in line):
+            in_education = bool(EDUCATION_CONTEXT.search(line))
+        ranges = DATE_RANGE.findall(line)
+        alone = ranges and len(DATE_RANGE.sub("", line).strip(" -|,:")) == 0
+        education = (
+            in_education
+            or EDUCATION_CONTEXT.search(line)
+            or (alone and EDUCATION_CONTEXT.search(previous))
+        )
+        previous = line
+        if education:
+            continue
+        for start, end in ranges:
+            end_year = current_year if end in ONGOING else int(end)
+            if int(start) <= end_year <= current_year:
+                spans.append((int(start), end_year))
+    if not spans:
+        return None
+    spans.sort()
+    total = 0
+    covered_until = None
+    for start, end in spans:
+        if covered_until is not None and start < covered_until:
+            start = covered_until
+        if end > start:
+            total += end - start
+        covered_until = max(covered_until or end, end)
+    return float(min(total, 50))
+
+
+def extract_profile(text: str) -> CandidateProfile:
+    """Build a structured profile from cleaned OCR text."""
+    folded = _fold(text)
+    languages = _found(LANGUAGE_PATTERNS, folded)
+    if "pt" not in languages and _PORTUGUESE_HINTS.search(folded):
+        languages.insert(0, "pt")
+    return CandidateProfile(
+        skills=_implied(_skills(folded, text)),
+        years_experience=_years_experience(folded),
+        languages=languages,
+        locations=_locations(folded, text),
+        seniority=_highest(SENIORITY_LEVELS, folded),
+        education=_highest(EDUCATION_LEVELS, folded),
+    )
+
+
+def _add_groups(groups: List[List[str]], found: List[str], folded: str) -> None:
+    """Add ``found`` as one any-of group when the clause lists alternatives."""
+    if len(found) > 1 and ALTERNATIVE_MARKERS.search(folded):
+        group = found
+        if group not in groups:
+            groups.append(group)
+        return
+    for name in found:
+        if [name] not in groups:
+            groups.append([name])
+
+
+def parse_constraints(query: str) -> ProfileConstraints:
+    """Extract hard requirements from a query, ignoring 'nice to have' clauses.
+
+    Skills and languages only become requirements in clauses that say so
+    explicitly and are not negated; alternatives ("Java ou Kotlin") form one
+    group. Upper bounds on years set no filter; locations are always read.
+    """
+    constraints = ProfileConstraints()
+    for clause in CLAUSE_SPLIT.split(query):
+        folded = _fold(clause)
+        if not folded.strip() or SOFT_MARKERS.search(folded):
+            continue
+        folded = RESPONSE_LANGUAGE.sub(" ", folded)
+        negated = bool(NEGATION_MARKERS.search(folded))
+        required = not negated and bool(REQUIRED_MARKERS.search(folded))
+
+        skills = _skills(folded, clause) if required else []
+        _add_groups(constraints.skill_groups, skills, folded)
+
+        if required or (not negated and LANGUAGE_MARKERS.search(folded)):
+            languages = [lang for lang in _found(LANGUAGE_PATTERNS, folded) if lang != "pt"]
+            _add_groups(constraints.language_groups, languages, folded)
+
+        if not MAX_YEARS_QUERY.search(folded):
+            for pattern in MIN_YEARS_QUERY:
+                match = pattern.search(folded)
+                if match:
+                    years = float(match.group(1))
+                    constraints.min_years = max(constraints.min_years or 0, years)
+                    break
+
+        if not REMOTE_PATTERN.search(folded):
+            for location in _locations(folded, clause):
+                if location not in constraints.locations:
+                    constraints.locations.append(location)
+
+    if len(constraints.skill_groups) > MAX_HARD_SKILL_GROUPS:
+        constraints.skill_groups = []
+    return constraints
+
+
+def matches(profile: CandidateProfile, constraints: ProfileConstraints) -> bool:
+    """Whether a profile satisfies every hard constraint; unknown fields never eliminate."""
+    skills = set(_implied(profile.skills))
+    for group in constraints.skill_groups:
+        if not skills.intersection(group):
+            return False
+
+    if profile.languages:
+        for group in constraints.language_groups:
+            if not set(profile.languages).intersection(group):
+                return False
+
+    if (
+        constraints.min_years
+        and profile.years_experience is not None
+        and profile.years_experience < constraints.min_years
+    ):
+        return False
+
+    if constraints.locations and profile.locations and "remoto" not in profile.locations:
+        if not set(constraints.locations).intersection(profile.locations):
+            return False
+
+    return True
+
+
+__all__ = ["EXTRACTOR_VERSION", "extract_profile", "matches", "parse_constraints"]
@@ -14,11 +14,15 @@ class ChatbotService:
     def __init__(self, client: LLMClient | None = None) -> None:
         self._client = client or LLMClient()
 
+    @property
+    def model(self) -> str:
+        return self._client.settings.model
+
     def findAll(self):  # pragma: no cover - placeholder for future history listing
         raise NotImplementedError("Listing chatbot conversations is not implemented yet")
 
     def create(self, data: ChatbotCreate) -> ChatCompletion:
-        answer = self._client.complete(data.query)
+        answer = self._client.complete(data.query, timeout=data.timeout)
         return ChatCompletion(answer=answer)
 
     def update(self, *_args, **_kwargs):  # pragma: no cover - placeholder
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
 class ChatbotCreate(BaseModel):
     query: str = Field(..., description="Texto enviado para o LLM")
+    timeout: Optional[float] = Field(
+        default=None, description="Tempo máximo, em segundos, para a resposta do LLM"
+    )
 
 
 class ChatbotResponse(BaseModel):
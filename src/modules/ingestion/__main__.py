@@ -0,0 +1,107 @@
+"""Bulk-ingest directories and ZIP archives of resumes.
+
+Usage::
+
+    python -m src.modules.ingestion ./curriculos historico_2023.zip --workers 8
+
+Progress is printed to stderr. Re-running with the same ``--checkpoint`` file
+skips everything that was already written, so an interrupted run resumes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import uuid
+from contextlib import ExitStack
+from typing import List, Optional, Sequence
+
+from src.utils.env import load_environment
+
+from .entity.ingestion_entity import IngestionProgress
+from .sources import IngestionItem, open_source
+
+
+def _format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+
+def _print_progress(progress: IngestionProgress) -> None:
+    done = progress.processed + progress.skipped
+    print(
+        f"[ingestion] {done}/{progress.total} "
+        f"ok={progress.succeeded} failed={progress.failed} skipped={progress.skipped} "
+        f"{progress.throughput:.2f} docs/s eta={_format_eta(progress.eta_seconds)}",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.modules.ingestion",
+        description="OCR, profile and summarise every resume in the given directories/ZIP archives.",
+    )
+    parser.add_argument("sources", nargs="+", help="Directories and/or ZIP archives")
+    parser.add_argument(
+        "--checkpoint",
+        default="ingestion-checkpoint.jsonl",
+        help="File recording ingested items; reuse it to resume (default: %(default)s)",
+    )
+    parser.add_argument("--job-id", help="Identifier stored with each result (default: random)")
+    parser.add_argument("--workers", type=int, help="Parallel workers (INGESTION_WORKERS)")
+    parser.add_argument("--batch-size", type=int, help="Results per Mongo insert (INGESTION_BATCH_SIZE)")
+    parser.add_argument(
+        "--max-in-flight", type=int, help="Items loaded at once (INGESTION_MAX_IN_FLIGHT)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    load_environment()
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    from .checkpoint import FileCheckpoint
+    from .ingestion_service import IngestionService, IngestionSettings
+
+    settings = IngestionSettings.from_env()
+    if args.workers:
+        settings.workers = args.workers
+        if not args.max_in_flight:
+            settings.max_in_flight = args.workers * 2
+    if args.batch_size:
+        settings.batch_size = args.batch_size
+    if args.max_in_flight:
+        settings.max_in_flight = args.max_in_flight
+
+    service = IngestionService(settings=settings)
+    job_id = args.job_id or uuid.uuid4().hex
+    with ExitStack() as stack:
+        items: List[IngestionItem] = []
+        for location in args.sources:
+            try:
+                source = stack.enter_context(open_source(location))
+            except (OSError, ValueError) as exc:
+                print(f"[ingestion] {exc}", file=sys.stderr)
+                return 2
+            items.extend(source.items())
+        progress = service.run(
+            job_id, items, FileCheckpoint(args.checkpoint), on_progress=_print_progress
+        )
+
+    print(
+        f"[ingestion] job {job_id} finished: {progress.succeeded} ok, {progress.failed} failed, "
+        f"{progress.skipped} skipped in {progress.elapsed_seconds:.1f}s",
+        file=sys.stderr,
+    )
+    return 1 if progress.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
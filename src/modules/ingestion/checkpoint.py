@@ -0,0 +1,74 @@
+"""Records which items were ingested so an interrupted run can resume."""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Protocol, Set, Union
+
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
+
+class Checkpoint(Protocol):
+    def completed(self) -> Set[str]:
+        ...
+
+    def mark(self, keys: Iterable[str]) -> None:
+        ...
+
+
+class FileCheckpoint:
+    """Append-only JSON Lines file with one ingested item key per line."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def completed(self) -> Set[str]:
+        if not self.path.exists():
+            return set()
+        keys: Set[str] = set()
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    keys.add(json.loads(line)["key"])
+                except (ValueError, KeyError, TypeError):
+                    # A run killed mid-write leaves a truncated last line.
+                    continue
+        return keys
+
+    def mark(self, keys: Iterable[str]) -> None:
+        lines = "".join(json.dumps({"key": key}) + "\n" for key in keys)
+        if not lines:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(lines)
+                handle.flush()
+
+
+class MongoCheckpoint:
+    """Uses the job's own successful results as the checkpoint.
+
+    Results are written in the same batch that would mark them, so there is
+    nothing extra to record and the checkpoint can never run ahead of the data.
+    """
+
+    def __init__(self, results: Collection, job_id: str) -> None:
+        self._results = results
+        self._job_id = job_id
+
+    def completed(self) -> Set[str]:
+        documents = self._results.find(
+            {"job_id": self._job_id, "status": "succeeded"}, {"key": 1}
+        )
+        return {doc["key"] for doc in documents}
+
+    def mark(self, keys: Iterable[str]) -> None:
+        return None
+
+
+__all__ = ["Checkpoint", "FileCheckpoint", "MongoCheckpoint"]
@@ -0,0 +1,51 @@
+"""DTOs for bulk ingestion jobs."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class IngestionProgressResponse(BaseModel):
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = Field(default=0, description="Itens já ingeridos em uma execução anterior.")
+    elapsed_seconds: float = 0.0
+    throughput: float = Field(default=0.0, description="Documentos processados por segundo.")
+    eta_seconds: Optional[float] = None
+
+
+class IngestionJobResponse(BaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "job_id": "9f2c1e5b7a3d4c8e0f1a2b3c4d5e6f708192a3b4c5d6e7f8091a2b3c4d5e6f70",
+                "user_id": "fabio",
+                "filename": "curriculos_2023.zip",
+                "status": "running",
+                "progress": {
+                    "total": 1200,
+                    "succeeded": 340,
+                    "failed": 2,
+                    "skipped": 0,
+                    "elapsed_seconds": 412.5,
+                    "throughput": 0.83,
+                    "eta_seconds": 1034.9,
+                },
+            }
+        }
+    )
+    job_id: str = Field(
+        ...,
+        description="SHA-256 do usuário e do arquivo ZIP; o mesmo usuário reenviando o mesmo arquivo retoma o job.",
+    )
+    user_id: str
+    filename: Optional[str] = None
+    status: str = Field(..., description="queued, running, completed ou failed.")
+    progress: Optional[IngestionProgressResponse] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
@@ -0,0 +1,49 @@
+"""Entities describing bulk ingestion runs."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+@dataclass(slots=True)
+class IngestionProgress:
+    job_id: str
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed_seconds: float = 0.0
+    started_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Documents processed per second in this run (skipped ones excluded)."""
+        return self.processed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        remaining = self.total - self.processed - self.skipped
+        if remaining <= 0:
+            return 0.0
+        if not self.throughput:
+            return None
+        return remaining / self.throughput
+
+    def to_document(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "throughput": round(self.throughput, 3),
+            "eta_seconds": None if self.eta_seconds is None else round(self.eta_seconds, 1),
+            "started_at": self.started_at,
+        }
@@ -0,0 +1,104 @@
+"""Endpoints for bulk ingestion of ZIP archives."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import zipfile
+from functools import lru_cache
+from typing import BinaryIO, Tuple
+
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Path, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+
+from src.modules.pipeline.pipeline_controller import get_service as get_pipeline_service
+from src.utils.ocr import COPY_CHUNK_SIZE
+from src.utils.uploads import MEGABYTE, UploadLimits, limited_upload_route
+
+from .dto.ingestion_dto import IngestionJobResponse
+from .ingestion_service import IngestionService, job_id_for
+
+MAX_ARCHIVE_BYTES = int(float(os.getenv("INGESTION_MAX_ARCHIVE_MB", "2048")) * MEGABYTE)
+
+# The archive is the only file of the request, so both limits are the archive's;
+# oversized uploads are refused while they stream in, before reaching the disk.
+archive_limits = UploadLimits(
+    max_file_bytes=MAX_ARCHIVE_BYTES,
+    max_request_bytes=MAX_ARCHIVE_BYTES,
+    spool_bytes=UploadLimits.from_env().spool_bytes,
+)
+router = APIRouter(
+    prefix="/ingestion", tags=["Ingestion"], route_class=limited_upload_route(archive_limits)
+)
+
+
+@lru_cache(maxsize=1)
+def get_service() -> IngestionService:
+    """Shares the pipeline service (OCR engine, LLM client) with the pipeline endpoints."""
+    return IngestionService(pipeline_service=get_pipeline_service())
+
+
+def _persist_archive(stream: BinaryIO) -> Tuple[str, str]:
+    """Copy the spooled upload to a file that outlives the request, hashing it on the way."""
+    digest = hashlib.sha256()
+    stream.seek(0)
+    with tempfile.NamedTemporaryFile(prefix="ingestion-", suffix=".zip", delete=False) as handle:
+        while chunk := stream.read(COPY_CHUNK_SIZE):
+            digest.update(chunk)
+            handle.write(chunk)
+    return handle.name, digest.hexdigest()
+
+
+@router.post(
+    "/",
+    response_model=IngestionJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Ingerir arquivo ZIP",
+    description=(
+        "Recebe um ZIP com currículos (PDF/imagem) e processa cada arquivo em segundo plano "
+        "(OCR, perfil estruturado e resumo), gravando os resultados em lotes. O identificador "
+        "do job é o hash do usuário e do arquivo: o mesmo usuário reenviando o mesmo ZIP retoma "
+        "um job interrompido sem reprocessar o que já foi concluído; enquanto o job está ativo, "
+        "o reenvio apenas devolve seu status."
+    ),
+    responses={
+        400: {"description": "Arquivo enviado não é um ZIP válido"},
+        413: {"description": "Arquivo acima do limite configurado"},
+    },
+)
+async def create(
+    background_tasks: BackgroundTasks,
+    user_id: str = Form(...),
+    file: UploadFile = File(...),
+    service: IngestionService = Depends(get_service),
+) -> IngestionJobResponse:
+    if not await run_in_threadpool(zipfile.is_zipfile, file.file):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File is not a ZIP archive")
+
+    archive_path, digest = await run_in_threadpool(_persist_archive, file.file)
+    job_id = job_id_for(user_id, digest)
+    job, claimed = await run_in_threadpool(service.create, job_id, user_id, file.filename)
+    if not claimed:
+        os.remove(archive_path)
+        return IngestionJobResponse(**job)
+
+    background_tasks.add_task(service.run_archive, job_id, archive_path)
+    return IngestionJobResponse(**job)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=IngestionJobResponse,
+    summary="Consultar job de ingestão",
+    description="Retorna o status e o progresso (processados, falhas, vazão e ETA) de um job.",
+    responses={404: {"description": "Job não encontrado"}},
+)
+def findOne(
+    job_id: str = Path(..., description="Job identifier"),
+    service: IngestionService = Depends(get_service),
+) -> IngestionJobResponse:
+    job = service.findOne(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return IngestionJobResponse(**job)
@@ -0,0 +1,289 @@
+"""Bulk ingestion of resumes through a bounded parallel worker pool."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.infra.database.script import get_collection
+from src.modules.pipeline.pipeline_service import PipelineService
+from src.utils.ocr import FileInput
+
+from .checkpoint import Checkpoint, MongoCheckpoint
+from .entity.ingestion_entity import IngestionProgress
+from .sources import IngestionItem, ZipSource
+
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[IngestionProgress], None]
+
+FINISHED_STATUSES = ["completed", "failed"]
+
+
+def job_id_for(user_id: str, archive_digest: str) -> str:
+    """Jobs belong to a user: the same archive sent by two users is two jobs."""
+    return hashlib.sha256(f"{user_id}\0{archive_digest}".encode()).hexdigest()
+
+
+@dataclass(slots=True)
+class IngestionSettings:
+    workers: int = 4
+    batch_size: int = 50
+    max_in_flight: int = 8
+    progress_interval: float = 5.0
+    stale_after: float = 900.0
+
+    @classmethod
+    def from_env(cls) -> "IngestionSettings":
+        workers = int(os.getenv("INGESTION_WORKERS", str(os.cpu_count() or 4)))
+        return cls(
+            workers=workers,
+            batch_size=int(os.getenv("INGESTION_BATCH_SIZE", "50")),
+            max_in_flight=int(os.getenv("INGESTION_MAX_IN_FLIGHT", str(workers * 2))),
+            progress_interval=float(os.getenv("INGESTION_PROGRESS_INTERVAL", "5")),
+            stale_after=float(os.getenv("INGESTION_STALE_AFTER_SECONDS", "900")),
+        )
+
+
+class IngestionService:
+    """OCRs, profiles and summarises many resumes, writing results in batches."""
+
+    def __init__(
+        self,
+        pipeline_service: PipelineService | None = None,
+        results: Optional[Collection] = None,
+        jobs: Optional[Collection] = None,
+        settings: IngestionSettings | None = None,
+    ) -> None:
+        self._pipeline = pipeline_service or PipelineService()
+        self._results: Collection = results or get_collection(
+            os.getenv("MONGODB_INGESTION_COLLECTION", "ingested_documents")
+        )
+        self._jobs: Collection = jobs or get_collection(
+            os.getenv("MONGODB_INGESTION_JOBS_COLLECTION", "ingestion_jobs")
+        )
+        self.settings = settings or IngestionSettings.from_env()
+        self._indexed = False
+
+    def _ensure_indexes(self) -> None:
+        if self._indexed:
+            return
+        self._jobs.create_index("job_id", unique=True)
+        self._results.create_index([("job_id", 1), ("key", 1)], unique=True)
+        self._indexed = True
+
+    def _ingest(self, job_id: str, item: IngestionItem) -> Dict[str, Any]:
+        # Loaded here, on the worker, so the submitting loop never blocks on
+        # decompressing an archive member.
+        source: FileInput = item.load()
+        try:
+            # The whole job is a single user ("ingestion:{job_id}") of the
+            # shared OCR/LLM schedulers: however many ingestion workers run,
+            # it gets one user's round-robin share next to interactive requests.
+            document = self._pipeline.summarize(
+                source, item.filename, user_id=f"ingestion:{job_id}"
+            )
+        finally:
+            close = getattr(source, "close", None)
+            if close is not None and not isinstance(source, Path):
+                close()
+        return {
+            "job_id": job_id,
+            "key": item.key,
+            "filename": item.filename,
+            "status": "succeeded",
+            "error": None,
+            "content_hash": document.content_hash,
+            "summary": document.summary,
+            "profile": document.profile.to_document() if document.profile else None,
+            "tokens_before": document.tokens_before,
+            "tokens_after": document.tokens_after,
+            "ingested_at": datetime.utcnow(),
+        }
+
+    @staticmethod
+    def _failure(job_id: str, item: IngestionItem, error: str) -> Dict[str, Any]:
+        return {
+            "job_id": job_id,
+            "key": item.key,
+            "filename": item.filename,
+            "status": "failed",
+            "error": error,
+            "ingested_at": datetime.utcnow(),
+        }
+
+    def run(
+        self,
+        job_id: str,
+        items: Sequence[IngestionItem],
+        checkpoint: Checkpoint,
+        on_progress: ProgressCallback | None = None,
+    ) -> IngestionProgress:
+        """Ingest ``items`` not yet in ``checkpoint``.
+
+        At most ``max_in_flight`` items are loaded at any time, so archive
+        members are never all spooled at once. Results are inserted every
+        ``batch_size`` items and only then marked in the checkpoint. Failed
+        items are retried on resume; each item keeps one result row per job,
+        so a retry replaces its failure instead of adding another.
+        """
+        from pymongo import UpdateOne
+
+        self._ensure_indexes()
+        settings = self.settings
+        progress = IngestionProgress(job_id=job_id, total=len(items))
+        started = time.monotonic()
+        last_report = started
+        done = checkpoint.completed()
+        batch: List[Dict[str, Any]] = []
+        pending: Dict[Future, IngestionItem] = {}
+
+        def report(force: bool = False) -> None:
+            nonlocal last_report
+            now = time.monotonic()
+            progress.elapsed_seconds = now - started
+            if on_progress is not None and (force or now - last_report >= settings.progress_interval):
+                last_report = now
+                on_progress(progress)
+
+        def flush() -> None:
+            if not batch:
+                return
+            self._results.bulk_write(
+                [
+                    UpdateOne(
+                        {"job_id": doc["job_id"], "key": doc["key"]}, {"$set": doc}, upsert=True
+                    )
+                    for doc in batch
+                ],
+                ordered=False,
+            )
+            checkpoint.mark(doc["key"] for doc in batch if doc["status"] == "succeeded")
+            batch.clear()
+            report(force=True)
+
+        def collect(futures: Iterable[Future]) -> None:
+            for future in futures:
+                item = pending.pop(future)
+                try:
+                    batch.append(future.result())
+                    progress.succeeded += 1
+                except Exception as exc:
+                    logger.warning("Ingestion of %s failed: %s", item.key, exc)
+                    batch.append(self._failure(job_id, item, str(exc)))
+                    progress.failed += 1
+            if len(batch) >= settings.batch_size:
+                flush()
+            else:
+                report()
+
+        with ThreadPoolExecutor(
+            max_workers=settings.workers, thread_name_prefix="ingestion"
+        ) as executor:
+            for item in items:
+                if item.key in done:
+                    progress.skipped += 1
+                    continue
+                if item.error is not None:
+                    batch.append(self._failure(job_id, item, item.error))
+                    progress.failed += 1
+                    continue
+                while len(pending) >= settings.max_in_flight:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                pending[executor.submit(self._ingest, job_id, item)] = item
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(finished)
+        flush()
+        report(force=True)
+        return progress
+
+    # Job bookkeeping for archives uploaded through the API.
+
+    def findOne(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._jobs.find_one({"job_id": job_id}, {"_id": 0})
+
+    def create(
+        self, job_id: str, user_id: str, filename: str | None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Register a job and return it with whether this call claimed it.
+
+        Only the caller that claims a job may run it. A new job is claimed by
+        the upsert that inserts it. An existing one is re-queued, and so
+        claimed, only if it finished or went stale (a worker died mid-job),
+        so a re-upload resumes it. Both are single atomic writes, so
+        concurrent uploads of the same archive start at most one run.
+        """
+        from pymongo.errors import DuplicateKeyError
+
+        self._ensure_indexes()
+        now = datetime.utcnow()
+        queued = {
+            "user_id": user_id,
+            "filename": filename,
+            "status": "queued",
+            "error": None,
+            "updated_at": now,
+        }
+        try:
+            inserted = self._jobs.update_one(
+                {"job_id": job_id},
+                {"$setOnInsert": {**queued, "created_at": now}},
+                upsert=True,
+            )
+            claimed = inserted.upserted_id is not None
+        except DuplicateKeyError:  # a concurrent upload inserted it first
+            claimed = False
+        if not claimed:
+            requeued = self._jobs.update_one(
+                {
+                    "job_id": job_id,
+                    "$or": [
+                        {"status": {"$in": FINISHED_STATUSES}},
+                        {"updated_at": {"$lt": now - timedelta(seconds=self.settings.stale_after)}},
+                    ],
+                },
+                {"$set": queued},
+            )
+            claimed = requeued.modified_count == 1
+        return self.findOne(job_id) or {}, claimed
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        fields["updated_at"] = datetime.utcnow()
+        self._jobs.update_one({"job_id": job_id}, {"$set": fields})
+
+    def run_archive(self, job_id: str, archive_path: str) -> None:
+        """Background entry point for uploaded ZIPs; removes the archive when done."""
+        try:
+            self._update(job_id, status="running")
+            # Keys are scoped by the job (the archive digest), not its upload name.
+            with ZipSource(archive_path, name=job_id) as source:
+                progress = self.run(
+                    job_id,
+                    source.items(),
+                    MongoCheckpoint(self._results, job_id),
+                    on_progress=lambda current: self._update(job_id, progress=current.to_document()),
+                )
+            self._update(job_id, status="completed", progress=progress.to_document())
+        except Exception as exc:
+            logger.exception("Ingestion job %s failed", job_id)
+            self._update(job_id, status="failed", error=str(exc))
+        finally:
+            try:
+                os.remove(archive_path)
+            except OSError:
+                pass
+
+
+__all__ = ["IngestionService", "IngestionSettings"]
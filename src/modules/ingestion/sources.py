@@ -0,0 +1,152 @@
+"""Enumerate resumes from directories and ZIP archives without loading them up front."""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Callable, List, Optional, Union
+
+from src.utils.ocr import COPY_CHUNK_SIZE, FileInput
+from src.utils.uploads import MEGABYTE, UploadLimits
+
+SUPPORTED_EXTENSIONS = frozenset({".pdf", ".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".webp"})
+
+
+@dataclass(slots=True)
+class IngestionItem:
+    """One resume to ingest.
+
+    ``key`` is stable across runs and identifies the item in checkpoints;
+    ``load`` materialises the content only when a worker is about to take it.
+    """
+
+    key: str
+    filename: str
+    size: int
+    load: Callable[[], FileInput]
+    error: Optional[str] = None
+
+
+def _is_candidate(name: str) -> bool:
+    path = PurePosixPath(name)
+    if any(part.startswith(".") or part == "__MACOSX" for part in path.parts):
+        return False
+    return path.suffix.lower() in SUPPORTED_EXTENSIONS
+
+
+def _size_error(filename: str, size: int, limits: UploadLimits) -> Optional[str]:
+    if size > limits.max_file_bytes:
+        return f"File '{filename}' exceeds {limits.max_file_bytes // MEGABYTE} MB"
+    return None
+
+
+class DirectorySource:
+    """Every supported file below ``root``; files are handed to OCR by path."""
+
+    def __init__(self, root: Union[str, Path], limits: Optional[UploadLimits] = None) -> None:
+        self.root = Path(root)
+        self._limits = limits or UploadLimits.from_env()
+
+    def __enter__(self) -> "DirectorySource":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        return None
+
+    def items(self) -> List[IngestionItem]:
+        items: List[IngestionItem] = []
+        for path in sorted(self.root.rglob("*")):
+            relative = path.relative_to(self.root).as_posix()
+            if not path.is_file() or not _is_candidate(relative):
+                continue
+            size = path.stat().st_size
+            items.append(
+                IngestionItem(
+                    key=f"{path.resolve()}:{size}",
+                    filename=path.name,
+                    size=size,
+                    load=lambda path=path: path,
+                    error=_size_error(path.name, size, self._limits),
+                )
+            )
+        return items
+
+
+class ZipSource:
+    """Members of a ZIP archive, each streamed into a spooled temp file on demand.
+
+    Only the central directory is read up front; a member is decompressed
+    when its item is loaded, so the archive must stay open (use it as a
+    context manager) until every item has been loaded.
+    """
+
+    def __init__(
+        self,
+        archive: Union[str, Path, BinaryIO],
+        name: Optional[str] = None,
+        limits: Optional[UploadLimits] = None,
+    ) -> None:
+        self._archive = archive
+        self.name = name or (Path(archive).name if isinstance(archive, (str, Path)) else "archive.zip")
+        self._limits = limits or UploadLimits.from_env()
+        self._zip: Optional[zipfile.ZipFile] = None
+
+    def __enter__(self) -> "ZipSource":
+        self._zip = zipfile.ZipFile(self._archive)
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def _extract(self, info: zipfile.ZipInfo) -> BinaryIO:
+        if self._zip is None:
+            raise RuntimeError("ZipSource must be opened before loading members")
+        spooled = tempfile.SpooledTemporaryFile(max_size=self._limits.spool_bytes)
+        with self._zip.open(info) as member:
+            shutil.copyfileobj(member, spooled, COPY_CHUNK_SIZE)
+        spooled.seek(0)
+        return spooled
+
+    def items(self) -> List[IngestionItem]:
+        if self._zip is None:
+            raise RuntimeError("ZipSource must be opened before listing members")
+        items: List[IngestionItem] = []
+        for info in self._zip.infolist():
+            if info.is_dir() or not _is_candidate(info.filename):
+                continue
+            filename = PurePosixPath(info.filename).name
+            items.append(
+                IngestionItem(
+                    key=f"{self.name}!{info.filename}:{info.CRC:08x}",
+                    filename=filename,
+                    size=info.file_size,
+                    load=lambda info=info: self._extract(info),
+                    error=_size_error(filename, info.file_size, self._limits),
+                )
+            )
+        return items
+
+
+def open_source(
+    location: Union[str, Path], limits: Optional[UploadLimits] = None
+) -> Union[DirectorySource, ZipSource]:
+    path = Path(location)
+    if path.is_dir():
+        return DirectorySource(path, limits)
+    if zipfile.is_zipfile(path):
+        return ZipSource(path, limits=limits)
+    raise ValueError(f"'{location}' is neither a directory nor a ZIP archive")
+
+
+__all__ = [
+    "DirectorySource",
+    "IngestionItem",
+    "SUPPORTED_EXTENSIONS",
+    "ZipSource",
+    "open_source",
+]
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -24,6 +24,8 @@ class UsageLogCreate(BaseModel):
     result: str
     query: Optional[str] = None
     timestamp: Optional[datetime] = None
+    metrics: Optional[Dict[str, Any]] = None
+    cached: bool = False
 
 
 class UsageLogUpdate(BaseModel):
@@ -47,6 +49,8 @@ class UsageLogResponse(BaseModel):
                 "result": '{"answer":"Lucas Rodrigues é o candidato mais aderente..."}',
                 "query": "Qual desses currículos se enquadra melhor...",
                 "timestamp": "2025-10-04T13:39:46.920000",
+                "metrics": {"ocr_tokens_before": 2150, "ocr_tokens_after": 1620},
+                "cached": False,
             }
         }
     )
@@ -56,3 +60,11 @@ class UsageLogResponse(BaseModel):
     result: str
     query: Optional[str] = None
     timestamp: datetime
+    metrics: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Métricas da execução, como tokens estimados do OCR antes e depois da limpeza.",
+    )
+    cached: bool = Field(
+        default=False,
+        description="Indica se a resposta foi servida pelo cache de respostas.",
+    )
@@ -14,6 +14,8 @@ class UsageLog:
     result: str
     query: Optional[str] = None
     timestamp: datetime = field(default_factory=datetime.utcnow)
+    metrics: Optional[Dict[str, Any]] = None
+    cached: bool = False
 
     def to_document(self) -> Dict[str, Any]:
         return {
@@ -22,4 +24,6 @@ class UsageLog:
             "result": self.result,
             "query": self.query,
             "timestamp": self.timestamp,
+            "metrics": self.metrics,
+            "cached": self.cached,
         }
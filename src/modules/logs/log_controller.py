@@ -1,17 +1,35 @@
 """FastAPI router for usage log endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.responses import StreamingResponse
+
+from src.modules.profiling.profiling_middleware import ProfiledRoute
+from src.utils import profiling
 
 from .dto.log_dto import UsageLogCreate, UsageLogResponse, UsageLogUpdate
+from .log_export import MEDIA_TYPES, encode
 from .log_service import UsageLogService
 
-router = APIRouter(prefix="/logs", tags=["Logs"])
+router = APIRouter(prefix="/logs", tags=["Logs"], route_class=ProfiledRoute)
 
 
+@lru_cache(maxsize=1)
 def get_service() -> UsageLogService:
+    """Process-wide service so clients and connection pools are reused across requests."""
     return UsageLogService()
 
 
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored as naive UTC; aware bounds are converted, naive ones taken as UTC."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 @router.get(
     "/",
     response_model=list[UsageLogResponse],
@@ -22,6 +40,46 @@ def findAll(service: UsageLogService = Depends(get_service)) -> list[UsageLogRes
     return service.findAll()
 
 
+@router.get(
+    "/export",
+    summary="Exportar logs",
+    description=(
+        "Exporta os registros de uso em NDJSON ou CSV, do mais antigo para o mais recente, "
+        "transmitidos diretamente do cursor do MongoDB (memória constante, primeiro byte imediato). "
+        "Filtre por período com `start` (inclusivo) e `end` (exclusivo); datas sem fuso são "
+        "lidas como UTC. Use `gzip=true` para receber o arquivo comprimido."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Arquivo de exportação",
+            "content": {"application/x-ndjson": {}, "text/csv": {}, "application/gzip": {}},
+        },
+        400: {"description": "Período inválido"},
+    },
+)
+def export(
+    format: Literal["ndjson", "csv"] = Query(default="ndjson", description="Formato do arquivo"),
+    start: Optional[datetime] = Query(default=None, description="Início do período (inclusivo)"),
+    end: Optional[datetime] = Query(default=None, description="Fim do período (exclusivo)"),
+    batch_size: int = Query(
+        default=1000, ge=1, le=10000, description="Documentos buscados no MongoDB por lote"
+    ),
+    gzip: bool = Query(default=False, description="Comprimir a exportação com gzip"),
+    service: UsageLogService = Depends(get_service),
+) -> StreamingResponse:
+    start, end = _naive_utc(start), _naive_utc(end)
+    if start is not None and end is not None and start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    filename = f"usage-logs.{format}" + (".gz" if gzip else "")
+    chunks = encode(service.export(start, end, batch_size), format, compress=gzip, batch_size=batch_size)
+    return StreamingResponse(
+        profiling.bind_iter(chunks),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get(
     "/{log_id}",
     response_model=UsageLogResponse,
@@ -0,0 +1,115 @@
+"""Incremental NDJSON/CSV encoders for exporting usage logs."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+EXPORT_FIELDS = ("id", "request_id", "user_id", "timestamp", "query", "result", "cached", "metrics")
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Rows are buffered into chunks of about this size before being written, so
+# the response is not flushed once per document. The start of the stream is
+# sent unbuffered (see _chunked) so the first bytes are not held back.
+CHUNK_SIZE = 64 * 1024
+
+
+def _row(document: Dict[str, Any]) -> Dict[str, Any]:
+    timestamp = document.get("timestamp")
+    return {
+        "id": str(document.get("_id")),
+        "request_id": document.get("request_id", ""),
+        "user_id": document.get("user_id", ""),
+        "timestamp": timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp,
+        "query": document.get("query"),
+        "result": document.get("result", ""),
+        "cached": document.get("cached", False),
+        "metrics": document.get("metrics"),
+    }
+
+
+def _chunked(lines: Iterable[str], first_batch: Optional[int] = None) -> Iterator[bytes]:
+    """Group ``lines`` into ``CHUNK_SIZE`` chunks, except at the start of the stream.
+
+    The first line (CSV header or first NDJSON row) is sent on its own, and
+    so are the rest of the first ``first_batch`` lines, so a client sees the
+    download start and a first page of rows before buffering kicks in.
+    """
+    early = {1} if first_batch is None else {1, first_batch}
+    buffer = io.StringIO()
+    for count, line in enumerate(lines, start=1):
+        buffer.write(line)
+        if count in early or buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _ndjson_lines(documents: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for document in documents:
+        yield json.dumps(_row(document), ensure_ascii=False, default=str) + "\n"
+
+
+def _csv_lines(documents: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def take() -> str:
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(EXPORT_FIELDS)
+    yield take()
+    for document in documents:
+        row = _row(document)
+        row["cached"] = "true" if row["cached"] else "false"
+        if row["metrics"] is not None:
+            row["metrics"] = json.dumps(row["metrics"], ensure_ascii=False, default=str)
+        writer.writerow(["" if row[field] is None else row[field] for field in EXPORT_FIELDS])
+        yield take()
+
+
+ENCODERS: Dict[str, Callable[[Iterable[Dict[str, Any]]], Iterator[str]]] = {
+    "ndjson": _ndjson_lines,
+    "csv": _csv_lines,
+}
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip ``chunks`` on the fly, flushing after each one so bytes keep flowing."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def encode(
+    documents: Iterable[Dict[str, Any]],
+    fmt: str,
+    compress: bool = False,
+    batch_size: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Encode raw log documents as ``fmt`` (``ndjson`` or ``csv``) byte chunks.
+
+    ``batch_size`` is the cursor batch size; the first batch is flushed as
+    soon as it is encoded.
+    """
+    first_batch = None
+    if batch_size is not None:
+        first_batch = batch_size + (1 if fmt == "csv" else 0)
+    chunks = _chunked(ENCODERS[fmt](documents), first_batch)
+    return gzip_chunks(chunks) if compress else chunks
+
+
+__all__ = ["EXPORT_FIELDS", "MEDIA_TYPES", "encode", "gzip_chunks"]
@@ -4,17 +4,37 @@ from __future__ import annotations
 
 import os
 from datetime import datetime
-from typing import List, Optional
-
-from bson import ObjectId
-from bson.errors import InvalidId
-from pymongo.collection import Collection
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 
 from src.infra.database.script import get_collection
 
 from .dto.log_dto import UsageLogCreate, UsageLogResponse, UsageLogUpdate
 from .entity.log_entity import UsageLog
 
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
+EXPORT_PROJECTION = {
+    "request_id": 1,
+    "user_id": 1,
+    "result": 1,
+    "query": 1,
+    "timestamp": 1,
+    "metrics": 1,
+    "cached": 1,
+}
+
+
+def _object_id(log_id: str):
+    """Parse a Mongo ObjectId, returning ``None`` for malformed identifiers."""
+    from bson import ObjectId
+    from bson.errors import InvalidId
+
+    try:
+        return ObjectId(log_id)
+    except (InvalidId, TypeError):
+        return None
+
 
 class UsageLogService:
     """Handles creation, retrieval, update and deletion of usage logs."""
@@ -22,8 +42,21 @@ class UsageLogService:
     def __init__(self, collection: Optional[Collection] = None) -> None:
         collection_name = os.getenv("MONGODB_COLLECTION", "usage_logs")
         self._collection: Collection = collection or get_collection(collection_name)
+        self._indexed = False
+
+    def ensure_indexes(self) -> None:
+        """Create the ``timestamp`` index used by :meth:`export`.
+
+        Called at worker start-up and before writes, never from the export
+        read path, so exports work with read-only credentials.
+        """
+        if self._indexed:
+            return
+        self._collection.create_index("timestamp")
+        self._indexed = True
 
     def create(self, data: UsageLogCreate) -> str:
+        self.ensure_indexes()
         timestamp = data.timestamp or datetime.utcnow()
         log = UsageLog(
             request_id=data.request_id,
@@ -31,6 +64,8 @@ class UsageLogService:
             result=data.result,
             query=data.query,
             timestamp=timestamp,
+            metrics=data.metrics,
+            cached=data.cached,
         )
         inserted = self._collection.insert_one(log.to_document())
         return str(inserted.inserted_id)
@@ -39,11 +74,40 @@ class UsageLogService:
         documents = self._collection.find().sort("timestamp", -1)
         return [self._map_document(doc) for doc in documents]
 
-    def findOne(self, log_id: str) -> Optional[UsageLogResponse]:
+    def export(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield raw log documents in ``[start, end)``, oldest first.
+
+        Documents are pulled from the server ``batch_size`` at a time and are
+        never collected into a list, so memory use does not grow with the
+        number of logs.
+        """
+        query: Dict[str, Any] = {}
+        if start is not None or end is not None:
+            query["timestamp"] = {}
+            if start is not None:
+                query["timestamp"]["$gte"] = start
+            if end is not None:
+                query["timestamp"]["$lt"] = end
+        cursor = (
+            self._collection.find(query, EXPORT_PROJECTION)
+            .sort("timestamp", 1)
+            .batch_size(batch_size)
+        )
         try:
-            document = self._collection.find_one({"_id": ObjectId(log_id)})
-        except InvalidId:
+            yield from cursor
+        finally:
+            cursor.close()
+
+    def findOne(self, log_id: str) -> Optional[UsageLogResponse]:
+        object_id = _object_id(log_id)
+        if object_id is None:
             return None
+        document = self._collection.find_one({"_id": object_id})
         if document is None:
             return None
         return self._map_document(document)
@@ -52,20 +116,20 @@ class UsageLogService:
         update_doc = update_data.dict_without_none()
         if not update_doc:
             return False
-        try:
-            result = self._collection.update_one(
-                {"_id": ObjectId(log_id)},
-                {"$set": update_doc},
-            )
-        except InvalidId:
+        object_id = _object_id(log_id)
+        if object_id is None:
             return False
+        result = self._collection.update_one(
+            {"_id": object_id},
+            {"$set": update_doc},
+        )
         return result.modified_count > 0
 
     def delete(self, log_id: str) -> bool:
-        try:
-            result = self._collection.delete_one({"_id": ObjectId(log_id)})
-        except InvalidId:
+        object_id = _object_id(log_id)
+        if object_id is None:
             return False
+        result = self._collection.delete_one({"_id": object_id})
         return result.deleted_count > 0
 
     @staticmethod
@@ -77,4 +141,6 @@ class UsageLogService:
             result=document.get("result", ""),
             query=document.get("query"),
             timestamp=document.get("timestamp"),
+            metrics=document.get("metrics"),
+            cached=document.get("cached", False),
         )
@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class OCRRequest(BaseModel):
@@ -14,3 +14,7 @@ class OCRRequest(BaseModel):
 class OCRResponse(BaseModel):
     filename: Optional[str] = None
     content: str
+    page_confidences: List[Optional[float]] = Field(
+        default_factory=list,
+        description="Confiança média do Tesseract (0-100) por página; nula fora do modo adaptativo.",
+    )
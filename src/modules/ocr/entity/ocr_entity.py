@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional
 
 
 @dataclass(slots=True)
 class OCRResult:
     content: str
     filename: Optional[str] = None
+    page_confidences: List[Optional[float]] = field(default_factory=list)
+
+    @property
+    def confidence(self) -> Optional[float]:
+        scores = [score for score in self.page_confidences if score is not None]
+        return sum(scores) / len(scores) if scores else None
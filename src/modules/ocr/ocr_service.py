@@ -4,7 +4,8 @@ from __future__ import annotations
 
 from typing import Any, Sequence, Tuple
 
-from src.utils.ocr import OCRProcessor
+from src.utils.deadline import Deadline
+from src.utils.ocr import OCRProcessor, render_pages
 
 from .entity.ocr_entity import OCRResult
 
@@ -17,10 +18,16 @@ class OCRService:
     def __init__(self, processor: OCRProcessor | None = None) -> None:
         self._processor = processor or OCRProcessor()
 
-    def create(self, file_obj: object, filename: str | None = None) -> OCRResult:
+    def create(
+        self, file_obj: object, filename: str | None = None, deadline: Deadline | None = None
+    ) -> OCRResult:
         """Process a single file and return the OCR result."""
-        text = self._processor.extract_text_from_file(file_obj)
-        return OCRResult(content=text, filename=filename)
+        pages = self._processor.extract_pages_from_file(file_obj, deadline)
+        return OCRResult(
+            content=render_pages(pages),
+            filename=filename,
+            page_confidences=[page.confidence for page in pages],
+        )
 
     def findOne(self, file_obj: object, filename: str | None = None) -> OCRResult:
         """Alias for ``create`` to keep uniform naming."""
@@ -10,6 +10,11 @@ from pydantic import BaseModel, Field, ConfigDict
 class DocumentSummary(BaseModel):
     filename: Optional[str]
     summary: str
+    status: str = Field(
+        default="ok",
+        description="ok, timeout (prazo esgotado) ou failed (erro no processamento); só difere de ok em modo best_effort.",
+    )
+    error: Optional[str] = None
 
 
 class PipelineResponse(BaseModel):
@@ -24,7 +29,8 @@ class PipelineResponse(BaseModel):
                         "summary": "Resumo conciso destacando habilidades e experiência do candidato."
                     }
                 ],
-                "answer": "Lucas Rodrigues atende aos requisitos de Tech Lead em IA graças à experiência com LangChain, RAG e MLOps."
+                "answer": "Lucas Rodrigues atende aos requisitos de Tech Lead em IA graças à experiência com LangChain, RAG e MLOps.",
+                "cached": False,
             }
         }
     )
@@ -38,3 +44,14 @@ class PipelineResponse(BaseModel):
         default=None,
         description="Resposta contextualizada para a query, quando informada.",
     )
+    cached: bool = Field(
+        default=False,
+        description="Indica se a resposta veio do cache de perguntas repetidas sobre os mesmos currículos.",
+    )
+    partial: bool = Field(
+        default=False,
+        description=(
+            "Em modo best_effort, indica que o prazo terminou ou algum documento falhou; "
+            "os sumários trazem o status de cada documento."
+        ),
+    )
@@ -4,9 +4,18 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from src.modules.candidates.entity.candidate_entity import CandidateProfile
+
 
 @dataclass(slots=True)
 class ProcessedDocument:
     filename: str | None
     content: str
     summary: str
+    content_hash: str | None = None
+    tokens_before: int = 0
+    tokens_after: int = 0
+    profile: CandidateProfile | None = None
+    # "ok", or "timeout"/"failed" for documents left unfinished in best-effort mode.
+    status: str = "ok"
+    error: str | None = None
@@ -2,17 +2,58 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+from functools import lru_cache
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+
+from src.utils import profiling
+from src.utils.deadline import Deadline, DeadlineExceeded
+from src.utils.scheduler import SchedulerSaturatedError
+from src.utils.uploads import UploadLimits, UploadedFile, limited_upload_route
 
 from .dto.pipeline_dto import PipelineResponse
 from .pipeline_service import PipelineCreate, PipelineService
 
-router = APIRouter(prefix="/pipeline", tags=["Pipeline"])
+upload_limits = UploadLimits.from_env()
+# Size limits are enforced while the multipart body is read (and from
+# Content-Length before that), so oversized uploads never reach the disk.
+router = APIRouter(
+    prefix="/pipeline", tags=["Pipeline"], route_class=limited_upload_route(upload_limits)
+)
+
+# Optional server-side cap on a request's time budget; keep it below the proxy
+# timeout so the work stops before the connection is dropped. Unset, requests
+# only get a deadline when they send ``timeout_seconds``.
+MAX_DEADLINE_SECONDS: Optional[float] = (
+    float(os.environ["PIPELINE_DEADLINE_SECONDS"])
+    if os.getenv("PIPELINE_DEADLINE_SECONDS")
+    else None
+)
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+async def _cancel_on_disconnect(request: Request, deadline: Deadline) -> None:
+    """Cancel the request's outstanding OCR/LLM work once the client goes away."""
+    while not deadline.expired:
+        if await request.is_disconnected():
+            deadline.cancel("Client disconnected")
+            return
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+
+def request_deadline(timeout_seconds: Optional[float]) -> Deadline:
+    """The tighter of the client's ``timeout_seconds`` and the server cap, if any."""
+    budgets = [seconds for seconds in (timeout_seconds, MAX_DEADLINE_SECONDS) if seconds]
+    return Deadline(min(budgets) if budgets else None)
 
 
+@lru_cache(maxsize=1)
 def get_service() -> PipelineService:
+    """Process-wide service so clients and connection pools are reused across requests."""
     return PipelineService()
 
 
@@ -24,7 +65,12 @@ def get_service() -> PipelineService:
     description=(
         "Recebe currículos em PDF/imagem, extrai texto por OCR, utiliza um LLM para gerar resumos "
         "ou responder perguntas e registra o log de uso. Envie `query` para receber apenas a "
-        "resposta contextualizada; deixe em branco para obter os sumários individuais."
+        "resposta contextualizada; deixe em branco para obter os sumários individuais. Perguntas "
+        "repetidas sobre os mesmos currículos são respondidas pelo cache; envie `use_cache=false` "
+        "para forçar uma nova resposta. O processamento respeita o prazo opcional `timeout_seconds` "
+        "(limitado por `PIPELINE_DEADLINE_SECONDS`, quando configurado) e é cancelado se o "
+        "cliente desconectar; com `best_effort=true`, "
+        "ao fim do prazo são retornados os sumários já concluídos, com o status de cada documento."
     ),
     responses={
         201: {
@@ -36,28 +82,52 @@ def get_service() -> PipelineService:
                         "user_id": "fabio",
                         "summaries": [],
                         "answer": "Lucas Rodrigues atende aos requisitos de Tech Lead em IA...",
+                        "cached": False,
                     }
                 }
             },
-        }
+        },
+        413: {"description": "Arquivo ou requisição acima do limite configurado"},
+        429: {"description": "Fila de processamento cheia para o usuário ou para a API; tente após `Retry-After`"},
+        504: {"description": "Prazo da requisição esgotado (sem `best_effort`)"},
     },
 )
 async def create(
+    request: Request,
     request_id: str = Form(...),
     user_id: str = Form(...),
     query: Optional[str] = Form(default=None),
     files: List[UploadFile] = File(...),
+    use_cache: bool = Form(default=True),
+    best_effort: bool = Form(default=False),
+    timeout_seconds: Optional[float] = Form(default=None, gt=0),
     service: PipelineService = Depends(get_service),
 ) -> PipelineResponse:
-    file_inputs: List[tuple[bytes, str | None]] = []
-    for file in files:
-        content = await file.read()
-        file_inputs.append((content, file.filename))
+    # Each part was spooled to a temp file within the upload limits; hand
+    # those streams to the OCR layer instead of reading whole files into memory.
+    file_inputs: List[UploadedFile] = [(file.file, file.filename) for file in files]
 
     payload = PipelineCreate(
         request_id=request_id,
         user_id=user_id,
         query=query.strip() if query else None,
         files=file_inputs,
+        use_cache=use_cache,
+        deadline=request_deadline(timeout_seconds),
+        best_effort=best_effort,
     )
-    return service.create(payload)
+    # The pipeline is blocking (OCR + LLM); keep the event loop free so
+    # concurrent requests actually overlap.
+    watcher = asyncio.create_task(_cancel_on_disconnect(request, payload.deadline))
+    try:
+        return await run_in_threadpool(profiling.bind(service.create), payload)
+    except SchedulerSaturatedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+    except DeadlineExceeded as exc:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(exc)) from exc
+    finally:
+        watcher.cancel()
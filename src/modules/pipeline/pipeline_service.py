@@ -2,25 +2,109 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Sequence
+import logging
+import os
+import re
+import threading
+import unicodedata
+from concurrent.futures import Future
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Mapping, Sequence, Set, Tuple
 
+from src.modules.candidates.candidate_service import CandidateService
+from src.modules.candidates.entity.candidate_entity import ProfileConstraints
+from src.modules.candidates.profile_extractor import extract_profile, matches, parse_constraints
 from src.modules.chatbot.chatbot_service import ChatbotService
 from src.modules.chatbot.dto.chatbot_dto import ChatbotCreate
 from src.modules.logs.dto.log_dto import UsageLogCreate
 from src.modules.logs.log_service import UsageLogService
 from src.modules.ocr.ocr_service import OCRService
+from src.utils.deadline import Deadline, DeadlineExceeded, SharedDeadline
+from src.utils.hashing import file_digest
+from src.utils.ocr import FileInput
+from src.utils.scheduler import FairScheduler, SchedulerSettings, per_process
+from src.utils.single_flight import SingleFlight
+from src.utils.stages import Stage, StagePipeline
+from src.utils.text_cleaning import clean_ocr_text, fit_to_budget
+from src.utils.ttl_cache import TTLCache
 
 from .dto.pipeline_dto import DocumentSummary, PipelineResponse
 from .entity.pipeline_entity import ProcessedDocument
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(slots=True)
 class PipelineCreate:
     request_id: str
     user_id: str
     query: str | None
-    files: Sequence[tuple[bytes, str | None]]
+    files: Sequence[tuple[FileInput, str | None]]
+    use_cache: bool = True
+    # Time budget for the whole request; None runs without a deadline.
+    deadline: Deadline | None = None
+    # Return the documents that finished (with per-document status) instead
+    # of failing when the deadline passes or a single document errors.
+    best_effort: bool = False
+
+
+@dataclass(slots=True)
+class _WorkItem:
+    """One distinct document travelling through the pipeline stages."""
+
+    digest: str
+    file_obj: FileInput
+    filename: str | None
+    document: ProcessedDocument | None = None
+    # Left as None for documents that fail the query's hard constraints.
+    prompt: str | None = None
+
+
+# Called as ``(done, total, document, selected)`` each time a distinct document
+# leaves the pipeline. ``selected`` is False for candidates filtered out by the
+# query; ``document`` is None for those rejected from their stored profile alone.
+ProgressCallback = Callable[[int, int, "ProcessedDocument | None", bool], None]
+
+NO_MATCH_ANSWER = "Nenhum candidato atende aos requisitos atuais."
+
+# Part of the answer-cache key; bump whenever the prompts or the candidate
+# filtering change. The cache lives in each worker process and starts empty on
+# every deploy, so this only matters once answers outlive the code that made them.
+PROMPT_VERSION = "3"
+
+# (content hash, filename) per upload, sorted so the upload order does not matter.
+Uploads = Tuple[Tuple[str, str | None], ...]
+AnswerKey = Tuple[str, Uploads, str, str]
+
+# Process-wide so identical uploads in concurrent requests share OCR/summary work.
+_document_flights = SingleFlight()
+# Deadline of each run in flight, by flight key; requests joining a run extend it.
+_document_deadlines: Dict[Hashable, SharedDeadline] = {}
+_deadlines_lock = threading.Lock()
+
+# Shared OCR (CPU-bound) and LLM (network-bound) capacity, served fairly per user.
+# Each server process has its own schedulers, so the OCR default splits the
+# host's cores across the WEB_CONCURRENCY workers instead of giving each all of them.
+_ocr_scheduler = FairScheduler(
+    "ocr", SchedulerSettings.from_env("OCR_SCHEDULER", per_process(os.cpu_count() or 4))
+)
+_llm_scheduler = FairScheduler("llm", SchedulerSettings.from_env("LLM_SCHEDULER", 8))
+
+# Documents of one request in the OCR and in the LLM stage at once, so a
+# large upload never floods the per-user scheduler queues.
+MAX_DOCUMENTS_IN_FLIGHT = int(os.getenv("PIPELINE_MAX_DOCUMENTS_IN_FLIGHT", "4"))
+# Documents buffered between two stages before the faster one waits.
+STAGE_QUEUE_SIZE = int(os.getenv("PIPELINE_STAGE_QUEUE_SIZE", "2"))
+
+DEFAULT_USER = "anonymous"
+
+# Answers to repeated questions over the same uploads. Per worker process:
+# with several workers each keeps (and misses) its own entries.
+_answer_cache: TTLCache[str] = TTLCache(
+    maxsize=int(os.getenv("ANSWER_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600")),
+)
 
 
 class PipelineService:
@@ -31,36 +115,463 @@ class PipelineService:
         ocr_service: OCRService | None = None,
         chatbot_service: ChatbotService | None = None,
         log_service: UsageLogService | None = None,
+        single_flight: SingleFlight | None = None,
+        token_budget: int | None = None,
+        candidate_service: CandidateService | None = None,
+        answer_cache: TTLCache[str] | None = None,
+        ocr_scheduler: FairScheduler | None = None,
+        llm_scheduler: FairScheduler | None = None,
     ) -> None:
         self._ocr_service = ocr_service or OCRService()
         self._chatbot_service = chatbot_service or ChatbotService()
         self._log_service = log_service or UsageLogService()
+        self._candidate_service = candidate_service or CandidateService()
+        self._single_flight = single_flight or _document_flights
+        self._shared_deadlines = _document_deadlines if single_flight is None else {}
+        self._answer_cache = answer_cache if answer_cache is not None else _answer_cache
+        self._ocr_scheduler = ocr_scheduler or _ocr_scheduler
+        self._llm_scheduler = llm_scheduler or _llm_scheduler
+        if token_budget is None:
+            token_budget = int(os.getenv("LLM_DOC_TOKEN_BUDGET", "4000"))
+        self._token_budget = token_budget
+
+    def _ocr_document(
+        self, digest: str, file_obj: FileInput, deadline: Deadline
+    ) -> ProcessedDocument:
+        # Queued work of a request that already expired is dropped, not run.
+        deadline.check()
+        result = self._ocr_service.create(file_obj, None, deadline)
+        # The profile reads the whole CV; only the prompt text is capped, so
+        # skills and dates past the budget still count for filtering.
+        cleaned = clean_ocr_text(result.content)
+        profile = extract_profile(cleaned.text)
+        cleaned = fit_to_budget(cleaned, self._token_budget)
+        return ProcessedDocument(
+            filename=None,
+            content=cleaned.text,
+            summary="",
+            content_hash=digest,
+            tokens_before=cleaned.tokens_before,
+            tokens_after=cleaned.tokens_after,
+            profile=profile,
+        )
 
-    def create(self, data: PipelineCreate) -> PipelineResponse:
-        ocr_results = self._ocr_service.findAll(data.files)
-        processed_docs: List[ProcessedDocument] = []
-
-        for result in ocr_results:
-            prompt = _build_summary_prompt(result.filename, result.content)
-            completion = self._chatbot_service.create(ChatbotCreate(query=prompt))
-            processed_docs.append(
-                ProcessedDocument(
-                    filename=result.filename,
-                    content=result.content,
-                    summary=completion.answer.strip(),
+    def _remember_profile(self, document: ProcessedDocument) -> None:
+        # Stored profiles only let later queries skip known mismatches, so a
+        # failed write is logged and the document keeps its status.
+        if document.profile is not None and document.content_hash is not None:
+            try:
+                self._candidate_service.create(
+                    document.content_hash, document.profile, document.filename
                 )
+            except Exception:
+                logger.exception("Could not store the profile of %s", document.content_hash)
+
+    def _ask(self, prompt: str, deadline: Deadline) -> str:
+        deadline.check()
+        completion = self._chatbot_service.create(
+            ChatbotCreate(query=prompt, timeout=deadline.timeout())
+        )
+        return completion.answer.strip()
+
+    def _summarize_document(
+        self, document: ProcessedDocument, prompt: str, deadline: Deadline
+    ) -> ProcessedDocument:
+        return replace(document, summary=self._ask(prompt, deadline))
+
+    def _complete(self, user_id: str, prompt: str, deadline: Deadline) -> str:
+        """Run one LLM completion through the fair scheduler."""
+        future = self._llm_scheduler.submit(user_id, lambda: self._ask(prompt, deadline))
+        return deadline.wait_for(future)
+
+    # Work shared by content hash is handed to every request uploading the
+    # same bytes, so it never carries a filename; callers set their own.
+
+    def _forget_deadline(self, key: Hashable, shared: SharedDeadline) -> None:
+        with _deadlines_lock:
+            if self._shared_deadlines.get(key) is shared:
+                del self._shared_deadlines[key]
+
+    def _share(
+        self,
+        key: Hashable,
+        scheduler: FairScheduler,
+        user_id: str,
+        work: Callable[[Deadline], ProcessedDocument],
+        deadline: Deadline,
+    ) -> Tuple["Future[ProcessedDocument]", bool]:
+        """Start ``work`` for ``key`` or join the run already in flight.
+
+        The run is bounded by a deadline that every joining request extends,
+        so it stops only once all of its waiters have timed out or left.
+        Returns the shared future and whether this call started the run.
+        """
+        started: List[SharedDeadline] = []
+
+        def start() -> "Future[ProcessedDocument]":
+            shared = SharedDeadline(deadline)
+            with _deadlines_lock:
+                self._shared_deadlines[key] = shared
+            future = scheduler.submit(user_id, lambda: work(shared))
+            future.add_done_callback(lambda _done: self._forget_deadline(key, shared))
+            started.append(shared)
+            return future
+
+        future = self._single_flight.share(key, start)
+        if not started:
+            with _deadlines_lock:
+                shared = self._shared_deadlines.get(key)
+            if shared is not None:
+                shared.join(deadline)
+        return future, bool(started)
+
+    def _extract_async(
+        self, user_id: str, digest: str, file_obj: FileInput, deadline: Deadline
+    ) -> Tuple["Future[ProcessedDocument]", bool]:
+        return self._share(
+            ("ocr", digest),
+            self._ocr_scheduler,
+            user_id,
+            lambda shared: self._ocr_document(digest, file_obj, shared),
+            deadline,
+        )
+
+    def _summary_async(
+        self, user_id: str, document: ProcessedDocument, prompt: str, deadline: Deadline
+    ) -> Tuple["Future[ProcessedDocument]", bool]:
+        anonymous = replace(document, filename=None)
+        return self._share(
+            ("summary", document.content_hash, self._chatbot_service.model),
+            self._llm_scheduler,
+            user_id,
+            lambda shared: self._summarize_document(anonymous, prompt, shared),
+            deadline,
+        )
+
+    @staticmethod
+    def _await_shared(
+        start: Callable[[], Tuple["Future[ProcessedDocument]", bool]], deadline: Deadline
+    ) -> ProcessedDocument:
+        """Wait on coalesced work under this request's deadline.
+
+        A run joined from another request reads that request's upload. If it
+        fails while our deadline still holds (e.g. that upload was closed when
+        its request ended), the work is started once more, this time with ours.
+        """
+        retried = False
+        while True:
+            future, started = start()
+            try:
+                return deadline.wait_for(future)
+            except DeadlineExceeded:
+                if deadline.expired or retried:
+                    raise
+            except Exception:
+                if started or retried:
+                    raise
+            retried = True
+
+    @contextmanager
+    def admit(self, user_id: str | None, documents: int = 1) -> Iterator[None]:
+        """Hold room for ``documents`` documents of this user in both schedulers.
+
+        Raises ``SchedulerSaturatedError`` when the user (or everyone) already
+        has too much pending; process the request inside the block.
+        """
+        user_id = user_id or DEFAULT_USER
+        with ExitStack() as admitted:
+            admitted.enter_context(self._ocr_scheduler.admit(user_id, documents))
+            admitted.enter_context(self._llm_scheduler.admit(user_id, documents))
+            yield
+
+    def extract(
+        self,
+        file_obj: FileInput,
+        filename: str | None,
+        digest: str | None = None,
+        user_id: str | None = None,
+    ) -> ProcessedDocument:
+        """OCR one document and extract its profile, without calling the LLM."""
+        digest = digest or file_digest(file_obj)
+        deadline = Deadline()
+        document = self._await_shared(
+            lambda: self._extract_async(user_id or DEFAULT_USER, digest, file_obj, deadline),
+            deadline,
+        )
+        document = replace(document, filename=filename)
+        self._remember_profile(document)
+        return document
+
+    def complete_summary(
+        self, document: ProcessedDocument, user_id: str | None = None
+    ) -> ProcessedDocument:
+        """Add the LLM summary to an extracted document, sharing in-flight work."""
+        if document.summary:
+            return document
+        prompt = _build_summary_prompt(document.content)
+        deadline = Deadline()
+        summarized = self._await_shared(
+            lambda: self._summary_async(user_id or DEFAULT_USER, document, prompt, deadline),
+            deadline,
+        )
+        return replace(summarized, filename=document.filename)
+
+    def summarize(
+        self,
+        file_obj: FileInput,
+        filename: str | None,
+        digest: str | None = None,
+        user_id: str | None = None,
+    ) -> ProcessedDocument:
+        """OCR and summarise one document, sharing in-flight work for identical bytes."""
+        return self.complete_summary(self.extract(file_obj, filename, digest, user_id), user_id)
+
+    @staticmethod
+    def constraints_for(query: str | None) -> ProfileConstraints:
+        return parse_constraints(query) if query else ProfileConstraints()
+
+    def _known_rejections(
+        self, constraints: ProfileConstraints, digests: Sequence[str]
+    ) -> Set[str]:
+        """Documents whose stored profile already fails the constraints; they skip OCR."""
+        if constraints.empty:
+            return set()
+        known = self._candidate_service.findMany(digests)
+        if not known:
+            return set()
+        accepted = set(self._candidate_service.findAll(constraints, known))
+        return set(known) - accepted
+
+    def _process_unique(
+        self,
+        data: PipelineCreate,
+        digests: Sequence[str],
+        on_document: ProgressCallback | None = None,
+        known: Mapping[str, ProcessedDocument] | None = None,
+    ) -> List[ProcessedDocument]:
+        """Process each distinct document once; only those meeting the query's hard
+        constraints are summarised and returned, keeping per-file filenames.
+
+        Documents stream through OCR -> prompt -> LLM -> record stages joined
+        by bounded queues, so document N is summarised while OCR runs on
+        document N+1 and batch time tends to max(OCR, LLM) rather than the sum.
+        ``known`` documents (by content hash) skip OCR, and the LLM too when
+        already summarised; ``on_document`` reports each finished document.
+        """
+        user_id = data.user_id or DEFAULT_USER
+        deadline = data.deadline or Deadline()
+        constraints = self.constraints_for(data.query)
+        rejected = self._known_rejections(constraints, list(dict.fromkeys(digests)))
+
+        known = known or {}
+        unique: Dict[str, ProcessedDocument | None] = {digest: None for digest in rejected}
+        work: Dict[str, _WorkItem] = {}
+        for digest, (file_obj, filename) in zip(digests, data.files):
+            if digest not in rejected and digest not in work:
+                document = known.get(digest)
+                if document is not None and document.status != "ok":
+                    document = None
+                work[digest] = _WorkItem(digest, file_obj, filename, document)
+
+        total = len(unique) + len(work)
+        done = 0
+        progress_lock = threading.Lock()
+
+        def report(document: ProcessedDocument | None, selected: bool) -> None:
+            nonlocal done
+            if on_document is None:
+                return
+            with progress_lock:
+                done += 1
+                on_document(done, total, document, selected)
+
+        for _digest in rejected:
+            report(None, False)
+
+        def guarded(step: Callable[[_WorkItem], None]) -> Callable[[_WorkItem], _WorkItem]:
+            """Skip unfinished items; in best-effort mode turn errors into a per-document status."""
+
+            def run(item: _WorkItem) -> _WorkItem:
+                if item.document is not None and item.document.status != "ok":
+                    return item
+                try:
+                    step(item)
+                except Exception as exc:
+                    if deadline.cancelled or not data.best_effort:
+                        if deadline.expired and not isinstance(exc, DeadlineExceeded):
+                            raise DeadlineExceeded(cancelled=deadline.cancelled) from exc
+                        raise
+                    item.document = ProcessedDocument(
+                        filename=item.filename,
+                        content="",
+                        summary="",
+                        content_hash=item.digest,
+                        status="timeout" if deadline.expired else "failed",
+                        error=str(exc),
+                    )
+                return item
+
+            return run
+
+        def ocr(item: _WorkItem) -> None:
+            if item.document is not None:
+                item.document = replace(item.document, filename=item.filename)
+                return
+            document = self._await_shared(
+                lambda: self._extract_async(user_id, item.digest, item.file_obj, deadline),
+                deadline,
             )
+            item.document = replace(document, filename=item.filename)
+
+        def build_prompt(item: _WorkItem) -> None:
+            document = item.document
+            if document.profile is None or matches(document.profile, constraints):
+                item.prompt = _build_summary_prompt(document.content)
+
+        def summarize(item: _WorkItem) -> None:
+            if item.prompt is not None and not item.document.summary:
+                document = self._await_shared(
+                    lambda: self._summary_async(user_id, item.document, item.prompt, deadline),
+                    deadline,
+                )
+                item.document = replace(document, filename=item.filename)
+
+        def record(item: _WorkItem) -> _WorkItem:
+            document = item.document
+            if document.status != "ok":
+                unique[item.digest] = document
+                report(document, True)
+                return item
+            self._remember_profile(document)
+            unique[item.digest] = document if item.prompt is not None else None
+            report(document, item.prompt is not None)
+            return item
+
+        in_flight = max(1, min(MAX_DOCUMENTS_IN_FLIGHT, len(work)))
+        StagePipeline(
+            [
+                Stage("ocr", guarded(ocr), workers=in_flight),
+                Stage("prompt", guarded(build_prompt)),
+                Stage("llm", guarded(summarize), workers=in_flight),
+                Stage("record", record),
+            ],
+            maxsize=STAGE_QUEUE_SIZE,
+        ).run(work.values())
+
+        return [
+            replace(unique[digest], filename=filename)
+            for digest, (_, filename) in zip(digests, data.files)
+            if unique[digest] is not None
+        ]
+
+    def _answer_key(self, query: str, uploads: Uploads) -> AnswerKey:
+        # Answers name candidates by filename, so the same documents under other
+        # names are another answer; the order they were sent in is not.
+        return (_normalize_query(query), uploads, self._chatbot_service.model, PROMPT_VERSION)
+
+    def cached_answer(
+        self, data: PipelineCreate, content_hashes: Sequence[str]
+    ) -> PipelineResponse | None:
+        """Serve a previous answer for the same question over the same documents.
+
+        Returns ``None`` when there is no query, the request bypasses the
+        cache, or nothing fresh is cached; a hit is recorded in the usage log.
+        """
+        if not data.query or not data.use_cache:
+            return None
+        answer = self._answer_cache.get(
+            self._answer_key(data.query, _uploads(data, content_hashes))
+        )
+        if answer is None:
+            return None
+        response_payload = PipelineResponse(
+            request_id=data.request_id,
+            user_id=data.user_id,
+            answer=answer,
+            cached=True,
+        )
+        self._record(data, response_payload, metrics=None)
+        return response_payload
+
+    def create(
+        self,
+        data: PipelineCreate,
+        on_document: ProgressCallback | None = None,
+        known: Mapping[str, ProcessedDocument] | None = None,
+    ) -> PipelineResponse:
+        """Run the whole pipeline for one request.
+
+        ``on_document`` is called from pipeline threads as each distinct
+        document finishes; ``known`` maps content hashes to documents already
+        processed by the caller (e.g. a UI session), which are not redone.
+        """
+        digests = [file_digest(file_obj) for file_obj, _ in data.files]
+        cached = self.cached_answer(data, digests)
+        if cached is not None:
+            return cached
+        with self.admit(data.user_id, len(set(digests))):
+            documents = self._process_unique(data, digests, on_document, known)
+            return self.finalize(data, documents, content_hashes=digests)
+
+    def finalize(
+        self,
+        data: PipelineCreate,
+        processed_docs: Sequence[ProcessedDocument],
+        content_hashes: Sequence[str] | None = None,
+    ) -> PipelineResponse:
+        """Answer the query (if any), build the response and record the usage log.
+
+        ``content_hashes`` lists every uploaded document, including those
+        filtered out before reaching this point; it keys the answer cache.
+        Documents that fail the query's hard constraints are dropped here as
+        well, so callers may pass every processed document.
+        """
+        deadline = data.deadline or Deadline()
+        constraints = self.constraints_for(data.query)
+        if content_hashes is None:
+            uploads: Uploads = tuple(
+                sorted(
+                    ((doc.content_hash or "", doc.filename) for doc in processed_docs),
+                    key=_upload_order,
+                )
+            )
+        else:
+            uploads = _uploads(data, content_hashes)
+        candidates = len({content_hash for content_hash, _ in uploads})
+        processed_docs = [
+            doc
+            for doc in processed_docs
+            if doc.status != "ok" or doc.profile is None or matches(doc.profile, constraints)
+        ]
+        finished = [doc for doc in processed_docs if doc.status == "ok"]
+        partial = len(finished) < len(processed_docs)
 
         answer: str | None = None
-        if data.query:
-            prompt = _build_query_prompt(data.query, processed_docs)
-            response = self._chatbot_service.create(ChatbotCreate(query=prompt))
-            answer = response.answer.strip()
+        if data.query and not partial:
+            survivors = _distinct_documents(finished)
+            try:
+                if survivors:
+                    prompt = _build_query_prompt(data.query, survivors)
+                    answer = self._complete(data.user_id or DEFAULT_USER, prompt, deadline)
+                else:
+                    answer = NO_MATCH_ANSWER
+            except Exception as exc:
+                if deadline.cancelled or not data.best_effort:
+                    if deadline.expired and not isinstance(exc, DeadlineExceeded):
+                        raise DeadlineExceeded(cancelled=deadline.cancelled) from exc
+                    raise
+                partial = True
+            else:
+                self._answer_cache.set(self._answer_key(data.query, uploads), answer)
 
+        # Partial best-effort responses always carry the per-document status,
+        # even for queries, since there may be no answer to show.
         summaries: List[DocumentSummary] = []
-        if not data.query:
+        if not data.query or partial:
             summaries = [
-                DocumentSummary(filename=doc.filename, summary=doc.summary)
+                DocumentSummary(
+                    filename=doc.filename, summary=doc.summary, status=doc.status, error=doc.error
+                )
                 for doc in processed_docs
             ]
 
@@ -69,25 +580,99 @@ class PipelineService:
             user_id=data.user_id,
             summaries=summaries,
             answer=answer,
+            partial=partial,
         )
 
+        metrics = _token_metrics(finished)
+        if partial:
+            metrics["partial"] = {
+                status: sum(1 for doc in processed_docs if doc.status == status)
+                for status in ("ok", "timeout", "failed")
+            }
+        if not constraints.empty:
+            metrics["profile_filter"] = {
+                "constraints": constraints.to_document(),
+                "candidates": candidates,
+                "survivors": len(_distinct_documents(processed_docs)),
+            }
+        self._record(data, response_payload, metrics)
+
+        return response_payload
+
+    def _record(
+        self,
+        data: PipelineCreate,
+        response_payload: PipelineResponse,
+        metrics: Dict[str, Any] | None,
+    ) -> None:
         log_payload = UsageLogCreate(
             request_id=data.request_id,
             user_id=data.user_id,
             query=data.query,
             result=response_payload.model_dump_json(),
+            metrics=metrics,
+            cached=response_payload.cached,
         )
         self._log_service.create(log_payload)
 
-        return response_payload
+
+def _upload_order(upload: Tuple[str, str | None]) -> Tuple[str, str]:
+    content_hash, filename = upload
+    return content_hash, filename or ""
+
+
+def _uploads(data: PipelineCreate, content_hashes: Sequence[str]) -> Uploads:
+    return tuple(
+        sorted(
+            (
+                (content_hash, filename)
+                for content_hash, (_, filename) in zip(content_hashes, data.files)
+            ),
+            key=_upload_order,
+        )
+    )
+
+
+def _normalize_query(query: str) -> str:
+    """Case, accent-composition and whitespace differences do not change the question."""
+    normalized = unicodedata.normalize("NFKC", query).casefold()
+    return re.sub(r"\s+", " ", normalized).strip()
+
+
+def _token_metrics(documents: Sequence[ProcessedDocument]) -> Dict[str, Any]:
+    """Estimated OCR tokens before/after cleaning, per document and in total."""
+    distinct = _distinct_documents(documents)
+    return {
+        "ocr_tokens_before": sum(doc.tokens_before for doc in distinct),
+        "ocr_tokens_after": sum(doc.tokens_after for doc in distinct),
+        "documents": [
+            {
+                "filename": doc.filename,
+                "tokens_before": doc.tokens_before,
+                "tokens_after": doc.tokens_after,
+            }
+            for doc in documents
+        ],
+    }
+
+
+def _distinct_documents(documents: Sequence[ProcessedDocument]) -> List[ProcessedDocument]:
+    """Drop repeated uploads of the same content so the prompt carries each CV once."""
+    seen: set[str | None] = set()
+    distinct: List[ProcessedDocument] = []
+    for doc in documents:
+        if doc.content_hash is not None and doc.content_hash in seen:
+            continue
+        seen.add(doc.content_hash)
+        distinct.append(doc)
+    return distinct
 
 
-def _build_summary_prompt(filename: str | None, content: str) -> str:
-    name_section = f"Currículo: {filename or 'Documento sem nome'}"
+def _build_summary_prompt(content: str) -> str:
+    # No filename: the summary is shared by every upload of the same content.
     return (
         "Você é um assistente de recrutamento. Gere um resumo curto em português, "
         "destacando experiências, habilidades técnicas e soft skills do candidato que se adequa melhor aos requisitos da vaga informada.\n"
-        f"{name_section}\n"
         "Conteúdo OCR:\n"
         f"{content}\n"
         "Resumo:"
@@ -110,7 +695,7 @@ def _build_query_prompt(query: str, documents: Sequence[ProcessedDocument]) -> s
         "em português atendendo às seguintes regras:\n"
         "1. Mencione apenas candidatos que realmente atendem aos requisitos da pergunta.\n"
         "2. Se um candidato não atender, simplesmente não o cite.\n"
-        "3. Se nenhum candidato atender, responda exatamente 'Nenhum candidato atende aos requisitos atuais.'\n"
+        f"3. Se nenhum candidato atender, responda exatamente '{NO_MATCH_ANSWER}'\n"
         "4. Para cada candidato mencionado, explique brevemente por que ele atende.\n"
         "5. Não crie comparativos ou tabelas com todos os currículos.\n"
         f"Pergunta: {query}\n"
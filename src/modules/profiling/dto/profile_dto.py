@@ -0,0 +1,72 @@
+"""DTOs for stored request profiles."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, List
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class Hotspot(BaseModel):
+    function: str
+    file: str
+    line: int
+    self_samples: int
+    total_samples: int
+    self_seconds: float = Field(..., description="Tempo estimado com a função no topo da pilha.")
+    total_seconds: float = Field(..., description="Tempo estimado incluindo as funções chamadas.")
+
+
+class ProfileSummary(BaseModel):
+    profile_id: str
+    method: str
+    path: str
+    status_code: int
+    wall_seconds: float
+    cpu_seconds: float
+    created_at: datetime
+
+
+class ProfileResponse(ProfileSummary):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "profile_id": "3f9c2b7a5d1e4c6f8a0b2d4e6f8a0c1e",
+                "method": "POST",
+                "path": "/api/pipeline/",
+                "status_code": 200,
+                "wall_seconds": 12.84,
+                "cpu_seconds": 3.12,
+                "sampled_seconds": 31.6,
+                "samples": 6320,
+                "interval_seconds": 0.005,
+                "threads": {"stage-ocr-0": 2540, "ocr-scheduler-0": 1190},
+                "hotspots": [
+                    {
+                        "function": "image_to_string",
+                        "file": "src/utils/ocr_engines.py",
+                        "line": 58,
+                        "self_samples": 1102,
+                        "total_samples": 1102,
+                        "self_seconds": 5.51,
+                        "total_seconds": 5.51,
+                    }
+                ],
+                "cumulative": [],
+                "created_at": "2026-10-19T13:39:46.920000",
+            }
+        }
+    )
+    sampled_seconds: float = Field(
+        ..., description="Tempo de parede somado entre as threads amostradas (inclui esperas)."
+    )
+    samples: int
+    interval_seconds: float
+    threads: Dict[str, int] = Field(default_factory=dict, description="Amostras por thread.")
+    hotspots: List[Hotspot] = Field(
+        default_factory=list, description="Funções onde as amostras caíram (tempo próprio)."
+    )
+    cumulative: List[Hotspot] = Field(
+        default_factory=list, description="Funções por tempo acumulado, incluindo chamadas internas."
+    )
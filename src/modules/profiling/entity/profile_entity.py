@@ -0,0 +1,27 @@
+"""Entity describing a stored request profile."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict
+
+
+@dataclass(slots=True)
+class RequestProfileRecord:
+    profile_id: str
+    method: str
+    path: str
+    status_code: int
+    report: Dict[str, Any]
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    def to_document(self) -> Dict[str, Any]:
+        return {
+            "profile_id": self.profile_id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            **self.report,
+            "created_at": self.created_at,
+        }
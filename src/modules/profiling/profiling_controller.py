@@ -0,0 +1,65 @@
+"""Endpoints to retrieve stored request profiles."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, status
+
+from .dto.profile_dto import ProfileResponse, ProfileSummary
+from .profiling_service import ProfileService, ProfilingSettings, get_settings
+
+router = APIRouter(prefix="/profiles", tags=["Profiling"])
+
+
+@lru_cache(maxsize=1)
+def get_service() -> ProfileService:
+    return ProfileService(settings=get_settings())
+
+
+def require_admin(
+    x_profile_token: Optional[str] = Header(default=None, description="Token de administração do profiling"),
+    settings: ProfilingSettings = Depends(get_settings),
+) -> None:
+    if not settings.authorizes(x_profile_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid profiling token")
+
+
+@router.get(
+    "/",
+    response_model=List[ProfileSummary],
+    summary="Listar perfis",
+    description="Lista os perfis de requisições mais recentes (tempo de parede e de CPU).",
+    dependencies=[Depends(require_admin)],
+    responses={403: {"description": "Token de profiling ausente ou inválido"}},
+)
+def findAll(
+    limit: int = Query(default=50, ge=1, le=500),
+    service: ProfileService = Depends(get_service),
+) -> List[ProfileSummary]:
+    return [ProfileSummary(**document) for document in service.findAll(limit)]
+
+
+@router.get(
+    "/{profile_id}",
+    response_model=ProfileResponse,
+    summary="Consultar perfil",
+    description=(
+        "Retorna o perfil de uma requisição (identificador do cabeçalho `X-Profile-Id`): "
+        "tempo de parede e de CPU, amostras por thread e as funções mais custosas."
+    ),
+    dependencies=[Depends(require_admin)],
+    responses={
+        403: {"description": "Token de profiling ausente ou inválido"},
+        404: {"description": "Perfil não encontrado"},
+    },
+)
+def findOne(
+    profile_id: str = Path(..., description="Profile identifier"),
+    service: ProfileService = Depends(get_service),
+) -> ProfileResponse:
+    document = service.findOne(profile_id)
+    if document is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return ProfileResponse(**document)
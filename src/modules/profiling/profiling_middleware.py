@@ -0,0 +1,124 @@
+"""ASGI middleware and route class that profile requests flagged by an admin."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import uuid
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils import profiling
+
+from .entity.profile_entity import RequestProfileRecord
+from .profiling_service import ProfileService, ProfilingSettings, get_settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_FLAG_OFF = frozenset({"0", "false", "no", "off"})
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilingMiddleware:
+    """Samples requests that carry the admin token in the ``X-Profile-Token`` header.
+
+    The token is never read from the URL, where it would end up in access
+    logs and browser history; ``?profile=0`` lets a client that always sends
+    the header skip profiling. Installed only when profiling is enabled;
+    other requests go straight to the app. The profile id is returned in
+    ``X-Profile-Id`` and the report is stored once the response body has
+    been sent.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        settings: ProfilingSettings,
+        service_factory: Callable[[], ProfileService],
+    ) -> None:
+        self.app = app
+        self.settings = settings
+        self._service_factory = service_factory
+
+    def _requested(self, scope: Scope) -> bool:
+        path = scope.get("path", "")
+        if not any(path.startswith(prefix) for prefix in self.settings.paths):
+            return False
+        token: Optional[bytes] = None
+        for name, value in scope.get("headers", []):
+            if name == PROFILE_TOKEN_HEADER:
+                token = value
+                break
+        if not self.settings.authorizes(token):
+            return False
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        flag = (query.get(PROFILE_QUERY_PARAM) or ["1"])[0]
+        return flag.strip().lower() not in PROFILE_FLAG_OFF
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        status_code = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [*message.get("headers", []), (PROFILE_ID_HEADER, profile_id.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profile = profiling.RequestProfile(interval=self.settings.interval_seconds)
+        token = profiling.activate(profile)
+        profile.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile.stop()
+            profiling.deactivate(token)
+            record = RequestProfileRecord(
+                profile_id=profile_id,
+                method=scope.get("method", ""),
+                path=scope.get("path", ""),
+                status_code=status_code,
+                report=profile.report(self.settings.top),
+            )
+            try:
+                await run_in_threadpool(self._service_factory().create, record)
+            except Exception:  # the request itself already succeeded or failed on its own
+                logger.exception("Could not store profile %s for %s", profile_id, record.path)
+
+
+class ProfiledRoute(APIRoute):
+    """Route whose sync endpoints attach the active profile to their threadpool thread.
+
+    Async endpoints run on the event loop, shared with every other request,
+    so they hand their blocking work over with :func:`profiling.bind` instead.
+    Endpoints are left untouched when profiling is disabled.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if get_settings().enabled and not asyncio.iscoroutinefunction(endpoint):
+            endpoint = _bind_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _bind_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(endpoint)
+    def profiled_endpoint(*args: Any, **kwargs: Any) -> Any:
+        return profiling.bind(endpoint)(*args, **kwargs)
+
+    return profiled_endpoint
+
+
+__all__ = ["ProfiledRoute", "ProfilingMiddleware"]
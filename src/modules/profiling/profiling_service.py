@@ -0,0 +1,100 @@
+"""Settings and persistence for on-demand request profiles."""
+
+from __future__ import annotations
+
+import hmac
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from src.infra.database.script import get_collection
+
+from .entity.profile_entity import RequestProfileRecord
+
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
+SUMMARY_PROJECTION = {
+    "_id": 0,
+    "profile_id": 1,
+    "method": 1,
+    "path": 1,
+    "status_code": 1,
+    "wall_seconds": 1,
+    "cpu_seconds": 1,
+    "created_at": 1,
+}
+
+
+@dataclass(slots=True)
+class ProfilingSettings:
+    enabled: bool = False
+    admin_token: str = ""
+    interval_seconds: float = 0.005
+    top: int = 30
+    paths: Tuple[str, ...] = ("/api/pipeline", "/api/logs")
+    retention_seconds: int = 7 * 24 * 3600
+
+    @classmethod
+    def from_env(cls) -> "ProfilingSettings":
+        flag = os.getenv("PROFILING_ENABLED", "false").strip().lower() in {"1", "true", "yes", "on"}
+        admin_token = os.getenv("PROFILING_ADMIN_TOKEN", "")
+        paths = os.getenv("PROFILING_PATHS", "/api/pipeline,/api/logs")
+        return cls(
+            # Without a token anyone could trigger profiling, so both are required.
+            enabled=flag and bool(admin_token),
+            admin_token=admin_token,
+            interval_seconds=float(os.getenv("PROFILING_INTERVAL_MS", "5")) / 1000,
+            top=int(os.getenv("PROFILING_TOP", "30")),
+            paths=tuple(path.strip() for path in paths.split(",") if path.strip()),
+            retention_seconds=int(float(os.getenv("PROFILING_RETENTION_DAYS", "7")) * 24 * 3600),
+        )
+
+    def authorizes(self, token: str | bytes | None) -> bool:
+        """Constant-time check of a token taken from the ``X-Profile-Token`` header."""
+        if not self.enabled or token is None:
+            return False
+        if isinstance(token, str):
+            token = token.encode("utf-8")
+        return hmac.compare_digest(token, self.admin_token.encode("utf-8"))
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> ProfilingSettings:
+    return ProfilingSettings.from_env()
+
+
+class ProfileService:
+    """Stores request profiles; Mongo expires them after the retention period."""
+
+    def __init__(
+        self,
+        collection: Optional[Collection] = None,
+        settings: Optional[ProfilingSettings] = None,
+    ) -> None:
+        collection_name = os.getenv("MONGODB_PROFILES_COLLECTION", "request_profiles")
+        self._collection: Collection = collection or get_collection(collection_name)
+        self.settings = settings or get_settings()
+        self._indexed = False
+
+    def _ensure_indexes(self) -> None:
+        if self._indexed:
+            return
+        self._collection.create_index("profile_id", unique=True)
+        self._collection.create_index(
+            "created_at", expireAfterSeconds=self.settings.retention_seconds
+        )
+        self._indexed = True
+
+    def create(self, record: RequestProfileRecord) -> str:
+        self._ensure_indexes()
+        self._collection.insert_one(record.to_document())
+        return record.profile_id
+
+    def findOne(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return self._collection.find_one({"profile_id": profile_id}, {"_id": 0})
+
+    def findAll(self, limit: int = 50) -> List[Dict[str, Any]]:
+        documents = self._collection.find({}, SUMMARY_PROJECTION).sort("created_at", -1).limit(limit)
+        return list(documents)
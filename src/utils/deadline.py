@@ -0,0 +1,111 @@
+"""Per-request time budgets that can also be cancelled from outside."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import Callable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+POLL_SECONDS = 0.2
+
+
+class DeadlineExceeded(RuntimeError):
+    """Raised when a request's time budget ran out or the request was cancelled."""
+
+    def __init__(self, message: str = "Request deadline exceeded", cancelled: bool = False) -> None:
+        super().__init__(message)
+        self.cancelled = cancelled
+
+
+class Deadline:
+    """Budget of ``seconds`` from now (``None`` means unbounded).
+
+    Long-running stages call :meth:`check` between units of work (pages,
+    documents, LLM calls) and size their own timeouts with :meth:`timeout`.
+    :meth:`cancel` (e.g. on client disconnect) makes every later check fail.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._expires_at = None if seconds is None else clock() + seconds
+        self._cancelled = threading.Event()
+        self._reason = "Request cancelled"
+
+    def remaining(self) -> Optional[float]:
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - self._clock())
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return self.cancelled or (remaining is not None and remaining <= 0)
+
+    def cancel(self, reason: str = "Request cancelled") -> None:
+        self._reason = reason
+        self._cancelled.set()
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise DeadlineExceeded(self._reason, cancelled=True)
+        if self.expired:
+            raise DeadlineExceeded()
+
+    def timeout(self, default: Optional[float] = None) -> Optional[float]:
+        """Timeout for a blocking call: the remaining budget, capped by ``default``."""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return remaining if default is None else min(default, remaining)
+
+    def wait_for(self, future: "Future[T]") -> T:
+        """Wait for ``future`` but give up as soon as the deadline passes or is cancelled."""
+        while True:
+            self.check()
+            done, _ = wait([future], timeout=self.timeout(POLL_SECONDS))
+            if done:
+                return future.result()
+
+
+class SharedDeadline(Deadline):
+    """Deadline of work shared by several requests.
+
+    It runs out only once every joined deadline has expired or been
+    cancelled, so one waiter timing out or disconnecting does not stop the
+    work for the others; :meth:`timeout` is the loosest remaining budget.
+    """
+
+    def __init__(self, deadline: Deadline) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self._deadlines = [deadline]
+
+    def join(self, deadline: Deadline) -> None:
+        with self._lock:
+            self._deadlines.append(deadline)
+
+    def _joined(self) -> List[Deadline]:
+        with self._lock:
+            return list(self._deadlines)
+
+    def remaining(self) -> Optional[float]:
+        live = [deadline.remaining() for deadline in self._joined() if not deadline.expired]
+        if not live:
+            return 0.0
+        if None in live:
+            return None
+        return max(live)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set() or all(deadline.cancelled for deadline in self._joined())
+
+
+__all__ = ["Deadline", "DeadlineExceeded", "SharedDeadline"]
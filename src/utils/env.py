@@ -0,0 +1,18 @@
+"""Environment loading shared by the application entrypoints."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def load_environment() -> None:
+    """Load ``.env`` once; safe to call from every entrypoint and settings factory."""
+    try:
+        from dotenv import load_dotenv
+    except ModuleNotFoundError:  # pragma: no cover - optional in minimal images
+        return
+    load_dotenv()
+
+
+__all__ = ["load_environment"]
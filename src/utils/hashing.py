@@ -0,0 +1,43 @@
+"""Content hashing helpers for uploaded documents."""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Any
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(file_obj: Any) -> str:
+    """SHA-256 of a document's bytes, streamed in chunks for files and streams."""
+    if isinstance(file_obj, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(file_obj).hexdigest()
+
+    if isinstance(file_obj, (str, Path)):
+        with open(Path(file_obj).expanduser(), "rb") as handle:
+            return hashlib.file_digest(handle, "sha256").hexdigest()
+
+    if hasattr(file_obj, "tobytes") and hasattr(file_obj, "mode"):  # PIL image
+        # Raw pixels alone collide across shapes and modes (e.g. 2x8 vs 4x4, L vs P).
+        digest = hashlib.sha256(f"{file_obj.mode}:{file_obj.size[0]}x{file_obj.size[1]}:".encode())
+        palette = file_obj.getpalette() if file_obj.mode == "P" else None
+        if palette:
+            digest.update(bytes(palette))
+        digest.update(file_obj.tobytes())
+        return digest.hexdigest()
+
+    if hasattr(file_obj, "read") and callable(file_obj.read):
+        if hasattr(file_obj, "seek"):
+            file_obj.seek(0)
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: file_obj.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+        if hasattr(file_obj, "seek"):
+            file_obj.seek(0)
+        return digest.hexdigest()
+
+    raise TypeError("Unsupported file input type for hashing")
+
+
+__all__ = ["file_digest"]
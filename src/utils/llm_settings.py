@@ -2,15 +2,13 @@
 
 from __future__ import annotations
 
+import inspect
 import json
 import os
 from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, Optional, Tuple
 
-from dotenv import load_dotenv
-
-load_dotenv()
-
+from src.utils.env import load_environment
 
 DEFAULT_BASE_URLS: Dict[str, str] = {
     "openrouter": "https://openrouter.ai/api/v1",
@@ -35,6 +33,7 @@ class LLMSettings:
 
     @classmethod
     def from_env(cls) -> "LLMSettings":
+        load_environment()
         api_key = os.getenv("LLM_API_KEY") or os.getenv("AI_SDK_API_KEY")
         if not api_key:
             raise LLMConfigurationError(
@@ -99,6 +98,41 @@ def _load_openai_client(settings: LLMSettings) -> Tuple[str, Any]:
     return "openai", client
 
 
+def _accepts_timeout(call: Callable[..., Any]) -> bool:
+    try:
+        parameters = inspect.signature(call).parameters
+    except (TypeError, ValueError):  # builtins and some C extensions
+        return False
+    return "timeout" in parameters
+
+
+def _resolve(client: Any, path: str) -> Callable[..., Any]:
+    target = client
+    for name in path.split("."):
+        target = getattr(target, name)
+    return target
+
+
+def _call_with_timeout(client: Any, path: str, timeout: Optional[float], **kwargs: Any) -> Any:
+    """Call ``path`` (e.g. ``"chat.completions.create"``) on ``client``, bounded by ``timeout``.
+
+    The timeout goes to the method when it declares one, else to a client
+    copy from ``with_options(timeout=...)`` (OpenAI-style SDKs). A client with
+    neither cannot be bounded, so the call runs to completion on the calling
+    thread: it keeps holding its scheduler slot instead of running on past the
+    concurrency cap, and callers waiting on it still stop at their deadline.
+    """
+    call = _resolve(client, path)
+    if timeout is None:
+        return call(**kwargs)
+    if _accepts_timeout(call):
+        return call(timeout=timeout, **kwargs)
+    with_options = getattr(client, "with_options", None)
+    if callable(with_options):
+        return _resolve(with_options(timeout=timeout), path)(**kwargs)
+    return call(**kwargs)
+
+
 class LLMClient:
     """Thin wrapper over LLM providers used throughout the application."""
 
@@ -127,10 +161,16 @@ class LLMClient:
             "No supported LLM provider installed. Install ai-sdk or openai packages."
         )
 
-    def complete(self, prompt: str) -> str:
-        """Generate a completion from the configured LLM."""
+    def complete(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """Generate a completion from the configured LLM.
+
+        ``timeout`` (seconds) bounds this call; see :func:`_call_with_timeout`.
+        """
         if self.provider == "ai_sdk":
-            response = self._client.chat.completions.create(
+            response = _call_with_timeout(
+                self._client,
+                "chat.completions.create",
+                timeout,
                 model=self.settings.model,
                 messages=[{"role": "user", "content": prompt}],
             )
@@ -141,8 +181,9 @@ class LLMClient:
             return message.get("content", "")
 
         if hasattr(self._client, "responses"):
-            response_call = getattr(self._client.responses, "create")
-            response = response_call(model=self.settings.model, input=prompt)
+            response = _call_with_timeout(
+                self._client, "responses.create", timeout, model=self.settings.model, input=prompt
+            )
             output_text = getattr(response, "output_text", None)
             if output_text is not None:
                 return output_text
@@ -152,7 +193,10 @@ class LLMClient:
             return str(response)
 
         if hasattr(self._client, "chat"):
-            response = self._client.chat.completions.create(
+            response = _call_with_timeout(
+                self._client,
+                "chat.completions.create",
+                timeout,
                 model=self.settings.model,
                 messages=[{"role": "user", "content": prompt}],
             )
@@ -163,9 +207,8 @@ class LLMClient:
             return message.get("content", "")
 
         if hasattr(self._client, "complete"):
-            response = self._client.complete(
-                model=self.settings.model,
-                prompt=prompt,
+            response = _call_with_timeout(
+                self._client, "complete", timeout, model=self.settings.model, prompt=prompt
             )
             return getattr(response, "text", str(response))
 
@@ -3,92 +3,432 @@
 from __future__ import annotations
 
 import io
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import BinaryIO, List, Sequence, Union
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-import pytesseract
-from pdf2image import convert_from_bytes
-from PIL import Image, ImageFilter, ImageOps
+from src.utils.deadline import Deadline
+from src.utils.ocr_engines import OCREngine, RecognizedText, get_engine
 
-FileInput = Union[str, Path, bytes, bytearray, BinaryIO, Image.Image]
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
 
+# numpy, pdf2image and Pillow are imported on first use so importing the API
+# (and answering health checks) does not pay for the imaging stack.
+FileInput = Union[str, Path, bytes, bytearray, BinaryIO, "Image.Image"]
 
-def _read_all_bytes(file_obj: FileInput) -> bytes:
-    """Return raw bytes from a supported input type."""
-    if isinstance(file_obj, (bytes, bytearray)):
-        return bytes(file_obj)
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass(slots=True)
+class OCRSettings:
+    """Rendering and adaptive-retry knobs for ``OCRProcessor``."""
+
+    adaptive: bool = False
+    base_dpi: int = 200
+    fast_dpi: int = 150
+    high_dpi: int = 300
+    min_confidence: float = 75.0
+    fallback_psms: Tuple[int, ...] = (4, 3)
+    max_dimension: int = 3508
+    denoise: str = "auto"
+    pdf_page_batch: int = 1
+
+    @classmethod
+    def from_env(cls) -> "OCRSettings":
+        raw_psms = os.getenv("OCR_FALLBACK_PSMS", "4,3")
+        return cls(
+            adaptive=_env_flag("OCR_ADAPTIVE"),
+            base_dpi=int(os.getenv("OCR_DPI", "200")),
+            fast_dpi=int(os.getenv("OCR_FAST_DPI", "150")),
+            high_dpi=int(os.getenv("OCR_HIGH_DPI", "300")),
+            min_confidence=float(os.getenv("OCR_MIN_CONFIDENCE", "75")),
+            fallback_psms=tuple(int(item) for item in raw_psms.split(",") if item.strip()),
+            max_dimension=int(os.getenv("OCR_MAX_DIMENSION", "3508")),
+            denoise=(os.getenv("OCR_DENOISE", "auto") or "auto").lower(),
+            pdf_page_batch=max(1, int(os.getenv("OCR_PDF_PAGE_BATCH", "1"))),
+        )
 
-    if isinstance(file_obj, (str, Path)):
-        return Path(file_obj).expanduser().read_bytes()
+
+@dataclass(slots=True)
+class PageText:
+    text: str
+    number: Optional[int] = None
+    confidence: Optional[float] = None
+    dpi: Optional[int] = None
+    psm: Optional[int] = None
+
+
+def render_pages(pages: Sequence[PageText]) -> str:
+    """Join page texts, prefixing numbered (PDF) pages with ``[page N]``."""
+    texts = [
+        page.text if page.number is None else f"[page {page.number}]\n{page.text}"
+        for page in pages
+    ]
+    return "\n\n".join(texts).strip()
+
+
+def _open_stream(file_obj: FileInput) -> BinaryIO:
+    """Return a readable binary stream over in-memory or file-like input without copying it."""
+    if isinstance(file_obj, (bytes, bytearray)):
+        return io.BytesIO(file_obj)
 
     if hasattr(file_obj, "read") and callable(file_obj.read):
         if hasattr(file_obj, "seek"):
             file_obj.seek(0)
-        data = file_obj.read()
-        return data if isinstance(data, bytes) else data.encode()
+        return file_obj
 
     raise TypeError("Unsupported file input type for OCR")
 
 
-def _load_image(image_input: FileInput) -> Image.Image:
-    """Create a PIL image from bytes, file-like objects, or paths."""
+def _is_pdf(file_obj: FileInput) -> bool:
+    """Sniff the ``%PDF`` signature, reading only the first bytes."""
+    if isinstance(file_obj, (str, Path)):
+        if Path(file_obj).suffix.lower() == ".pdf":
+            return True
+        with open(Path(file_obj).expanduser(), "rb") as handle:
+            return handle.read(4) == b"%PDF"
+    if isinstance(file_obj, (bytes, bytearray)):
+        return bytes(file_obj[:4]) == b"%PDF"
+    stream = _open_stream(file_obj)
+    header = stream.read(4)
+    stream.seek(0)
+    return header == b"%PDF"
+
+
+def _own_descriptor(stream: BinaryIO) -> Optional[int]:
+    """A new descriptor for the file holding ``stream``'s bytes, if it lives on disk.
+
+    The caller owns (and closes) the duplicate, so the file stays readable
+    through ``/proc/<pid>/fd`` even after the upload is closed and its own
+    descriptor number is reused by another request. In-memory
+    ``SpooledTemporaryFile`` uploads roll over to disk on ``fileno()``.
+    """
+    try:
+        descriptor = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+    stream.flush()
+    return os.dup(descriptor)
+
+
+@contextmanager
+def _pdf_path(pdf_input: FileInput) -> Iterator[str]:
+    """Yield a filesystem path for the PDF, reusing the file behind disk-backed streams.
+
+    Only in-memory input is spooled to a temporary file, in chunks.
+    """
+    if isinstance(pdf_input, (str, Path)):
+        yield str(Path(pdf_input).expanduser())
+        return
+
+    stream = _open_stream(pdf_input)
+    descriptor = _own_descriptor(stream)
+    if descriptor is not None:
+        path = f"/proc/{os.getpid()}/fd/{descriptor}"
+        if os.path.exists(path):
+            try:
+                yield path
+            finally:
+                os.close(descriptor)
+            return
+        os.close(descriptor)  # no /proc: fall back to a copy
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as handle:
+        shutil.copyfileobj(stream, handle, COPY_CHUNK_SIZE)
+        handle.flush()
+        if stream is not pdf_input:
+            stream.close()
+        yield handle.name
+
+
+def _fit_size(width: int, height: int, max_dimension: Optional[int]) -> Tuple[int, int]:
+    if not max_dimension or max(width, height) <= max_dimension:
+        return width, height
+    factor = max_dimension / max(width, height)
+    return max(1, round(width * factor)), max(1, round(height * factor))
+
+
+def _load_image(image_input: FileInput, max_dimension: Optional[int] = None) -> Image.Image:
+    """Create a PIL image from bytes, file-like objects, or paths.
+
+    Oversized JPEGs are decoded in draft mode, letting libjpeg downscale by
+    1/2-1/8 while decoding instead of materialising every megapixel.
+    """
+    from PIL import Image
+
     if isinstance(image_input, Image.Image):
         return image_input
 
-    data = _read_all_bytes(image_input)
-    return Image.open(io.BytesIO(data))
+    if isinstance(image_input, (str, Path)):
+        image = Image.open(Path(image_input).expanduser())
+    else:
+        image = Image.open(_open_stream(image_input))
+    if image.format == "JPEG" and max_dimension:
+        target = _fit_size(image.width, image.height, max_dimension)
+        if target != image.size:
+            image.draft("L", target)
+    return image
+
+
+def _is_clean(pixels: np.ndarray, midtone_ratio: float = 0.06, speckle_ratio: float = 0.01) -> bool:
+    """Cheap noise estimate: few mid-tones and few isolated dark pixels."""
+    import numpy as np
+
+    histogram = np.bincount(pixels.ravel(), minlength=256)
+    if histogram[48:208].sum() / pixels.size >= midtone_ratio:
+        return False
+    dark = pixels < 128
+    dark_count = int(dark.sum())
+    if dark_count == 0:
+        return True
+    isolated = (
+        dark[1:-1, 1:-1]
+        & ~dark[:-2, 1:-1]
+        & ~dark[2:, 1:-1]
+        & ~dark[1:-1, :-2]
+        & ~dark[1:-1, 2:]
+    )
+    return int(isolated.sum()) / dark_count < speckle_ratio
+
+
+def _median3(pixels: np.ndarray, strip_rows: int = 256) -> np.ndarray:
+    """3x3 median filter over row strips to bound the 9x window stack."""
+    import numpy as np
+
+    height, width = pixels.shape
+    padded = np.pad(pixels, 1, mode="edge")
+    output = np.empty_like(pixels)
+    for top in range(0, height, strip_rows):
+        rows = min(strip_rows, height - top)
+        window = padded[top : top + rows + 2]
+        stack = np.stack(
+            [window[dy : dy + rows, dx : dx + width] for dy in range(3) for dx in range(3)]
+        )
+        stack.partition(4, axis=0)
+        output[top : top + rows] = stack[4]
+    return output
+
+
+def _autocontrast(pixels: np.ndarray) -> np.ndarray:
+    """Stretch intensities to the full 0-255 range via a lookup table."""
+    import numpy as np
+
+    low, high = int(pixels.min()), int(pixels.max())
+    if high <= low:
+        return pixels
+    scale = 255.0 / (high - low)
+    offset = -low * scale
+    lut = np.clip((np.arange(256) * scale + offset).astype(np.int32), 0, 255).astype(np.uint8)
+    return lut[pixels]
+
+
+def _prepare_image_for_ocr(
+    image: Image.Image,
+    max_dimension: Optional[int] = None,
+    denoise: str = "auto",
+) -> Image.Image:
+    """Grayscale, size-normalise, denoise when needed and stretch contrast."""
+    import numpy as np
+    from PIL import Image
+
+    grayscale = image if image.mode == "L" else image.convert("L")
+    target = _fit_size(grayscale.width, grayscale.height, max_dimension)
+    if target != grayscale.size:
+        grayscale = grayscale.resize(target, Image.BILINEAR, reducing_gap=2.0)
+
+    pixels = np.asarray(grayscale, dtype=np.uint8)
+    if denoise == "always" or (denoise == "auto" and not _is_clean(pixels)):
+        pixels = _median3(pixels)
+    return Image.fromarray(_autocontrast(pixels))
 
 
-def _prepare_image_for_ocr(image: Image.Image) -> Image.Image:
-    """Basic pre-processing to help Tesseract read noisy scans."""
-    grayscale = ImageOps.grayscale(image)
-    denoised = grayscale.filter(ImageFilter.MedianFilter(size=3))
-    return ImageOps.autocontrast(denoised)
+def _scale(image: Image.Image, factor: float) -> Image.Image:
+    from PIL import Image
+
+    if abs(factor - 1.0) < 0.01:
+        return image
+    size = (max(1, round(image.width * factor)), max(1, round(image.height * factor)))
+    return image.resize(size, Image.LANCZOS)
 
 
 class OCRProcessor:
     """Simple OCR pipeline that handles images and PDFs."""
 
-    def __init__(self, language: str = "por", psm: int = 6) -> None:
+    def __init__(
+        self,
+        language: str = "por",
+        psm: int = 6,
+        engine: str | OCREngine | None = None,
+        settings: OCRSettings | None = None,
+    ) -> None:
         self.language = language
-        self.tesseract_config = f"--oem 3 --psm {psm}"
+        self.psm = psm
+        if engine is None or isinstance(engine, str):
+            engine = get_engine(engine, language=language, psm=psm)
+        self.engine: OCREngine = engine
+        self.settings = settings or OCRSettings.from_env()
+
+    def _recognize_best(
+        self,
+        attempts: Iterable[Tuple[Image.Image, int, int]],
+        deadline: Optional[Deadline] = None,
+    ) -> PageText:
+        """Run attempts in order, stopping at the first confident one.
+
+        Once a first attempt exists, an expired ``deadline`` keeps it instead
+        of paying for retries.
+        """
+        best: Optional[Tuple[RecognizedText, int, int]] = None
+        for image, dpi, psm in attempts:
+            if best is not None and deadline is not None and deadline.expired:
+                break
+            recognized = self.engine.recognize(self._prepare(image), psm=psm)
+            if best is None or recognized.confidence > best[0].confidence:
+                best = (recognized, dpi, psm)
+            if recognized.confidence >= self.settings.min_confidence:
+                break
+        assert best is not None
+        recognized, dpi, psm = best
+        return PageText(
+            text=recognized.text.strip(),
+            confidence=round(recognized.confidence, 2),
+            dpi=dpi,
+            psm=psm,
+        )
+
+    def _prepare(self, image: Image.Image) -> Image.Image:
+        return _prepare_image_for_ocr(
+            image,
+            max_dimension=self.settings.max_dimension,
+            denoise=self.settings.denoise,
+        )
+
+    def _retry_psms(self) -> List[int]:
+        return [self.psm] + [psm for psm in self.settings.fallback_psms if psm != self.psm]
+
+    def extract_page_from_image(
+        self, image_input: FileInput, deadline: Optional[Deadline] = None
+    ) -> PageText:
+        """OCR a single image, adaptively when enabled."""
+        pil_image = _load_image(image_input, self.settings.max_dimension)
+        if not self.settings.adaptive:
+            return PageText(text=self.extract_text_from_image(pil_image))
+
+        settings = self.settings
+        fast = _scale(pil_image, settings.fast_dpi / settings.base_dpi)
+
+        def attempts():
+            yield fast, settings.fast_dpi, self.psm
+            for psm in self._retry_psms():
+                yield pil_image, settings.base_dpi, psm
+
+        return self._recognize_best(attempts(), deadline)
+
+    def iter_pdf_pages(self, pdf_input: FileInput, dpi: int) -> Iterator[Tuple[int, Image.Image]]:
+        """Render PDF pages lazily, ``pdf_page_batch`` pages at a time."""
+        from pdf2image import convert_from_path, pdfinfo_from_path
+
+        with _pdf_path(pdf_input) as path:
+            total = int(pdfinfo_from_path(path)["Pages"])
+            batch = self.settings.pdf_page_batch
+            for first in range(1, total + 1, batch):
+                last = min(total, first + batch - 1)
+                rendered = convert_from_path(path, dpi=dpi, first_page=first, last_page=last)
+                for offset, page in enumerate(rendered):
+                    yield first + offset, page
+                del rendered
+
+    def extract_pages_from_pdf(
+        self, pdf_input: FileInput, deadline: Optional[Deadline] = None
+    ) -> List[PageText]:
+        """OCR each PDF page; adaptive mode re-renders only low-confidence pages.
+
+        ``deadline`` is checked before every page, so an expired or cancelled
+        request stops rendering and recognising the rest of the document.
+        """
+        from pdf2image import convert_from_path
+
+        settings = self.settings
+        if not settings.adaptive:
+            pages: List[PageText] = []
+            for index, page in self.iter_pdf_pages(pdf_input, settings.base_dpi):
+                if deadline is not None:
+                    deadline.check()
+                pages.append(
+                    PageText(text=self.extract_text_from_image(page), number=index, dpi=settings.base_dpi)
+                )
+            return pages
+
+        pages = []
+        with _pdf_path(pdf_input) as path:
+            for index, fast_page in self.iter_pdf_pages(path, settings.fast_dpi):
+                if deadline is not None:
+                    deadline.check()
+
+                def attempts(page=fast_page, number=index):
+                    yield page, settings.fast_dpi, self.psm
+                    sharp = convert_from_path(
+                        path, dpi=settings.high_dpi, first_page=number, last_page=number
+                    )[0]
+                    for psm in self._retry_psms():
+                        yield sharp, settings.high_dpi, psm
+
+                page_text = self._recognize_best(attempts(), deadline)
+                page_text.number = index
+                pages.append(page_text)
+        return pages
+
+    def extract_pages_from_file(
+        self, file_obj: FileInput, deadline: Optional[Deadline] = None
+    ) -> List[PageText]:
+        """Route like ``extract_text_from_file`` but keep per-page metadata."""
+        from PIL import Image
+
+        if deadline is not None:
+            deadline.check()
+        if isinstance(file_obj, Image.Image):
+            return [self.extract_page_from_image(file_obj, deadline)]
+
+        if _is_pdf(file_obj):
+            return self.extract_pages_from_pdf(file_obj, deadline)
+        return [self.extract_page_from_image(file_obj, deadline)]
 
     def extract_text_from_image(self, image_input: FileInput) -> str:
         """Extract text from an image-like input."""
-        pil_image = _load_image(image_input)
-        preprocessed = _prepare_image_for_ocr(pil_image)
-        text = pytesseract.image_to_string(
-            preprocessed,
-            lang=self.language,
-            config=self.tesseract_config,
-        )
+        pil_image = _load_image(image_input, self.settings.max_dimension)
+        text = self.engine.image_to_string(self._prepare(pil_image))
         return text.strip()
 
     def extract_text_from_pdf(self, pdf_input: FileInput) -> str:
         """Extract and concatenate text from every page in a PDF."""
-        pdf_bytes = _read_all_bytes(pdf_input)
-        pages = convert_from_bytes(pdf_bytes)
-        texts: List[str] = []
-        for index, page in enumerate(pages, start=1):
-            page_text = self.extract_text_from_image(page)
-            texts.append(f"[page {index}]\n{page_text}")
-        return "\n\n".join(texts).strip()
+        return render_pages(self.extract_pages_from_pdf(pdf_input))
 
     def extract_text_from_file(self, file_obj: FileInput) -> str:
         """Heuristic helper that routes based on the provided data."""
-        if isinstance(file_obj, Image.Image):
-            return self.extract_text_from_image(file_obj)
-
-        if isinstance(file_obj, (str, Path)):
-            suffix = Path(file_obj).suffix.lower()
-            if suffix == ".pdf":
-                return self.extract_text_from_pdf(file_obj)
-            return self.extract_text_from_image(file_obj)
-
-        raw_bytes = _read_all_bytes(file_obj)
-        if raw_bytes.startswith(b"%PDF"):
-            return self.extract_text_from_pdf(raw_bytes)
-        return self.extract_text_from_image(raw_bytes)
+        return render_pages(self.extract_pages_from_file(file_obj))
 
     def extract_many(self, files: Sequence[FileInput]) -> List[str]:
         """Run OCR on a sequence of inputs returning one text per file."""
@@ -96,21 +436,28 @@ class OCRProcessor:
 
 
 def extract_text_from_image(
-    image_input: FileInput, *, language: str = "por", psm: int = 6
+    image_input: FileInput, *, language: str = "por", psm: int = 6, engine: str | None = None
 ) -> str:
     """Convenience wrapper around ``OCRProcessor.extract_text_from_image``."""
-    return OCRProcessor(language=language, psm=psm).extract_text_from_image(image_input)
+    return OCRProcessor(language=language, psm=psm, engine=engine).extract_text_from_image(
+        image_input
+    )
 
 
 def extract_text_from_pdf(
-    pdf_input: FileInput, *, language: str = "por", psm: int = 6
+    pdf_input: FileInput, *, language: str = "por", psm: int = 6, engine: str | None = None
 ) -> str:
     """Convenience wrapper around ``OCRProcessor.extract_text_from_pdf``."""
-    return OCRProcessor(language=language, psm=psm).extract_text_from_pdf(pdf_input)
+    return OCRProcessor(language=language, psm=psm, engine=engine).extract_text_from_pdf(
+        pdf_input
+    )
 
 
 __all__ = [
     "OCRProcessor",
+    "OCRSettings",
+    "PageText",
     "extract_text_from_image",
     "extract_text_from_pdf",
+    "render_pages",
 ]
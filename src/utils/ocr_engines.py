@@ -0,0 +1,251 @@
+"""Interchangeable Tesseract backends used by ``OCRProcessor``."""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+from src.utils.scheduler import per_process
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+DEFAULT_ENGINE = "pytesseract"
+
+
+class OCRConfigurationError(RuntimeError):
+    """Raised when the requested OCR engine cannot be initialised."""
+
+
+@dataclass(slots=True)
+class RecognizedText:
+    text: str
+    confidence: float
+
+
+def _mean_confidence(words: Iterable[Tuple[str, float]]) -> float:
+    """Character-weighted mean of Tesseract word confidences (0-100)."""
+    total = 0.0
+    weight = 0
+    for word, confidence in words:
+        word = word.strip()
+        if not word or confidence < 0:
+            continue
+        total += confidence * len(word)
+        weight += len(word)
+    return total / weight if weight else 0.0
+
+
+def _tesseract_text_and_data(
+    image: Image.Image, language: str, config: str
+) -> Tuple[str, Dict[str, List]]:
+    """Plain text and ``image_to_data`` rows from one ``tesseract`` process.
+
+    The ``txt`` renderer is the one ``image_to_string`` reads, so the text
+    keeps Tesseract's own layout; the TSV renderer adds the word confidences.
+    """
+    from pytesseract import pytesseract as runner
+
+    with runner.save(image) as (output_base, input_filename):
+        runner.run_tesseract(
+            input_filename,
+            output_base,
+            extension="txt",
+            lang=language,
+            config=f"-c tessedit_create_tsv=1 {config}",
+        )
+        with open(f"{output_base}.txt", "rb") as handle:
+            text = handle.read().decode("utf-8")
+        with open(f"{output_base}.tsv", "rb") as handle:
+            tsv = handle.read().decode("utf-8")
+    return text, runner.file_to_dict(tsv, "\t", -1)
+
+
+class OCREngine(Protocol):
+    name: str
+
+    def image_to_string(self, image: Image.Image, psm: Optional[int] = None) -> str:
+        ...
+
+    def recognize(self, image: Image.Image, psm: Optional[int] = None) -> RecognizedText:
+        ...
+
+
+class PytesseractEngine:
+    """Runs the ``tesseract`` binary once per image through ``pytesseract``."""
+
+    name = "pytesseract"
+
+    def __init__(self, language: str = "por", psm: int = 6, oem: int = 3) -> None:
+        self.language = language
+        self.psm = psm
+        self.oem = oem
+
+    def _config(self, psm: Optional[int]) -> str:
+        return f"--oem {self.oem} --psm {psm if psm is not None else self.psm}"
+
+    def image_to_string(self, image: Image.Image, psm: Optional[int] = None) -> str:
+        import pytesseract
+
+        return pytesseract.image_to_string(image, lang=self.language, config=self._config(psm))
+
+    def recognize(self, image: Image.Image, psm: Optional[int] = None) -> RecognizedText:
+        """Text and confidence from a single Tesseract run.
+
+        Each attempt of the adaptive path costs one process, like
+        ``image_to_string``, and returns the same text.
+        """
+        text, data = _tesseract_text_and_data(image, self.language, self._config(psm))
+        words = zip(data["text"], (float(confidence) for confidence in data["conf"]))
+        return RecognizedText(text=text, confidence=_mean_confidence(words))
+
+    def close(self) -> None:
+        """Nothing to release; kept for interface parity."""
+
+
+class TesserocrEngine:
+    """Keeps a bounded pool of initialised ``TessBaseAPI`` instances resident.
+
+    Each call checks an instance out and returns it when done, so memory is
+    capped at ``max_instances`` however many threads (scheduler workers,
+    ingestion pools, threadpool fallbacks) ever run OCR; callers beyond the
+    cap wait for a free instance. The default matches the OCR scheduler's
+    concurrency, so scheduled work never waits.
+    """
+
+    name = "tesserocr"
+
+    def __init__(
+        self,
+        language: str = "por",
+        psm: int = 6,
+        oem: int = 3,
+        max_instances: Optional[int] = None,
+    ) -> None:
+        try:
+            import tesserocr  # type: ignore
+        except ModuleNotFoundError as exc:  # pragma: no cover - optional dependency
+            raise OCRConfigurationError(
+                "OCR_ENGINE=tesserocr requires the optional 'tesserocr' package "
+                "(pip install -r requirements-tesserocr.txt, which needs the Tesseract and "
+                "Leptonica development headers); install it or set OCR_ENGINE=pytesseract"
+            ) from exc
+
+        self._tesserocr = tesserocr
+        self.language = language
+        self.psm = psm
+        self.oem = oem
+        self.max_instances = max(1, max_instances or _default_instances())
+        self._idle: "queue.LifoQueue[object]" = queue.LifoQueue()
+        self._instances: List[object] = []
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _create_api(self):
+        kwargs: Dict[str, object] = {
+            "lang": self.language,
+            "psm": self._tesserocr.PSM(self.psm),
+            "oem": self._tesserocr.OEM(self.oem),
+        }
+        tessdata = os.getenv("TESSDATA_PREFIX")
+        if tessdata:
+            kwargs["path"] = tessdata
+        return self._tesserocr.PyTessBaseAPI(**kwargs)
+
+    @contextmanager
+    def _api(self) -> Iterator[object]:
+        try:
+            api = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.max_instances
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    api = self._create_api()
+                except BaseException:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+                with self._lock:
+                    self._instances.append(api)
+            else:
+                api = self._idle.get()
+        try:
+            yield api
+        finally:
+            self._idle.put(api)
+
+    def image_to_string(self, image: Image.Image, psm: Optional[int] = None) -> str:
+        with self._api() as api:
+            page_mode = psm if psm is not None else self.psm
+            api.SetPageSegMode(self._tesserocr.PSM(page_mode))
+            try:
+                api.SetImage(image)
+                return api.GetUTF8Text()
+            finally:
+                api.Clear()
+                if page_mode != self.psm:
+                    api.SetPageSegMode(self._tesserocr.PSM(self.psm))
+
+    def recognize(self, image: Image.Image, psm: Optional[int] = None) -> RecognizedText:
+        with self._api() as api:
+            page_mode = psm if psm is not None else self.psm
+            api.SetPageSegMode(self._tesserocr.PSM(page_mode))
+            try:
+                api.SetImage(image)
+                text = api.GetUTF8Text()
+                words = api.MapWordConfidences()
+                return RecognizedText(text=text, confidence=_mean_confidence(words))
+            finally:
+                api.Clear()
+                if page_mode != self.psm:
+                    api.SetPageSegMode(self._tesserocr.PSM(self.psm))
+
+    def close(self) -> None:
+        """Release every resident Tesseract instance; call once OCR has stopped."""
+        with self._lock:
+            instances, self._instances = self._instances, []
+            self._idle = queue.LifoQueue()
+            self._created = 0
+        for api in instances:
+            api.End()
+
+
+def _default_instances() -> int:
+    configured = os.getenv("TESSEROCR_MAX_INSTANCES") or os.getenv("OCR_SCHEDULER_CONCURRENCY")
+    return int(configured) if configured else per_process(os.cpu_count() or 4)
+
+
+ENGINES = {
+    PytesseractEngine.name: PytesseractEngine,
+    TesserocrEngine.name: TesserocrEngine,
+}
+
+
+@lru_cache(maxsize=None)
+def get_engine(name: Optional[str] = None, language: str = "por", psm: int = 6) -> OCREngine:
+    """Return a process-wide engine so resident Tesseract instances are reused."""
+    engine_name = (name or os.getenv("OCR_ENGINE", DEFAULT_ENGINE) or DEFAULT_ENGINE).lower()
+    engine_cls = ENGINES.get(engine_name)
+    if engine_cls is None:
+        raise OCRConfigurationError(
+            f"Unknown OCR engine '{engine_name}'. Supported engines: {', '.join(ENGINES)}"
+        )
+    return engine_cls(language=language, psm=psm)
+
+
+__all__ = [
+    "OCREngine",
+    "OCRConfigurationError",
+    "PytesseractEngine",
+    "RecognizedText",
+    "TesserocrEngine",
+    "get_engine",
+]
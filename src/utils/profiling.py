@@ -0,0 +1,200 @@
+"""Sampling profiler scoped to a single request across the threads it uses."""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+FrameKey = Tuple[str, str, int]
+
+MAX_STACK_DEPTH = 128
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    """Periodically samples the stacks of the threads working for one request.
+
+    Work for a request hops between threads (threadpool, stage workers,
+    OCR/LLM scheduler workers), so threads opt in with :meth:`attach` while
+    they run on the request's behalf; :func:`bind` does that for callables
+    handed to another thread. Samples count wall time (waiting included),
+    while :meth:`attach` also adds up the thread CPU time spent inside it.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._threads: Dict[int, int] = {}
+        self._stacks: Counter[Tuple[FrameKey, ...]] = Counter()
+        self._thread_samples: Counter[str] = Counter()
+        self._cpu_seconds = 0.0
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._wall_seconds = 0.0
+
+    @contextmanager
+    def attach(self) -> Iterator[None]:
+        thread_id = threading.get_ident()
+        cpu_started = time.thread_time()
+        with self._lock:
+            self._threads[thread_id] = self._threads.get(thread_id, 0) + 1
+        try:
+            yield
+        finally:
+            cpu_seconds = time.thread_time() - cpu_started
+            with self._lock:
+                remaining = self._threads[thread_id] - 1
+                if remaining:
+                    self._threads[thread_id] = remaining
+                else:
+                    del self._threads[thread_id]
+                    # Nested attaches on one thread are already counted by the outer one.
+                    self._cpu_seconds += cpu_seconds
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self._wall_seconds = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        with self._lock:
+            thread_ids = list(self._threads)
+        if not thread_ids:
+            return
+        frames = sys._current_frames()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id in thread_ids:
+            frame = frames.get(thread_id)
+            stack: List[FrameKey] = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                if code.co_filename == __file__:
+                    # Below the bind() wrapper there is only thread plumbing.
+                    break
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if not stack:
+                continue
+            with self._lock:
+                self._stacks[tuple(stack)] += 1
+                self._thread_samples[names.get(thread_id, str(thread_id))] += 1
+
+    def report(self, limit: int = 30) -> Dict[str, Any]:
+        """Function-level hotspots: ``self`` is where a sample landed, ``total`` includes callees."""
+        own: Counter[FrameKey] = Counter()
+        total: Counter[FrameKey] = Counter()
+        with self._lock:
+            stacks = list(self._stacks.items())
+            threads = dict(self._thread_samples)
+            cpu_seconds = self._cpu_seconds
+        for stack, count in stacks:
+            own[stack[0]] += count
+            for key in set(stack):
+                total[key] += count
+
+        def entry(key: FrameKey) -> Dict[str, Any]:
+            name, filename, line = key
+            return {
+                "function": name,
+                "file": _display_path(filename),
+                "line": line,
+                "self_samples": own[key],
+                "total_samples": total[key],
+                "self_seconds": round(own[key] * self.interval, 4),
+                "total_seconds": round(total[key] * self.interval, 4),
+            }
+
+        samples = sum(threads.values())
+        return {
+            "wall_seconds": round(self._wall_seconds, 4),
+            "cpu_seconds": round(cpu_seconds, 4),
+            "sampled_seconds": round(samples * self.interval, 4),
+            "samples": samples,
+            "interval_seconds": self.interval,
+            "threads": threads,
+            "hotspots": [entry(key) for key, _ in own.most_common(limit)],
+            "cumulative": [entry(key) for key, _ in total.most_common(limit)],
+        }
+
+
+def _display_path(filename: str) -> str:
+    cwd = os.getcwd()
+    if filename.startswith(cwd + os.sep):
+        return os.path.relpath(filename, cwd)
+    return filename
+
+
+def current() -> Optional[RequestProfile]:
+    return _current.get()
+
+
+def activate(profile: RequestProfile) -> Token:
+    return _current.set(profile)
+
+
+def deactivate(token: Token) -> None:
+    _current.reset(token)
+
+
+def bind(fn: Callable[..., T]) -> Callable[..., T]:
+    """Attach the active profile to whichever thread ends up running ``fn``.
+
+    The profile is also made current there, so work ``fn`` hands on to yet
+    another thread is bound too. Returns ``fn`` itself when no request is
+    being profiled.
+    """
+    profile = _current.get()
+    if profile is None:
+        return fn
+
+    def profiled(*args: Any, **kwargs: Any) -> T:
+        token = _current.set(profile)
+        try:
+            with profile.attach():
+                return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return profiled
+
+
+def bind_iter(items: Iterable[T]) -> Iterable[T]:
+    """Like :func:`bind` for iterators consumed step by step (streaming responses)."""
+    profile = _current.get()
+    if profile is None:
+        return items
+
+    def profiled() -> Iterator[T]:
+        iterator = iter(items)
+        while True:
+            with profile.attach():
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    return profiled()
+
+
+__all__ = ["RequestProfile", "activate", "bind", "bind_iter", "current", "deactivate"]
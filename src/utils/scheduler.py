@@ -0,0 +1,206 @@
+"""Per-user fair scheduling of blocking work (OCR, LLM calls) with admission control."""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterator, List, Tuple, TypeVar
+
+from src.utils import profiling
+
+T = TypeVar("T")
+
+Task = Tuple[Future, Callable[[], object]]
+
+
+class SchedulerSaturatedError(RuntimeError):
+    """Raised when a scheduler's queues are full; retry after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def worker_processes() -> int:
+    """Server processes on this host (``WEB_CONCURRENCY``), each with its own schedulers."""
+    return max(1, int(os.getenv("WEB_CONCURRENCY") or "1"))
+
+
+def per_process(total: int) -> int:
+    """Split a host-wide concurrency budget evenly across the server processes."""
+    return max(1, total // worker_processes())
+
+
+@dataclass(slots=True)
+class SchedulerSettings:
+    concurrency: int = 4
+    max_queue: int = 256
+    max_queue_per_user: int = 32
+
+    @classmethod
+    def from_env(cls, prefix: str, concurrency: int) -> "SchedulerSettings":
+        """Read ``{prefix}_CONCURRENCY``, ``{prefix}_MAX_QUEUE`` and ``{prefix}_MAX_QUEUE_PER_USER``."""
+        return cls(
+            concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency))),
+            max_queue=int(os.getenv(f"{prefix}_MAX_QUEUE", "256")),
+            max_queue_per_user=int(os.getenv(f"{prefix}_MAX_QUEUE_PER_USER", "32")),
+        )
+
+
+class FairScheduler:
+    """Runs tasks on ``concurrency`` threads, serving users round-robin.
+
+    Each user has its own FIFO queue; workers take one task from the next user
+    in the rotation, so a user with hundreds of queued tasks delays a user
+    with a single task by at most one task per worker. Limits apply at
+    admission (:meth:`admit`), not in :meth:`submit`, so work that was
+    already accepted is never rejected halfway through a request.
+
+    Tasks must not block on other tasks of the same scheduler; wait on the
+    returned futures from the calling thread instead.
+
+    A scheduler lives in one process: under gunicorn each worker has its own,
+    so concurrency, queue limits and fairness hold per process, not per host.
+    """
+
+    def __init__(self, name: str, settings: SchedulerSettings) -> None:
+        self.name = name
+        self.settings = settings
+        self._condition = threading.Condition()
+        self._queues: "OrderedDict[str, Deque[Task]]" = OrderedDict()
+        self._queued = 0
+        self._running = 0
+        # Documents admitted and not yet finished, per user and in total.
+        self._admitted: Dict[str, int] = {}
+        self._admitted_total = 0
+        self._threads: List[threading.Thread] = []
+        # Smoothed task duration, used to estimate Retry-After.
+        self._avg_seconds = 1.0
+
+    def _start_workers(self) -> None:
+        # Threads start lazily so a scheduler built in a pre-fork master
+        # process does not leave dead threads behind in the workers.
+        while len(self._threads) < self.settings.concurrency:
+            thread = threading.Thread(
+                target=self._work,
+                name=f"{self.name}-scheduler-{len(self._threads)}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _retry_after(self) -> int:
+        backlog = self._queued + self._running
+        waves = backlog / max(1, self.settings.concurrency)
+        return max(1, math.ceil(waves * self._avg_seconds))
+
+    @contextmanager
+    def admit(self, user_id: str, documents: int = 1) -> Iterator[None]:
+        """Admit a request that will queue ``documents`` tasks, or reject it.
+
+        Requests feed their documents to :meth:`submit` a few at a time, so
+        the queues alone undercount what a user has pending; the admitted
+        documents are counted instead until the block exits. A request
+        counts at most ``max_queue_per_user`` documents, so one large upload
+        is still admitted when the user has nothing else pending.
+        """
+        settings = self.settings
+        count = max(1, min(documents, settings.max_queue_per_user))
+        with self._condition:
+            pending = max(self._queued, self._admitted_total)
+            if pending + count > settings.max_queue:
+                raise SchedulerSaturatedError(
+                    f"{self.name} queue is full", retry_after=self._retry_after()
+                )
+            user_queue = self._queues.get(user_id, ())
+            user_pending = max(len(user_queue), self._admitted.get(user_id, 0))
+            if user_pending + count > settings.max_queue_per_user:
+                raise SchedulerSaturatedError(
+                    f"Too many queued {self.name} tasks for user '{user_id}'",
+                    retry_after=self._retry_after(),
+                )
+            self._admitted[user_id] = self._admitted.get(user_id, 0) + count
+            self._admitted_total += count
+        try:
+            yield
+        finally:
+            with self._condition:
+                remaining = self._admitted[user_id] - count
+                if remaining:
+                    self._admitted[user_id] = remaining
+                else:
+                    del self._admitted[user_id]
+                self._admitted_total -= count
+
+    def submit(self, user_id: str, fn: Callable[[], T]) -> "Future[T]":
+        future: "Future[T]" = Future()
+        with self._condition:
+            if not self._threads:
+                self._start_workers()
+            queue = self._queues.get(user_id)
+            if queue is None:
+                queue = self._queues[user_id] = deque()
+            queue.append((future, profiling.bind(fn)))
+            self._queued += 1
+            self._condition.notify()
+        return future
+
+    def run(self, user_id: str, fn: Callable[[], T]) -> T:
+        """Submit ``fn`` and wait for its result in the calling thread."""
+        return self.submit(user_id, fn).result()
+
+    def _next_task(self) -> Task:
+        with self._condition:
+            while not self._queued:
+                self._condition.wait()
+            user_id, queue = next(iter(self._queues.items()))
+            task = queue.popleft()
+            if queue:
+                self._queues.move_to_end(user_id)
+            else:
+                del self._queues[user_id]
+            self._queued -= 1
+            self._running += 1
+            return task
+
+    def _work(self) -> None:
+        while True:
+            future, fn = self._next_task()
+            ran = future.set_running_or_notify_cancel()
+            started = time.monotonic()
+            if ran:
+                try:
+                    result = fn()
+                except BaseException as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+            elapsed = time.monotonic() - started
+            with self._condition:
+                self._running -= 1
+                if ran:
+                    self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                "queued": self._queued,
+                "running": self._running,
+                "users": len(self._queues),
+                "admitted": self._admitted_total,
+            }
+
+
+__all__ = [
+    "FairScheduler",
+    "SchedulerSaturatedError",
+    "SchedulerSettings",
+    "per_process",
+    "worker_processes",
+]
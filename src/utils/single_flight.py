@@ -0,0 +1,83 @@
+"""Coalesce concurrent calls that compute the same result."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import CancelledError, Future
+from typing import Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs ``fn`` once per in-flight key; concurrent callers share the outcome.
+
+    Nothing is cached: once the leading call finishes, the key is released and
+    the next caller computes again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result()
+
+        # The key is released before waiters wake up, so a waiter that retries
+        # after a failure starts a fresh call instead of re-reading this one.
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._release(key, future)
+            future.set_exception(exc)
+            raise
+        self._release(key, future)
+        future.set_result(result)
+        return result
+
+    def share(self, key: Hashable, start: Callable[[], "Future[T]"]) -> "Future[T]":
+        """Non-blocking variant of :meth:`do` for work that already returns a future.
+
+        The first caller's ``start`` (which must not block, e.g. a scheduler
+        submit) starts the work; concurrent callers get the same shared
+        future, which completes only after the key has been released.
+        """
+        with self._lock:
+            shared = self._calls.get(key)
+            if shared is not None:
+                return shared
+            shared = Future()
+            # Running futures cannot be cancelled, so no caller can cancel it for the others.
+            shared.set_running_or_notify_cancel()
+            work = start()
+            self._calls[key] = shared
+        work.add_done_callback(lambda done: self._settle(key, shared, done))
+        return shared
+
+    def _settle(self, key: Hashable, shared: Future, done: Future) -> None:
+        self._release(key, shared)
+        if done.cancelled():
+            shared.set_exception(CancelledError())
+        elif done.exception() is not None:
+            shared.set_exception(done.exception())
+        else:
+            shared.set_result(done.result())
+
+    def _release(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+__all__ = ["SingleFlight"]
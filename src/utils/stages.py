@@ -0,0 +1,111 @@
+"""Run items through a chain of threaded stages connected by bounded queues."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Sequence
+
+from src.utils import profiling
+
+_DONE = object()
+
+
+@dataclass(slots=True)
+class Stage:
+    """``fn`` maps one item to the next stage's item; returning ``None`` drops it."""
+
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+
+
+class StagePipeline:
+    """Each stage runs on its own worker threads and hands items on as soon as
+    they are ready, so a slow stage (LLM) overlaps with a fast one (OCR)
+    instead of waiting for the whole batch.
+
+    Queues between stages hold at most ``maxsize`` items; a stage that gets
+    ahead blocks until the next one catches up (backpressure). The first
+    exception stops the feed, drains the queues and is re-raised by :meth:`run`.
+    """
+
+    def __init__(self, stages: Sequence[Stage], maxsize: int = 2) -> None:
+        if not stages:
+            raise ValueError("StagePipeline needs at least one stage")
+        self.stages = list(stages)
+        self.maxsize = maxsize
+
+    def run(self, items: Iterable[Any]) -> List[Any]:
+        """Feed ``items`` and return the last stage's outputs in completion order."""
+        queues: List[queue.Queue] = [queue.Queue(self.maxsize) for _ in self.stages]
+        results: List[Any] = []
+        failure: List[BaseException] = []
+        failed = threading.Event()
+        threads: List[List[threading.Thread]] = []
+
+        def emit(index: int, item: Any) -> None:
+            if index == len(self.stages):
+                results.append(item)
+                return
+            # Poll so producers notice a failure instead of blocking on a
+            # queue whose consumers have stopped.
+            while not failed.is_set():
+                try:
+                    queues[index].put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def work(index: int, stage: Stage) -> None:
+            inbox = queues[index]
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    return
+                if failed.is_set():
+                    continue
+                try:
+                    output = stage.fn(item)
+                except BaseException as exc:  # propagated to the caller of run()
+                    failure.append(exc)
+                    failed.set()
+                    continue
+                if output is not None:
+                    emit(index + 1, output)
+
+        for index, stage in enumerate(self.stages):
+            stage_threads = [
+                threading.Thread(
+                    target=profiling.bind(work), args=(index, stage), name=f"stage-{stage.name}-{n}", daemon=True
+                )
+                for n in range(max(1, stage.workers))
+            ]
+            for thread in stage_threads:
+                thread.start()
+            threads.append(stage_threads)
+
+        try:
+            for item in items:
+                if failed.is_set():
+                    break
+                emit(0, item)
+        except BaseException as exc:
+            failure.append(exc)
+            failed.set()
+        finally:
+            # Close stages in order: once every worker of a stage has exited,
+            # nothing more can reach the next one.
+            for index, stage_threads in enumerate(threads):
+                for _ in stage_threads:
+                    queues[index].put(_DONE)
+                for thread in stage_threads:
+                    thread.join()
+
+        if failure:
+            raise failure[0]
+        return results
+
+
+__all__ = ["Stage", "StagePipeline"]
@@ -0,0 +1,204 @@
+"""Deterministic cleanup and compaction of OCR text before it reaches LLM prompts."""
+
+from __future__ import annotations
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional
+
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARK = "[...]"
+
+PAGE_MARKER = re.compile(r"^\s*\[page \d+\]\s*$")
+PAGE_NUMBER = re.compile(
+    r"^\s*(?:p[áa]g(?:ina)?\.?\s*)?[-–—]?\s*\d{1,3}\s*(?:(?:de|/|of)\s*\d{1,3})?\s*[-–—]?\s*$",
+    re.IGNORECASE,
+)
+HYPHENATED_BREAK = re.compile(r"([^\W\d_]+)[-\u2010\u2011]\n[ \t]*([a-zà-öø-ÿ]+)")
+INLINE_SPACES = re.compile(r"[ \t\f\v]+")
+BLANK_LINES = re.compile(r"\n{3,}")
+
+# A line break after a hyphen keeps the hyphen before Portuguese enclitic
+# pronouns ("apresenta-\nse" -> "apresenta-se") and inside known compounds
+# ("Sócio-\nfundador", "front-\nend"); other breaks are rejoined.
+PT_CLITICS = frozenset(
+    {"a", "as", "o", "os", "la", "las", "lo", "los", "na", "nas", "no", "nos",
+     "lhe", "lhes", "me", "te", "se", "vos"}
+)
+# Heads are only words that are never a mere first syllable ("ex-\nperiência"
+# and "sem-\npre" must still be rejoined).
+COMPOUND_HEADS = frozenset(
+    {"vice", "pré", "pós", "pró", "recém", "além", "aquém", "sócio", "sócia", "sócios",
+     "sócias", "front", "back", "full", "follow", "self"}
+)
+COMPOUND_TAILS = frozenset(
+    {"fundador", "fundadora", "fundadores", "fundadoras", "chave", "chaves", "feira",
+     "geral", "gerais", "end", "stack", "mail", "commerce", "line", "up", "in", "how",
+     "off", "source"}
+)
+
+CHARACTER_MAP = str.maketrans(
+    {
+        "\u00a0": " ",  # no-break space
+        "\u00ad": "",  # soft hyphen
+        "\ufb01": "fi",
+        "\ufb02": "fl",
+        "\ufb00": "ff",
+        "\u2022": "-",  # bullets
+        "\u25cf": "-",
+        "\u25aa": "-",
+        "\u25a0": "-",
+        "\u25e6": "-",
+        "\u2023": "-",
+        "\uf0b7": "-",  # Symbol-font bullet from Word exports
+        "\u201c": '"',
+        "\u201d": '"',
+        "\u2018": "'",
+        "\u2019": "'",
+    }
+)
+
+
+@dataclass(slots=True)
+class CleanedText:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    truncated: bool = False
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough provider-agnostic token estimate (~4 characters per token)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def _split_pages(text: str) -> List[List[str]]:
+    pages: List[List[str]] = [[]]
+    for line in text.split("\n"):
+        if PAGE_MARKER.match(line):
+            if pages[-1]:
+                pages.append([])
+            continue
+        pages[-1].append(line)
+    return [page for page in pages if any(line.strip() for line in page)]
+
+
+def _line_key(line: str) -> str:
+    return re.sub(r"\d+", "#", INLINE_SPACES.sub(" ", line.strip().lower()))
+
+
+def _edge_indexes(page: List[str], depth: int = 2) -> List[int]:
+    filled = [index for index, line in enumerate(page) if line.strip()]
+    return sorted(set(filled[:depth] + filled[-depth:]))
+
+
+def _drop_page_numbers(page: List[str]) -> List[str]:
+    """Drop a bare page number sitting alone on the first or last line of a page.
+
+    Numbers elsewhere ("10", "12/15" inside a list) are content and stay.
+    """
+    filled = [index for index, line in enumerate(page) if line.strip()]
+    edges = {filled[0], filled[-1]} if filled else set()
+    return [
+        line
+        for index, line in enumerate(page)
+        if not (index in edges and PAGE_NUMBER.match(line))
+    ]
+
+
+def _drop_repeated_edges(pages: List[List[str]]) -> List[List[str]]:
+    """Remove header/footer lines repeated across most pages, keeping the first one.
+
+    The first occurrence stays so a name or title that heads every page is
+    still in the text once.
+    """
+    if len(pages) < 2:
+        return pages
+    counts: Counter[str] = Counter()
+    for page in pages:
+        counts.update({_line_key(page[index]) for index in _edge_indexes(page)})
+    threshold = max(2, math.ceil(len(pages) / 2))
+    repeated = {key for key, count in counts.items() if count >= threshold}
+    seen: set[str] = set()
+    cleaned: List[List[str]] = []
+    for page in pages:
+        edges = set(_edge_indexes(page))
+        kept: List[str] = []
+        for index, line in enumerate(page):
+            key = _line_key(line)
+            if index in edges and key in repeated:
+                if key in seen:
+                    continue
+                seen.add(key)
+            kept.append(line)
+        cleaned.append(kept)
+    return cleaned
+
+
+def _is_junk(line: str) -> bool:
+    """Lines without a single letter or digit (graphics, borders, scan noise).
+
+    Anything else is kept: short lines such as "C#", "- C++" or "- R" are skills.
+    """
+    stripped = line.strip()
+    return bool(stripped) and not any(char.isalnum() for char in stripped)
+
+
+def _join_hyphenation(text: str) -> str:
+    def replace(match: re.Match) -> str:
+        head, tail = match.group(1), match.group(2)
+        compound = (
+            tail in PT_CLITICS or head.lower() in COMPOUND_HEADS or tail in COMPOUND_TAILS
+        )
+        return f"{head}{'-' if compound else ''}{tail}"
+
+    return HYPHENATED_BREAK.sub(replace, text)
+
+
+def _truncate(text: str, token_budget: int) -> str:
+    limit = max(0, token_budget * CHARS_PER_TOKEN - len(TRUNCATION_MARK) - 1)
+    cut = text.rfind("\n", 0, limit)
+    if cut < limit // 2:
+        cut = limit
+    return f"{text[:cut].rstrip()}\n{TRUNCATION_MARK}"
+
+
+def clean_ocr_text(text: str, token_budget: Optional[int] = None) -> CleanedText:
+    """Normalise OCR output and cap it at ``token_budget`` estimated tokens."""
+    tokens_before = estimate_tokens(text)
+    normalised = unicodedata.normalize("NFC", text).translate(CHARACTER_MAP)
+    normalised = normalised.replace("\r\n", "\n").replace("\r", "\n")
+
+    pages = _drop_repeated_edges([_drop_page_numbers(page) for page in _split_pages(normalised)])
+    lines = [
+        INLINE_SPACES.sub(" ", line).strip()
+        for page in pages
+        for line in page + [""]
+        if not _is_junk(line)
+    ]
+    compact = _join_hyphenation("\n".join(lines))
+    compact = BLANK_LINES.sub("\n\n", compact).strip()
+
+    cleaned = CleanedText(
+        text=compact, tokens_before=tokens_before, tokens_after=estimate_tokens(compact)
+    )
+    return fit_to_budget(cleaned, token_budget)
+
+
+def fit_to_budget(cleaned: CleanedText, token_budget: Optional[int]) -> CleanedText:
+    """Cap already cleaned text at ``token_budget`` estimated tokens."""
+    if not token_budget or cleaned.tokens_after <= token_budget:
+        return cleaned
+    text = _truncate(cleaned.text, token_budget)
+    return CleanedText(
+        text=text,
+        tokens_before=cleaned.tokens_before,
+        tokens_after=estimate_tokens(text),
+        truncated=True,
+    )
+
+
+__all__ = ["CleanedText", "clean_ocr_text", "estimate_tokens", "fit_to_budget"]
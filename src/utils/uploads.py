@@ -0,0 +1,157 @@
+"""Helpers to keep multipart uploads on disk and within configured limits."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, BinaryIO, Callable, Optional, Tuple, Type
+
+if TYPE_CHECKING:
+    from fastapi.routing import APIRoute
+
+MEGABYTE = 1024 * 1024
+
+UploadedFile = Tuple[BinaryIO, Optional[str]]
+
+# Room in a request's Content-Length for multipart boundaries and text fields.
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the per-file or per-request limit."""
+
+
+@dataclass(slots=True)
+class UploadLimits:
+    max_file_bytes: int = 25 * MEGABYTE
+    max_request_bytes: int = 200 * MEGABYTE
+    spool_bytes: int = 1 * MEGABYTE
+
+    @classmethod
+    def from_env(cls) -> "UploadLimits":
+        return cls(
+            max_file_bytes=int(float(os.getenv("UPLOAD_MAX_FILE_MB", "25")) * MEGABYTE),
+            max_request_bytes=int(float(os.getenv("UPLOAD_MAX_REQUEST_MB", "200")) * MEGABYTE),
+            spool_bytes=int(float(os.getenv("UPLOAD_SPOOL_MB", "1")) * MEGABYTE),
+        )
+
+
+def stream_size(stream: BinaryIO) -> int:
+    """Size of a seekable stream without reading it; leaves it rewound."""
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+def check_size(
+    filename: Optional[str], file_bytes: int, request_bytes: int, limits: UploadLimits
+) -> None:
+    """Raise ``UploadTooLargeError`` once a file or the whole request passes its limit."""
+    if file_bytes > limits.max_file_bytes:
+        raise UploadTooLargeError(
+            f"File '{filename or 'sem nome'}' exceeds {limits.max_file_bytes // MEGABYTE} MB"
+        )
+    if request_bytes > limits.max_request_bytes:
+        raise UploadTooLargeError(
+            f"Request exceeds {limits.max_request_bytes // MEGABYTE} MB of uploads"
+        )
+
+
+def limited_upload_route(limits: UploadLimits) -> "Type[APIRoute]":
+    """An ``APIRoute`` class whose multipart parsing enforces ``limits`` while it reads.
+
+    A request whose ``Content-Length`` already exceeds the limits is refused
+    with 413 before any byte is read; otherwise parsing stops as soon as a
+    file or the request passes its limit, so oversized uploads never reach
+    the disk. Files stay in memory up to ``limits.spool_bytes`` and then spill
+    to a temp file, for routes of this class only.
+    """
+    from contextlib import aclosing
+
+    from fastapi import HTTPException, status
+    from fastapi.routing import APIRoute
+    from starlette.datastructures import FormData
+    from starlette.formparsers import MultiPartException, MultiPartParser
+    from starlette.requests import Request
+    from starlette.responses import Response
+
+    class LimitedMultiPartParser(MultiPartParser):
+        spool_max_size = limits.spool_bytes
+
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            self._file_bytes = 0
+            self._request_bytes = 0
+
+        def on_part_begin(self) -> None:
+            super().on_part_begin()
+            self._file_bytes = 0
+
+        def on_part_data(self, data: bytes, start: int, end: int) -> None:
+            upload = self._current_part.file
+            if upload is not None:
+                self._file_bytes += end - start
+                self._request_bytes += end - start
+                check_size(upload.filename, self._file_bytes, self._request_bytes, limits)
+            super().on_part_data(data, start, end)
+
+    def too_large(detail: str) -> HTTPException:
+        return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+    class LimitedUploadRequest(Request):
+        async def form(  # type: ignore[override] - FastAPI only awaits it
+            self,
+            *,
+            max_files: int | float = 1000,
+            max_fields: int | float = 1000,
+            max_part_size: int = 1024 * 1024,
+        ) -> FormData:
+            content_type = self.headers.get("content-type", "")
+            if self._form is not None or not content_type.startswith("multipart/form-data"):
+                return await super().form(
+                    max_files=max_files, max_fields=max_fields, max_part_size=max_part_size
+                )
+            length = self.headers.get("content-length", "")
+            if length.isdigit() and int(length) > limits.max_request_bytes + FORM_OVERHEAD_BYTES:
+                raise too_large(
+                    f"Request exceeds {limits.max_request_bytes // MEGABYTE} MB of uploads"
+                )
+            try:
+                async with aclosing(self.stream()) as stream:
+                    parser = LimitedMultiPartParser(
+                        self.headers,
+                        stream,
+                        max_files=max_files,
+                        max_fields=max_fields,
+                        max_part_size=max_part_size,
+                    )
+                    self._form = await parser.parse()
+            except UploadTooLargeError as exc:
+                raise too_large(str(exc)) from exc
+            except MultiPartException as exc:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message
+                ) from exc
+            return self._form
+
+    class LimitedUploadRoute(APIRoute):
+        def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+            handler = super().get_route_handler()
+
+            async def limited_handler(request: Request) -> Response:
+                return await handler(LimitedUploadRequest(request.scope, request.receive))
+
+            return limited_handler
+
+    return LimitedUploadRoute
+
+
+__all__ = [
+    "UploadLimits",
+    "UploadTooLargeError",
+    "UploadedFile",
+    "check_size",
+    "limited_upload_route",
+    "stream_size",
+]
@@ -0,0 +1,68 @@
+"""Preload and warm-up hooks for multi-worker serving."""
+
+from __future__ import annotations
+
+import importlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = (
+    "numpy",
+    "PIL.Image",
+    "pdf2image",
+    "pytesseract",
+    "openai",
+    "pymongo",
+    "bson",
+)
+
+
+def preload() -> None:
+    """Import heavy dependencies in the master so forked workers share their pages.
+
+    Only modules are loaded here: Mongo and HTTP clients own sockets and
+    threads that must not cross ``fork()``, so they are built per worker.
+    """
+    for name in HEAVY_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:  # pragma: no cover - optional in minimal images
+            logger.warning("Preload skipped missing module %s", name)
+
+    from src.utils.llm_settings import LLMConfigurationError, LLMSettings
+    from src.utils.ocr import OCRSettings
+
+    OCRSettings.from_env()
+    try:
+        LLMSettings.from_env()
+    except LLMConfigurationError as exc:
+        logger.warning("LLM settings incomplete: %s", exc)
+
+
+def warm_worker() -> None:
+    """Build the shared services and run a tiny OCR so the first request is not cold."""
+    from PIL import Image
+
+    from src.modules.logs.log_controller import get_service as get_log_service
+    from src.modules.pipeline.pipeline_controller import get_service as get_pipeline_service
+    from src.utils.llm_settings import LLMConfigurationError
+    from src.utils.ocr import OCRProcessor
+
+    try:
+        get_pipeline_service()
+    except LLMConfigurationError as exc:
+        # Like before warm-up existed: the worker still serves /health and the
+        # logs endpoints, and pipeline requests report the configuration error.
+        logger.warning("Pipeline service not warmed up, LLM settings incomplete: %s", exc)
+    try:
+        get_log_service().ensure_indexes()
+    except Exception:  # pragma: no cover - warm-up must never block boot
+        logger.exception("Usage log index creation failed")
+    try:
+        OCRProcessor().extract_text_from_image(Image.new("L", (64, 32), color=255))
+    except Exception:  # pragma: no cover - warm-up must never block boot
+        logger.exception("OCR warm-up failed")
+
+
+__all__ = ["preload", "warm_worker"]
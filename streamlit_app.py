@@ -2,24 +2,53 @@
 
 from __future__ import annotations
 
+import os
+import queue
 import uuid
-from typing import List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 
 import streamlit as st
 
-from src.modules.pipeline.pipeline_service import PipelineCreate, PipelineService
+from src.utils.env import load_environment
+
+load_environment()
+
+from src.modules.pipeline.entity.pipeline_entity import ProcessedDocument  # noqa: E402
+from src.modules.pipeline.pipeline_service import PipelineCreate, PipelineService  # noqa: E402
+from src.utils.scheduler import SchedulerSaturatedError  # noqa: E402
+
+SESSION_CACHE_SIZE = int(os.getenv("STREAMLIT_SESSION_CACHE_SIZE", "50"))
 
 st.set_page_config(page_title="Recruiter Assistant", page_icon="🧑‍💼", layout="wide")
 
+
+@st.cache_resource(show_spinner=False)
+def get_pipeline_service() -> PipelineService:
+    """One service (LLM client, OCR engine, Mongo client) shared by every session."""
+    return PipelineService()
+
+
+def _session_documents() -> "OrderedDict[str, ProcessedDocument]":
+    if "processed_documents" not in st.session_state:
+        st.session_state.processed_documents = OrderedDict()
+    return st.session_state.processed_documents
+
+
+def _remember(cache: "OrderedDict[str, ProcessedDocument]", digest: str, doc: ProcessedDocument) -> None:
+    cache[digest] = doc
+    cache.move_to_end(digest)
+    while len(cache) > SESSION_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
 st.title("Assistente de Recrutamento")
 st.write(
     "Carregue currículos (PDF ou imagem), informe quem está usando a ferramenta e, se quiser, "
     "faça uma pergunta para o assistente. O resultado usa OCR + LLM em tempo real."
 )
 
-if "pipeline_service" not in st.session_state:
-    st.session_state.pipeline_service = PipelineService()
-
 with st.form("pipeline_form"):
     col1, col2 = st.columns(2)
     with col1:
@@ -32,6 +61,12 @@ with st.form("pipeline_form"):
         help="Ex.: Qual desses currículos se encaixa melhor na vaga X?",
     )
 
+    use_cache = st.checkbox(
+        "Reaproveitar respostas anteriores",
+        value=True,
+        help="Desmarque para gerar uma nova resposta mesmo que a pergunta já tenha sido feita sobre os mesmos currículos.",
+    )
+
     uploaded_files = st.file_uploader(
         "Currículos (PDF, PNG, JPG)",
         type=["pdf", "png", "jpg", "jpeg"],
@@ -46,34 +81,74 @@ if submitted:
     elif not request_id or not user_id:
         st.warning("Preencha request_id e user_id.")
     else:
-        with st.spinner("Processando documentos..."):
-            file_inputs: List[tuple[bytes, str | None]] = []
-            for file in uploaded_files:
-                file_inputs.append((file.read(), file.name))
-
-            service: PipelineService = st.session_state.pipeline_service
-            payload = PipelineCreate(
-                request_id=request_id,
-                user_id=user_id,
-                query=query.strip() if query else None,
-                files=file_inputs,
+        service = get_pipeline_service()
+        cache = _session_documents()
+        payload = PipelineCreate(
+            request_id=request_id,
+            user_id=user_id,
+            query=query.strip() if query else None,
+            files=[(file, file.name) for file in uploaded_files],
+            use_cache=use_cache,
+        )
+        progress = st.progress(0.0, text="Processando documentos...")
+        live_placeholder = st.empty()
+        live_results = live_placeholder.container()
+        # The service reports from its pipeline threads; Streamlit elements are
+        # only updated from this script thread, so progress goes through a queue.
+        events: "queue.Queue[Tuple[int, int, Optional[ProcessedDocument], bool]]" = queue.Queue()
+
+        def on_document(
+            done: int, total: int, document: Optional[ProcessedDocument], selected: bool
+        ) -> None:
+            events.put((done, total, document, selected))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # A snapshot of the session's documents: those are not OCR'd or summarised again.
+            future = executor.submit(service.create, payload, on_document, dict(cache))
+            while not (future.done() and events.empty()):
+                try:
+                    done, total, document, selected = events.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if document is not None and document.status == "ok" and document.content_hash:
+                    _remember(cache, document.content_hash, document)
+                    if selected and not payload.query:
+                        with live_results:
+                            st.markdown(f"### {document.filename or 'Documento sem nome'}")
+                            st.write(document.summary)
+                if done == total and payload.query:
+                    progress.progress(1.0, text="Consultando o assistente...")
+                else:
+                    progress.progress(done / total, text=f"Processando documentos ({done}/{total})...")
+
+        progress.empty()
+        try:
+            response = future.result()
+        except SchedulerSaturatedError as exc:
+            st.warning(
+                f"Muitas solicitações em processamento. Tente novamente em {exc.retry_after}s."
             )
-            try:
-                response = service.create(payload)
-            except Exception as exc:  # pragma: no cover - UI feedback
-                st.error(f"Erro ao processar: {exc}")
-            else:
-                st.success("Processamento concluído!")
-
-                if response.summaries:
-                    st.subheader("Sumários por currículo")
-                    for item in response.summaries:
-                        st.markdown(f"### {item.filename or 'Documento sem nome'}")
-                        st.write(item.summary)
-
-                if response.answer:
-                    st.subheader("Resposta à pergunta")
-                    st.write(response.answer)
-
-                with st.expander("Payload bruto"):
-                    st.json(response.model_dump())
+        except Exception as exc:  # pragma: no cover - UI feedback
+            st.error(f"Erro ao processar: {exc}")
+        else:
+            live_placeholder.empty()
+            st.session_state.last_response = response
+
+response = st.session_state.get("last_response")
+if response is not None:
+    st.success("Processamento concluído!")
+
+    if response.summaries:
+        st.subheader("Sumários por currículo")
+        for item in response.summaries:
+            st.markdown(f"### {item.filename or 'Documento sem nome'}")
+            st.write(item.summary)
+
+    if response.answer:
+        st.subheader("Resposta à pergunta")
+        st.write(response.answer)
+        if response.cached:
+            st.caption("Resposta reaproveitada do cache (mesma pergunta sobre os mesmos currículos).")
+
+    with st.expander("Payload bruto"):
+        st.json(response.model_dump())
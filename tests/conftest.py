@@ -0,0 +1,98 @@
+import io
+import threading
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from loadtest.mongo_stub import MongoClient
+from src.infra.database import script
+from src.modules.chatbot.chatbot_service import ChatbotService
+from src.modules.ocr.ocr_service import OCRService
+from src.modules.pipeline.pipeline_service import PipelineService
+from src.utils.ocr import OCRProcessor, OCRSettings
+from src.utils.ocr_engines import RecognizedText
+from src.utils.scheduler import FairScheduler, SchedulerSettings
+from src.utils.single_flight import SingleFlight
+from src.utils.ttl_cache import TTLCache
+
+# OCR output of the fake engine, keyed by the grey level of the rendered page.
+RESUMES = {
+    255: "Ana Souza - São Paulo/SP\nDesenvolvedora Python Sênior\n2016 - atual Empresa X\nInglês fluente",
+    100: "Bruno Lima - Recife, PE\nDesenvolvedor Java Júnior\n2022 - 2024 Empresa Y",
+    50: "Carla Dias - Belo Horizonte, MG\nEngenheira de Dados\nPython e SQL\n2019 - atual Empresa Z",
+}
+
+
+def resume_png(grey):
+    """PNG bytes the fake OCR engine reads as ``RESUMES[grey]``."""
+    buffer = io.BytesIO()
+    Image.new("L", (120, 60), grey).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class FakeEngine:
+    name = "fake"
+
+    def __init__(self):
+        self.calls = 0
+        self.gate = None
+        self._lock = threading.Lock()
+
+    def image_to_string(self, image, psm=None):
+        with self._lock:
+            self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        return RESUMES[image.getpixel((0, 0))]
+
+    def recognize(self, image, psm=None):
+        return RecognizedText(self.image_to_string(image, psm), 90.0)
+
+
+class FakeLLM:
+    settings = SimpleNamespace(model="fake-model")
+
+    def __init__(self):
+        self.prompts = []
+        self.answer = " resumo "
+        self.error = None
+        self._lock = threading.Lock()
+
+    def complete(self, prompt, timeout=None):
+        with self._lock:
+            self.prompts.append(prompt)
+        if self.error is not None:
+            raise self.error
+        return self.answer
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """In-memory database behind ``get_collection`` for the duration of a test."""
+    client = MongoClient()
+    monkeypatch.setattr(script, "get_client", lambda uri=None: client)
+    return client[script.DEFAULT_DB]
+
+
+@pytest.fixture
+def engine():
+    return FakeEngine()
+
+
+@pytest.fixture
+def llm():
+    return FakeLLM()
+
+
+@pytest.fixture
+def pipeline(mongo, engine, llm):
+    """A ``PipelineService`` with fake OCR/LLM backends and private shared state."""
+    return PipelineService(
+        ocr_service=OCRService(OCRProcessor(engine=engine, settings=OCRSettings())),
+        chatbot_service=ChatbotService(llm),
+        single_flight=SingleFlight(),
+        answer_cache=TTLCache(maxsize=16, ttl=60),
+        ocr_scheduler=FairScheduler("ocr-test", SchedulerSettings(concurrency=2)),
+        llm_scheduler=FairScheduler("llm-test", SchedulerSettings(concurrency=2)),
+    )
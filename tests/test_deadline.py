@@ -0,0 +1,122 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from src.utils.deadline import Deadline, DeadlineExceeded, SharedDeadline
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_budget_runs_out():
+    clock = Clock()
+    deadline = Deadline(10, clock=clock)
+    assert deadline.remaining() == 10 and not deadline.expired
+
+    clock.now += 10
+    assert deadline.expired
+    with pytest.raises(DeadlineExceeded) as excinfo:
+        deadline.check()
+    assert not excinfo.value.cancelled
+
+
+def test_unbounded_deadline_uses_the_default_timeout():
+    deadline = Deadline()
+    assert deadline.remaining() is None
+    assert deadline.timeout() is None
+    assert deadline.timeout(5) == 5
+
+
+def test_timeout_is_capped_by_the_remaining_budget():
+    clock = Clock()
+    deadline = Deadline(3, clock=clock)
+    assert deadline.timeout(5) == 3
+    assert deadline.timeout(1) == 1
+
+
+def test_cancel_fails_later_checks():
+    deadline = Deadline()
+    deadline.cancel("Client disconnected")
+    with pytest.raises(DeadlineExceeded, match="Client disconnected") as excinfo:
+        deadline.check()
+    assert excinfo.value.cancelled
+
+
+def test_wait_for_returns_the_result():
+    future = Future()
+    threading.Timer(0.05, future.set_result, args=("done",)).start()
+    assert Deadline(5).wait_for(future) == "done"
+
+
+def test_wait_for_gives_up_when_cancelled():
+    deadline = Deadline()
+    threading.Timer(0.05, deadline.cancel).start()
+    with pytest.raises(DeadlineExceeded):
+        deadline.wait_for(Future())
+
+
+def test_shared_deadline_holds_while_any_waiter_does():
+    clock = Clock()
+    short, long = Deadline(5, clock=clock), Deadline(20, clock=clock)
+    shared = SharedDeadline(short)
+    shared.join(long)
+    assert shared.timeout() == 20
+
+    short.cancel()
+    clock.now += 10
+    assert not shared.expired
+    assert shared.timeout() == 10
+    shared.check()
+
+    clock.now += 10
+    assert shared.expired and not shared.cancelled
+    with pytest.raises(DeadlineExceeded):
+        shared.check()
+
+
+def test_shared_deadline_is_unbounded_with_an_unbounded_waiter():
+    clock = Clock()
+    shared = SharedDeadline(Deadline(5, clock=clock))
+    shared.join(Deadline())
+    assert shared.timeout() is None
+
+
+def test_shared_deadline_is_cancelled_once_every_waiter_is():
+    first, second = Deadline(), Deadline()
+    shared = SharedDeadline(first)
+    shared.join(second)
+
+    first.cancel()
+    assert not shared.cancelled
+    second.cancel()
+    assert shared.cancelled
+    with pytest.raises(DeadlineExceeded) as excinfo:
+        shared.check()
+    assert excinfo.value.cancelled
+
+
+@pytest.mark.parametrize(
+    "cap, requested, expected",
+    [
+        (None, None, None),
+        (None, 30.0, 30.0),
+        (240.0, None, 240.0),
+        (240.0, 30.0, 30.0),
+        (20.0, 30.0, 20.0),
+    ],
+)
+def test_request_deadline_is_opt_in(monkeypatch, cap, requested, expected):
+    from src.modules.pipeline import pipeline_controller
+
+    monkeypatch.setattr(pipeline_controller, "MAX_DEADLINE_SECONDS", cap)
+    remaining = pipeline_controller.request_deadline(requested).remaining()
+    if expected is None:
+        assert remaining is None
+    else:
+        assert remaining == pytest.approx(expected, abs=1)
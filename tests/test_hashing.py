@@ -0,0 +1,37 @@
+import io
+
+from PIL import Image
+
+from src.utils.hashing import file_digest
+
+
+def test_streams_bytes_and_paths_hash_alike(tmp_path):
+    data = b"%PDF-1.4 curriculo" * 1000
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(data)
+    stream = io.BytesIO(data)
+    stream.read(10)
+
+    assert file_digest(data) == file_digest(stream) == file_digest(path) == file_digest(str(path))
+    assert stream.tell() == 0
+
+
+def test_images_with_the_same_pixels_but_different_shape_differ():
+    pixels = bytes(range(16))
+    wide = Image.frombytes("L", (8, 2), pixels)
+    square = Image.frombytes("L", (4, 4), pixels)
+
+    assert wide.tobytes() == square.tobytes()
+    assert file_digest(wide) != file_digest(square)
+
+
+def test_images_with_the_same_bytes_but_different_mode_differ():
+    grey = Image.new("L", (4, 4), 7)
+    palette = Image.new("P", (4, 4), 7)
+
+    assert grey.tobytes() == palette.tobytes()
+    assert file_digest(grey) != file_digest(palette)
+
+
+def test_identical_images_hash_alike():
+    assert file_digest(Image.new("RGB", (3, 3), "red")) == file_digest(Image.new("RGB", (3, 3), "red"))
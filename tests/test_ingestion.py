@@ -0,0 +1,211 @@
+import io
+import threading
+import zipfile
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.modules.ingestion.checkpoint import FileCheckpoint, MongoCheckpoint
+from src.modules.ingestion.ingestion_service import IngestionService, IngestionSettings, job_id_for
+from src.modules.ingestion.sources import DirectorySource, IngestionItem
+
+from .conftest import resume_png
+
+
+@pytest.fixture
+def service(mongo, pipeline):
+    return IngestionService(
+        pipeline_service=pipeline,
+        results=mongo["ingested_documents"],
+        jobs=mongo["ingestion_jobs"],
+        settings=IngestionSettings(workers=2, batch_size=2, max_in_flight=2),
+    )
+
+
+@pytest.fixture
+def resumes(tmp_path):
+    root = tmp_path / "resumes"
+    root.mkdir()
+    for name, grey in [("ana.png", 255), ("bruno.png", 100), ("carla.png", 50)]:
+        (root / name).write_bytes(resume_png(grey))
+    return root
+
+
+def test_file_checkpoint_survives_a_truncated_last_line(tmp_path):
+    checkpoint = FileCheckpoint(tmp_path / "checkpoint.jsonl")
+    checkpoint.mark(["a", "b"])
+    with checkpoint.path.open("a", encoding="utf-8") as handle:
+        handle.write('{"key": "c')
+
+    assert FileCheckpoint(checkpoint.path).completed() == {"a", "b"}
+
+
+def test_mongo_checkpoint_is_the_jobs_successful_results(mongo):
+    results = mongo["ingested_documents"]
+    results.insert_many(
+        [
+            {"job_id": "j1", "key": "a", "status": "succeeded"},
+            {"job_id": "j1", "key": "b", "status": "failed"},
+            {"job_id": "j2", "key": "c", "status": "succeeded"},
+        ]
+    )
+    assert MongoCheckpoint(results, "j1").completed() == {"a"}
+
+
+def test_run_ingests_and_resumes_without_redoing_work(service, resumes, engine, mongo, tmp_path):
+    checkpoint = FileCheckpoint(tmp_path / "checkpoint.jsonl")
+    items = DirectorySource(resumes).items()
+
+    first = service.run("job", items[:2], checkpoint)
+    assert (first.succeeded, first.failed, first.skipped) == (2, 0, 0)
+    assert engine.calls == 2
+
+    second = service.run("job", items, checkpoint)
+    assert (second.succeeded, second.skipped) == (1, 2)
+    assert engine.calls == 3
+    stored = list(mongo["ingested_documents"].find({"status": "succeeded"}))
+    assert sorted(doc["filename"] for doc in stored) == ["ana.png", "bruno.png", "carla.png"]
+
+
+def test_failed_items_are_recorded_and_retried_on_resume(service, resumes, llm, tmp_path):
+    checkpoint = FileCheckpoint(tmp_path / "checkpoint.jsonl")
+    items = DirectorySource(resumes).items()
+
+    llm.error = RuntimeError("provider down")
+    assert service.run("job", items, checkpoint).failed == 3
+    llm.error = None
+    assert service.run("job", items, checkpoint).succeeded == 3
+
+
+def test_retried_failures_replace_their_result_rows(service, resumes, llm, mongo):
+    checkpoint = MongoCheckpoint(mongo["ingested_documents"], "job")
+    items = DirectorySource(resumes).items()
+
+    llm.error = RuntimeError("provider down")
+    service.run("job", items, checkpoint)
+    service.run("job", items, checkpoint)
+    assert len(list(mongo["ingested_documents"].find({"job_id": "job"}))) == 3
+
+    llm.error = None
+    assert service.run("job", items, checkpoint).succeeded == 3
+    rows = list(mongo["ingested_documents"].find({"job_id": "job"}))
+    assert [row["status"] for row in rows] == ["succeeded"] * 3
+    assert service.run("job", items, checkpoint).skipped == 3
+
+
+def test_items_are_loaded_on_the_workers(service, resumes):
+    loaded_on = []
+
+    def item(path):
+        def load():
+            loaded_on.append(threading.current_thread().name)
+            return path
+
+        return IngestionItem(key=path.name, filename=path.name, size=0, load=load)
+
+    items = [item(path) for path in sorted(resumes.iterdir())]
+    assert service.run("job", items, FileCheckpoint(resumes / "checkpoint.jsonl")).succeeded == 3
+    assert len(loaded_on) == 3
+    assert all(name.startswith("ingestion") for name in loaded_on)
+
+
+def test_job_ids_are_scoped_by_user():
+    assert job_id_for("u1", "digest") != job_id_for("u2", "digest")
+    assert job_id_for("u1", "digest") == job_id_for("u1", "digest")
+
+
+def test_only_one_concurrent_upload_claims_a_job(service):
+    claims = []
+    ready = threading.Barrier(8)
+
+    def upload():
+        ready.wait()
+        claims.append(service.create("job", "u1", "lote.zip")[1])
+
+    threads = [threading.Thread(target=upload) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claims) == [False] * 7 + [True]
+
+
+def test_active_jobs_are_not_claimed_again(service):
+    job, claimed = service.create("job", "u1", "lote.zip")
+    assert claimed and job["status"] == "queued"
+    service._update("job", status="running")
+
+    job, claimed = service.create("job", "u1", "lote.zip")
+    assert not claimed
+    assert job["status"] == "running"
+
+
+@pytest.mark.parametrize("status", ["completed", "failed"])
+def test_finished_jobs_are_claimed_to_resume(service, status):
+    service.create("job", "u1", "lote.zip")
+    service._update("job", status=status)
+
+    job, claimed = service.create("job", "u1", "lote.zip")
+    assert claimed and job["status"] == "queued"
+
+
+def test_stale_jobs_are_taken_over(service, mongo):
+    service.create("job", "u1", "lote.zip")
+    mongo["ingestion_jobs"].update_one(
+        {"job_id": "job"},
+        {"$set": {"status": "running", "updated_at": datetime.utcnow() - timedelta(hours=1)}},
+    )
+
+    assert service.create("job", "u1", "lote.zip")[1]
+
+
+def test_run_archive_completes_the_job_and_removes_the_archive(service, tmp_path):
+    archive = tmp_path / "lote.zip"
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as handle:
+        handle.writestr("curriculos/ana.png", resume_png(255))
+        handle.writestr("curriculos/bruno.png", resume_png(100))
+        handle.writestr("__MACOSX/._ana.png", b"")
+    archive.write_bytes(buffer.getvalue())
+
+    service.create("job", "u1", "lote.zip")
+    service.run_archive("job", str(archive))
+
+    job = service.findOne("job")
+    assert job["status"] == "completed"
+    assert job["progress"]["succeeded"] == 2
+    assert not archive.exists()
+
+
+@pytest.fixture
+def small_archive_limit(monkeypatch):
+    """The ingestion router rebuilt with a 4 KB archive limit."""
+    import importlib
+
+    from src.modules.ingestion import ingestion_controller
+
+    monkeypatch.setenv("INGESTION_MAX_ARCHIVE_MB", str(4096 / 1024 / 1024))
+    yield importlib.reload(ingestion_controller)
+    monkeypatch.delenv("INGESTION_MAX_ARCHIVE_MB")
+    importlib.reload(ingestion_controller)
+
+
+def test_oversized_archives_are_refused_while_streaming(small_archive_limit):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    app = FastAPI()
+    app.include_router(small_archive_limit.router)
+    app.dependency_overrides[small_archive_limit.get_service] = object
+    client = TestClient(app)
+
+    response = client.post(
+        "/ingestion/", data={"user_id": "u1"}, files={"file": ("cvs.zip", b"x" * 8192)}
+    )
+    assert response.status_code == 413
+
+    response = client.post(
+        "/ingestion/", data={"user_id": "u1"}, files={"file": ("cvs.zip", b"not a zip")}
+    )
+    assert response.status_code == 400
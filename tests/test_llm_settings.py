@@ -0,0 +1,91 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.llm_settings import LLMClient, LLMSettings
+
+
+def _client(provider, backend):
+    client = LLMClient.__new__(LLMClient)
+    client.settings = LLMSettings(api_key="key", model="model")
+    client.provider = provider
+    client._client = backend
+    return client
+
+
+def _chat_response(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message={"content": text})])
+
+
+class TimeoutAwareCompletions:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, model, messages, timeout=None):
+        self.calls.append(timeout)
+        return _chat_response("ok")
+
+
+class PlainCompletions:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, model, messages):
+        self.calls.append(messages)
+        return _chat_response("ok")
+
+
+def test_timeout_is_passed_when_the_client_accepts_it():
+    completions = TimeoutAwareCompletions()
+    client = _client("openai", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+
+    assert client.complete("prompt", timeout=7) == "ok"
+    assert client.complete("prompt") == "ok"
+    assert completions.calls == [7, None]
+
+
+def test_timeout_is_not_passed_to_clients_without_it():
+    completions = PlainCompletions()
+    client = _client("ai_sdk", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+
+    assert client.complete("prompt", timeout=5) == "ok"
+    assert len(completions.calls) == 1
+
+
+def test_timeout_goes_to_the_client_options_when_the_method_lacks_it():
+    plain, bounded = PlainCompletions(), PlainCompletions()
+    options = []
+
+    def with_options(timeout):
+        options.append(timeout)
+        return SimpleNamespace(chat=SimpleNamespace(completions=bounded))
+
+    backend = SimpleNamespace(chat=SimpleNamespace(completions=plain), with_options=with_options)
+    client = _client("ai_sdk", backend)
+
+    assert client.complete("prompt", timeout=5) == "ok"
+    assert options == [5]
+    assert len(bounded.calls) == 1 and not plain.calls
+
+
+def test_unbounded_clients_run_on_the_calling_thread():
+    """No helper thread: the call keeps holding its scheduler slot until it returns."""
+    threads = []
+
+    def complete(model, prompt):
+        threads.append(threading.current_thread())
+        return SimpleNamespace(text="ok")
+
+    client = _client("openai", SimpleNamespace(complete=complete))
+    assert client.complete("prompt", timeout=0.01) == "ok"
+    assert threads == [threading.current_thread()]
+
+
+def test_provider_errors_reach_the_caller():
+    def complete(model, prompt):
+        raise ConnectionError("provider down")
+
+    client = _client("openai", SimpleNamespace(complete=complete))
+    with pytest.raises(ConnectionError):
+        client.complete("prompt", timeout=5)
@@ -0,0 +1,135 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.modules.logs import log_export
+from src.modules.logs.log_export import EXPORT_FIELDS, encode
+from src.modules.logs.log_service import UsageLogService
+
+START = datetime(2024, 1, 1)
+
+
+def _documents(count):
+    return [
+        {
+            "_id": f"id{n}",
+            "request_id": f"r{n}",
+            "user_id": "u1",
+            "timestamp": START + timedelta(minutes=n),
+            "query": None,
+            "result": f"resumo {n}",
+            "cached": n % 2 == 0,
+            "metrics": {"tokens": n} if n else None,
+        }
+        for n in range(count)
+    ]
+
+
+def test_ndjson_rows_round_trip():
+    body = b"".join(encode(_documents(3), "ndjson")).decode()
+    rows = [json.loads(line) for line in body.splitlines()]
+
+    assert [row["request_id"] for row in rows] == ["r0", "r1", "r2"]
+    assert rows[0]["timestamp"] == START.isoformat()
+    assert rows[1]["metrics"] == {"tokens": 1}
+    assert list(rows[0]) == list(EXPORT_FIELDS)
+
+
+def test_csv_has_a_header_and_flat_values():
+    body = b"".join(encode(_documents(2), "csv")).decode()
+    rows = list(csv.reader(io.StringIO(body)))
+
+    assert rows[0] == list(EXPORT_FIELDS)
+    assert rows[1][EXPORT_FIELDS.index("cached")] == "true"
+    assert rows[1][EXPORT_FIELDS.index("metrics")] == ""
+    assert json.loads(rows[2][EXPORT_FIELDS.index("metrics")]) == {"tokens": 1}
+
+
+def test_gzip_output_decompresses_to_the_plain_export():
+    plain = b"".join(encode(_documents(50), "ndjson"))
+    compressed = b"".join(encode(_documents(50), "ndjson", compress=True))
+    assert zlib.decompress(compressed, 16 + zlib.MAX_WBITS) == plain
+
+
+def test_the_header_is_sent_before_any_row_is_read():
+    def documents():
+        raise AssertionError("rows read before the header was sent")
+        yield
+
+    assert next(encode(documents(), "csv")) == (",".join(EXPORT_FIELDS) + "\r\n").encode()
+
+
+@pytest.mark.parametrize("fmt, header", [("ndjson", 0), ("csv", 1)])
+def test_first_line_and_first_batch_are_flushed_then_buffered(monkeypatch, fmt, header):
+    monkeypatch.setattr(log_export, "CHUNK_SIZE", 10**6)
+    chunks = list(encode(_documents(30), fmt, batch_size=10))
+
+    lines = [chunk.decode().count("\n") for chunk in chunks]
+    assert lines == [1, header + 10 - 1, 20]
+
+
+def test_first_row_of_a_large_export_is_not_held_back():
+    read = []
+
+    def documents():
+        for document in _documents(1000):
+            read.append(document)
+            yield document
+
+    first = next(encode(documents(), "ndjson", batch_size=100))
+    assert json.loads(first)["request_id"] == "r0"
+    assert len(read) == 1
+
+
+def test_service_exports_a_period_oldest_first(mongo):
+    collection = mongo["usage_logs"]
+    for document in reversed(_documents(5)):
+        collection.insert_one(document)
+    service = UsageLogService(collection)
+
+    exported = list(service.export(START + timedelta(minutes=1), START + timedelta(minutes=4)))
+    assert [doc["request_id"] for doc in exported] == ["r1", "r2", "r3"]
+
+
+def test_export_does_not_build_indexes(mongo, monkeypatch):
+    collection = mongo["usage_logs"]
+    collection.insert_one(_documents(1)[0])
+    service = UsageLogService(collection)
+
+    def create_index(*_args, **_kwargs):
+        raise AssertionError("export must only read")
+
+    monkeypatch.setattr(collection, "create_index", create_index)
+    assert [doc["request_id"] for doc in service.export()] == ["r0"]
+
+
+def test_export_accepts_mixed_timezone_bounds(mongo):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from src.modules.logs import log_controller
+
+    collection = mongo["usage_logs"]
+    for document in _documents(3):
+        collection.insert_one(document)
+    app = FastAPI()
+    app.include_router(log_controller.router)
+    app.dependency_overrides[log_controller.get_service] = lambda: UsageLogService(collection)
+    client = TestClient(app)
+
+    response = client.get(
+        "/logs/export",
+        params={"start": "2024-01-01T00:01:00Z", "end": "2024-01-01T00:02:00"},
+    )
+    assert response.status_code == 200
+    assert [json.loads(line)["request_id"] for line in response.text.splitlines()] == ["r1"]
+
+    response = client.get(
+        "/logs/export",
+        params={"start": "2024-01-01T00:30:00-03:00", "end": "2024-01-01T00:00:00"},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,19 @@
+from loadtest import mock_llm
+from loadtest.mock_llm import _TokenBucket
+
+
+def test_rates_below_one_per_second_still_admit_requests(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(mock_llm.time, "monotonic", lambda: now[0])
+    bucket = _TokenBucket(0.5)
+
+    assert bucket.acquire()
+    assert not bucket.acquire()
+    now[0] += 2
+    assert bucket.acquire()
+
+
+def test_bucket_allows_a_burst_of_rate_requests(monkeypatch):
+    monkeypatch.setattr(mock_llm.time, "monotonic", lambda: 0.0)
+    bucket = _TokenBucket(3)
+    assert [bucket.acquire() for _ in range(4)] == [True, True, True, False]
@@ -0,0 +1,253 @@
+import shutil
+import sys
+import threading
+import types
+
+import pytest
+from PIL import Image, ImageDraw
+
+from src.utils import ocr_engines
+from src.utils.ocr import OCRProcessor, OCRSettings
+from src.utils.ocr_engines import OCRConfigurationError, PytesseractEngine, TesserocrEngine
+
+PAGE_TEXT = "Lucas Rodrigues\nPython, C++ e SQL\n\nExperiência: 8 anos\n"
+
+
+def _tesseract_output(image, psm):
+    """What a real Tesseract run would return for ``image`` at ``psm``."""
+    return f"{PAGE_TEXT}[{image.size[0]}x{image.size[1]} psm={psm}]\n"
+
+
+def _tesseract_data(text):
+    """``image_to_data`` rows (paragraph, line and word levels) for ``text``."""
+    columns = ("level", "block_num", "par_num", "line_num", "word_num", "text", "conf")
+    data = {column: [] for column in columns}
+
+    def row(*values):
+        for column, value in zip(columns, values):
+            data[column].append(value)
+
+    for par, paragraph in enumerate(text.strip("\n").split("\n\n"), start=1):
+        row(3, 1, par, 0, 0, "", "-1")
+        for line_num, line in enumerate(paragraph.split("\n"), start=1):
+            row(4, 1, par, line_num, 0, "", "-1")
+            for word_num, word in enumerate(line.split(), start=1):
+                row(5, 1, par, line_num, word_num, word, "90")
+    return data
+
+
+@pytest.fixture
+def fake_pytesseract(monkeypatch):
+    calls = []
+
+    def image_to_string(image, lang, config):
+        calls.append((lang, config))
+        return _tesseract_output(image, int(config.split("--psm ")[1]))
+
+    def text_and_data(image, lang, config):
+        calls.append((lang, config))
+        text = _tesseract_output(image, int(config.split("--psm ")[1]))
+        return text, _tesseract_data(text)
+
+    module = types.SimpleNamespace(image_to_string=image_to_string)
+    monkeypatch.setattr(ocr_engines, "_tesseract_text_and_data", text_and_data)
+    monkeypatch.setitem(sys.modules, "pytesseract", module)
+    return calls
+
+
+@pytest.fixture
+def fake_tesserocr(monkeypatch):
+    created = []
+
+    class PyTessBaseAPI:
+        def __init__(self, lang, psm, oem, path=None):
+            self.lang, self.psm, self.oem = lang, psm, oem
+            self.image = None
+            self.ended = False
+            created.append(self)
+
+        def SetPageSegMode(self, psm):
+            self.psm = psm
+
+        def SetImage(self, image):
+            self.image = image
+
+        def GetUTF8Text(self):
+            return _tesseract_output(self.image, self.psm)
+
+        def MapWordConfidences(self):
+            return [(word, 90.0) for word in self.GetUTF8Text().split()]
+
+        def Clear(self):
+            self.image = None
+
+        def End(self):
+            self.ended = True
+
+    module = types.SimpleNamespace(PSM=int, OEM=int, PyTessBaseAPI=PyTessBaseAPI)
+    monkeypatch.setitem(sys.modules, "tesserocr", module)
+    return created
+
+
+def _image(width=40, height=20):
+    return Image.new("L", (width, height), color=255)
+
+
+def test_engines_return_identical_text(fake_pytesseract, fake_tesserocr):
+    pytesseract_engine = PytesseractEngine(language="por", psm=6)
+    tesserocr_engine = TesserocrEngine(language="por", psm=6)
+    image = _image()
+
+    for psm in (None, 4):
+        assert pytesseract_engine.image_to_string(image, psm=psm) == tesserocr_engine.image_to_string(
+            image, psm=psm
+        )
+
+
+def test_engines_use_the_same_language_psm_and_oem(fake_pytesseract, fake_tesserocr):
+    PytesseractEngine(language="eng", psm=4, oem=1).image_to_string(_image())
+    TesserocrEngine(language="eng", psm=4, oem=1).image_to_string(_image())
+
+    assert fake_pytesseract == [("eng", "--oem 1 --psm 4")]
+    api = fake_tesserocr[0]
+    assert (api.lang, api.psm, api.oem) == ("eng", 4, 1)
+
+
+def test_recognize_returns_the_same_text_as_image_to_string(fake_pytesseract, fake_tesserocr):
+    image = _image()
+    for engine in (PytesseractEngine(psm=6), TesserocrEngine(psm=6)):
+        recognized = engine.recognize(image, psm=4)
+        assert recognized.text == engine.image_to_string(image, psm=4)
+        assert recognized.confidence == pytest.approx(90.0)
+
+
+def test_recognize_runs_tesseract_once(fake_pytesseract):
+    PytesseractEngine().recognize(_image())
+    assert len(fake_pytesseract) == 1
+
+
+def test_recognize_ignores_empty_and_negative_confidence_boxes(fake_pytesseract):
+    assert PytesseractEngine().recognize(_image()).confidence == pytest.approx(90.0)
+
+
+def test_adaptive_and_plain_modes_agree_on_text(fake_pytesseract):
+    image = _image(300, 200)
+    engine = PytesseractEngine()
+    plain = OCRProcessor(engine=engine, settings=OCRSettings(adaptive=False))
+    adaptive = OCRProcessor(
+        engine=engine, settings=OCRSettings(adaptive=True, base_dpi=200, fast_dpi=200)
+    )
+
+    assert adaptive.extract_page_from_image(image).text == plain.extract_text_from_image(image)
+
+
+def test_single_run_uses_pytesseract_internals_as_pinned(monkeypatch):
+    """The single-run path uses private pytesseract helpers; fail loudly if they change."""
+    runner = pytest.importorskip("pytesseract.pytesseract")
+    calls = []
+
+    def run_tesseract(input_filename, output_base, extension, lang, config):
+        calls.append((extension, lang, config))
+        with open(f"{output_base}.txt", "w", encoding="utf-8") as handle:
+            handle.write("Ana Souza\n\nPython\n")
+        with open(f"{output_base}.tsv", "w", encoding="utf-8") as handle:
+            handle.write("level\tconf\ttext\n5\t91\tAna\n5\t-1\t\n")
+
+    monkeypatch.setattr(runner, "run_tesseract", run_tesseract)
+    text, data = ocr_engines._tesseract_text_and_data(_image(), "por", "--psm 6")
+
+    assert text == "Ana Souza\n\nPython\n"
+    assert data["text"] == ["Ana", ""] and data["conf"] == [91, -1]
+    assert calls == [("txt", "por", "-c tessedit_create_tsv=1 --psm 6")]
+
+
+def test_tesserocr_restores_default_psm_after_override(fake_tesserocr):
+    engine = TesserocrEngine(psm=6)
+    engine.image_to_string(_image(), psm=3)
+    assert fake_tesserocr[0].psm == 6
+
+
+def test_tesserocr_close_ends_resident_instances(fake_tesserocr):
+    engine = TesserocrEngine()
+    engine.image_to_string(_image())
+    engine.close()
+    assert all(api.ended for api in fake_tesserocr)
+
+
+def test_short_lived_threads_reuse_pooled_instances(fake_tesserocr):
+    engine = TesserocrEngine(max_instances=2)
+    for _ in range(5):
+        thread = threading.Thread(target=engine.image_to_string, args=(_image(),))
+        thread.start()
+        thread.join()
+
+    assert len(fake_tesserocr) == 1
+
+
+def test_tesserocr_callers_wait_for_a_free_instance(fake_tesserocr):
+    engine = TesserocrEngine(max_instances=1)
+    with engine._api() as held:
+        waiter = threading.Thread(target=engine.image_to_string, args=(_image(),))
+        waiter.start()
+        waiter.join(0.1)
+        assert waiter.is_alive()
+    waiter.join(5)
+
+    assert not waiter.is_alive()
+    assert fake_tesserocr == [held]
+
+
+def test_processor_output_does_not_depend_on_engine(fake_pytesseract, fake_tesserocr):
+    settings = OCRSettings(adaptive=False)
+    image = _image(300, 200)
+    by_pytesseract = OCRProcessor(engine=PytesseractEngine(), settings=settings)
+    by_tesserocr = OCRProcessor(engine=TesserocrEngine(), settings=settings)
+
+    assert by_pytesseract.extract_text_from_image(image) == by_tesserocr.extract_text_from_image(image)
+
+
+def test_missing_tesserocr_fails_with_clear_message(monkeypatch):
+    monkeypatch.setitem(sys.modules, "tesserocr", None)
+    ocr_engines.get_engine.cache_clear()
+    try:
+        with pytest.raises(OCRConfigurationError, match="OCR_ENGINE=tesserocr requires"):
+            ocr_engines.get_engine("tesserocr")
+    finally:
+        ocr_engines.get_engine.cache_clear()
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(OCRConfigurationError, match="Unknown OCR engine"):
+        ocr_engines.get_engine("easyocr")
+
+
+@pytest.mark.skipif(shutil.which("tesseract") is None, reason="tesseract binary not installed")
+def test_real_backends_produce_identical_text():
+    pytest.importorskip("pytesseract")
+    pytest.importorskip("tesserocr")
+    image = Image.new("L", (900, 160), color=255)
+    draw = ImageDraw.Draw(image)
+    draw.text((20, 20), "Lucas Rodrigues", fill=0)
+    draw.text((20, 80), "Python, Java e SQL", fill=0)
+    settings = OCRSettings(adaptive=False)
+
+    by_pytesseract = OCRProcessor(language="eng", engine=PytesseractEngine("eng"), settings=settings)
+    by_tesserocr = OCRProcessor(language="eng", engine=TesserocrEngine("eng"), settings=settings)
+
+    assert by_pytesseract.extract_text_from_image(image) == by_tesserocr.extract_text_from_image(image)
+
+
+@pytest.mark.skipif(shutil.which("tesseract") is None, reason="tesseract binary not installed")
+def test_real_recognize_matches_image_to_string():
+    pytest.importorskip("pytesseract")
+    image = Image.new("L", (900, 260), color=255)
+    draw = ImageDraw.Draw(image)
+    draw.text((20, 20), "Lucas Rodrigues", fill=0)
+    draw.text((20, 60), "Python,   Java e SQL", fill=0)
+    draw.text((20, 160), "Experiencia: 8 anos", fill=0)
+    engine = PytesseractEngine("eng")
+
+    for psm in (None, 4):
+        recognized = engine.recognize(image, psm=psm)
+        assert recognized.text == engine.image_to_string(image, psm=psm)
+        assert 0 < recognized.confidence <= 100
@@ -0,0 +1,78 @@
+import io
+import tempfile
+
+import pytest
+from PIL import Image
+
+from src.utils import ocr
+from src.utils.ocr import OCRProcessor, OCRSettings
+
+PDF_BYTES = b"%PDF-1.4\n" + b"0" * 4096 + b"\n%%EOF\n"
+
+
+@pytest.fixture
+def no_temp_copy(monkeypatch):
+    def refuse(*_args, **_kwargs):
+        raise AssertionError("disk-backed input must not be copied to a new temp file")
+
+    monkeypatch.setattr(ocr.tempfile, "NamedTemporaryFile", refuse)
+
+
+def _read(path):
+    with open(path, "rb") as handle:
+        return handle.read()
+
+
+def test_regular_file_stream_is_read_in_place(tmp_path, no_temp_copy):
+    source = tmp_path / "cv.pdf"
+    source.write_bytes(PDF_BYTES)
+    with open(source, "rb") as stream, ocr._pdf_path(stream) as path:
+        assert _read(path) == PDF_BYTES
+
+
+def test_rolled_over_spooled_upload_is_read_in_place(no_temp_copy):
+    with tempfile.SpooledTemporaryFile(max_size=1024) as upload:
+        upload.write(PDF_BYTES)
+        with ocr._pdf_path(upload) as path:
+            assert _read(path) == PDF_BYTES
+
+
+def test_render_path_outlives_the_upload_descriptor(no_temp_copy):
+    """A closed upload's descriptor number may be reused by another request's file."""
+    upload = tempfile.SpooledTemporaryFile(max_size=1024)
+    upload.write(PDF_BYTES)
+    with ocr._pdf_path(upload) as path:
+        upload.close()
+        with tempfile.TemporaryFile() as other:
+            other.write(b"%PDF-other")
+            other.flush()
+            assert _read(path) == PDF_BYTES
+
+
+def test_in_memory_input_is_spooled_to_a_temp_file():
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as upload:
+        upload.write(PDF_BYTES)
+        with ocr._pdf_path(upload) as path:
+            assert _read(path) == PDF_BYTES
+    with ocr._pdf_path(PDF_BYTES) as path:
+        assert _read(path) == PDF_BYTES
+
+
+def test_pages_are_rendered_in_batches(monkeypatch):
+    import pdf2image
+
+    rendered = []
+
+    def convert_from_path(path, dpi, first_page, last_page):
+        assert _read(path) == PDF_BYTES
+        rendered.append((first_page, last_page))
+        return [Image.new("L", (10, 10), 255) for _ in range(first_page, last_page + 1)]
+
+    monkeypatch.setattr(pdf2image, "pdfinfo_from_path", lambda path: {"Pages": 5})
+    monkeypatch.setattr(pdf2image, "convert_from_path", convert_from_path)
+    processor = OCRProcessor(engine=object(), settings=OCRSettings(pdf_page_batch=2))
+
+    numbers = [number for number, _page in processor.iter_pdf_pages(io.BytesIO(PDF_BYTES), dpi=100)]
+
+    assert numbers == [1, 2, 3, 4, 5]
+    assert rendered == [(1, 2), (3, 4), (5, 5)]
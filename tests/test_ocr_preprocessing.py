@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from src.utils import ocr
+
+
+def _clean_page():
+    image = Image.new("L", (400, 200), color=255)
+    draw = ImageDraw.Draw(image)
+    for row in range(20, 180, 30):
+        draw.rectangle((20, row, 380, row + 12), fill=0)
+    return image
+
+
+def _speckled_page(seed=7):
+    pixels = np.asarray(_clean_page()).copy()
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(1, pixels.shape[0] - 1, 2000)
+    cols = rng.integers(1, pixels.shape[1] - 1, 2000)
+    pixels[rows, cols] = 0
+    return Image.fromarray(pixels)
+
+
+@pytest.fixture
+def median_calls(monkeypatch):
+    calls = []
+    original = ocr._median3
+
+    def tracking(pixels, *args, **kwargs):
+        calls.append(pixels.shape)
+        return original(pixels, *args, **kwargs)
+
+    monkeypatch.setattr(ocr, "_median3", tracking)
+    return calls
+
+
+def test_clean_image_is_detected_as_clean():
+    assert ocr._is_clean(np.asarray(_clean_page()))
+    assert ocr._is_clean(np.full((50, 50), 255, dtype=np.uint8))
+
+
+def test_speckled_or_grey_images_are_not_clean():
+    assert not ocr._is_clean(np.asarray(_speckled_page()))
+    assert not ocr._is_clean(np.full((50, 50), 128, dtype=np.uint8))
+
+
+def test_auto_denoise_skips_median_filter_for_clean_images(median_calls):
+    ocr._prepare_image_for_ocr(_clean_page(), denoise="auto")
+    assert median_calls == []
+
+
+def test_auto_denoise_filters_noisy_images(median_calls):
+    ocr._prepare_image_for_ocr(_speckled_page(), denoise="auto")
+    assert median_calls == [(200, 400)]
+
+
+@pytest.mark.parametrize("denoise, expected", [("always", 1), ("never", 0)])
+def test_denoise_setting_overrides_detection(median_calls, denoise, expected):
+    ocr._prepare_image_for_ocr(_clean_page(), denoise=denoise)
+    assert len(median_calls) == expected
+
+
+def test_median_filter_removes_isolated_pixels():
+    pixels = np.full((600, 20), 255, dtype=np.uint8)
+    pixels[300, 10] = 0
+    filtered = ocr._median3(pixels, strip_rows=256)
+    assert filtered.min() == 255
+    assert filtered.shape == pixels.shape
+
+
+def test_autocontrast_stretches_to_full_range():
+    pixels = np.array([[60, 100], [140, 180]], dtype=np.uint8)
+    stretched = ocr._autocontrast(pixels)
+    assert stretched.min() == 0
+    assert stretched.max() == 255
+    assert stretched.dtype == np.uint8
+    assert np.all(np.diff(stretched.ravel().astype(int)) > 0)
+
+
+def test_prepare_limits_the_longest_side():
+    prepared = ocr._prepare_image_for_ocr(Image.new("RGB", (4000, 1000), "white"), max_dimension=2000)
+    assert prepared.size == (2000, 500)
+    assert prepared.mode == "L"
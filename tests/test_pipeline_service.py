@@ -0,0 +1,180 @@
+import threading
+import time
+
+import pytest
+
+from src.modules.pipeline.pipeline_service import PipelineCreate
+from src.utils.deadline import Deadline, DeadlineExceeded
+from src.utils.scheduler import SchedulerSaturatedError
+
+from .conftest import resume_png
+
+
+def _request(request_id, files, query=None, user_id="u1", **kwargs):
+    return PipelineCreate(request_id=request_id, user_id=user_id, query=query, files=files, **kwargs)
+
+
+def test_each_upload_keeps_its_own_filename(pipeline):
+    response = pipeline.create(
+        _request("r1", [(resume_png(255), "ana.png"), (resume_png(255), "copia-da-ana.png")])
+    )
+
+    assert [summary.filename for summary in response.summaries] == ["ana.png", "copia-da-ana.png"]
+
+
+def test_shared_summary_prompt_has_no_filename(pipeline, llm):
+    pipeline.create(_request("r1", [(resume_png(255), "ana-souza-confidencial.png")]))
+    pipeline.create(_request("r2", [(resume_png(255), "outro-nome.png")]))
+
+    assert llm.prompts
+    assert not any("confidencial" in prompt or "outro-nome" in prompt for prompt in llm.prompts)
+
+
+def test_identical_uploads_are_ocrd_once(pipeline, engine):
+    pipeline.create(_request("r1", [(resume_png(255), "a.png"), (resume_png(255), "b.png")]))
+    assert engine.calls == 1
+
+
+QUERY = "Quem tem experiência com Python?"
+
+
+def test_repeated_question_is_answered_from_cache(pipeline, llm):
+    files = [(resume_png(255), "ana.png"), (resume_png(100), "bruno.png")]
+    first = pipeline.create(_request("r1", files, QUERY))
+    calls = len(llm.prompts)
+    second = pipeline.create(_request("r2", files, "quem tem  experiência com PYTHON?"))
+
+    assert not first.cached and second.cached
+    assert second.answer == first.answer
+    assert len(llm.prompts) == calls
+
+
+def test_profiles_read_text_past_the_prompt_budget(pipeline, llm, mongo):
+    pipeline._token_budget = 10
+    pipeline.create(_request("r1", [(resume_png(50), "carla.png")], QUERY))
+
+    assert "Python" not in llm.prompts[0]
+    assert "carla.png" in llm.prompts[-1]
+    assert "python" in mongo["candidates"].find_one({})["profile"]["skills"]
+
+
+def test_cache_key_includes_the_filenames(pipeline, llm):
+    llm.answer = "ana.png atende"
+    pipeline.create(_request("r1", [(resume_png(255), "ana.png")], QUERY))
+    llm.answer = "ana-souza.png atende"
+    renamed = pipeline.create(_request("r2", [(resume_png(255), "ana-souza.png")], QUERY))
+
+    assert not renamed.cached
+    assert renamed.answer == "ana-souza.png atende"
+
+
+def test_cache_key_ignores_the_upload_order(pipeline):
+    ana, carla = (resume_png(255), "ana.png"), (resume_png(50), "carla.png")
+    pipeline.create(_request("r1", [ana, carla], QUERY))
+
+    assert pipeline.create(_request("r2", [carla, ana], QUERY)).cached
+    assert pipeline.create(_request("r3", [ana, carla], QUERY)).cached
+
+
+def test_use_cache_false_bypasses_the_cache(pipeline):
+    files = [(resume_png(255), "ana.png")]
+    pipeline.create(_request("r1", files, QUERY))
+    assert not pipeline.create(_request("r2", files, QUERY, use_cache=False)).cached
+
+
+def test_admission_counts_the_documents_a_user_has_pending(pipeline):
+    files = [(resume_png(255), "ana.png")]
+    with pipeline.admit("u1", documents=32):
+        with pytest.raises(SchedulerSaturatedError):
+            pipeline.create(_request("r1", files))
+        assert pipeline.create(_request("r2", files, user_id="u2")).summaries
+    assert pipeline.create(_request("r3", files)).summaries
+
+
+def test_shared_ocr_survives_the_request_that_started_it(pipeline, engine, monkeypatch):
+    """A request leaving (timeout, disconnect) must not cancel OCR other requests wait on."""
+    scheduler = pipeline._ocr_scheduler
+    submitted = []
+    submit = scheduler.submit
+    monkeypatch.setattr(
+        scheduler, "submit", lambda user_id, fn: submitted.append(user_id) or submit(user_id, fn)
+    )
+    busy = threading.Event()
+    blockers = [submit("other", lambda: busy.wait(5)) for _ in range(2)]
+    files = [(resume_png(255), "ana.png")]
+    leader_deadline, outcome = Deadline(), {}
+
+    def leader():
+        try:
+            pipeline.create(_request("r1", files, deadline=leader_deadline))
+        except DeadlineExceeded:
+            outcome["leader"] = "cancelled"
+
+    def follower():
+        outcome["follower"] = pipeline.create(_request("r2", files, user_id="u2", deadline=Deadline(5)))
+
+    threads = [threading.Thread(target=leader)]
+    threads[0].start()
+    while not submitted:
+        time.sleep(0.001)
+    threads.append(threading.Thread(target=follower))
+    threads[1].start()
+    time.sleep(0.1)
+    leader_deadline.cancel()
+    threads[0].join(5)
+    busy.set()
+    threads[1].join(5)
+    for blocker in blockers:
+        blocker.result(5)
+
+    assert outcome["leader"] == "cancelled"
+    assert [summary.filename for summary in outcome["follower"].summaries] == ["ana.png"]
+    assert submitted == ["u1"]
+    assert engine.calls == 1
+
+
+def test_progress_is_reported_per_distinct_document(pipeline):
+    events = []
+    files = [
+        (resume_png(255), "ana.png"),
+        (resume_png(100), "bruno.png"),
+        (resume_png(255), "copia.png"),
+    ]
+    pipeline.create(
+        _request("r1", files, QUERY),
+        on_document=lambda done, total, document, selected: events.append(
+            (done, total, document.filename, selected)
+        ),
+    )
+
+    assert [event[:2] for event in events] == [(1, 2), (2, 2)]
+    assert sorted(event[2:] for event in events) == [("ana.png", True), ("bruno.png", False)]
+
+
+def test_known_documents_are_not_processed_again(pipeline, engine, llm):
+    known = {}
+    first = pipeline.create(
+        _request("r1", [(resume_png(255), "ana.png")]),
+        on_document=lambda done, total, document, selected: known.update(
+            {document.content_hash: document}
+        ),
+    )
+    calls, prompts = engine.calls, len(llm.prompts)
+    second = pipeline.create(_request("r2", [(resume_png(255), "outro.png")]), known=known)
+
+    assert (engine.calls, len(llm.prompts)) == (calls, prompts)
+    assert [summary.filename for summary in second.summaries] == ["outro.png"]
+    assert second.summaries[0].summary == first.summaries[0].summary
+
+
+def test_profile_store_errors_do_not_fail_the_batch(pipeline, monkeypatch):
+    def create(*_args, **_kwargs):
+        raise ConnectionError("mongo down")
+
+    monkeypatch.setattr(pipeline._candidate_service, "create", create)
+    response = pipeline.create(
+        _request("r1", [(resume_png(255), "ana.png"), (resume_png(100), "bruno.png")])
+    )
+
+    assert [summary.filename for summary in response.summaries] == ["ana.png", "bruno.png"]
+    assert all(summary.summary for summary in response.summaries)
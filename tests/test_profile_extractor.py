@@ -0,0 +1,184 @@
+from datetime import date
+
+import pytest
+
+from src.modules.candidates.candidate_service import CandidateService
+from src.modules.candidates.entity.candidate_entity import CandidateProfile, ProfileConstraints
+from src.modules.candidates.profile_extractor import extract_profile, matches, parse_constraints
+
+RESUME = """Ana Souza
+São Paulo - SP
+Desenvolvedora Python Sênior
+2016 - 2020 Empresa X: Django, PostgreSQL e Docker
+2020 - atual Empresa Y: Go e Kubernetes
+Inglês fluente, espanhol intermediário
+Mestrado em Computação"""
+
+
+def test_profile_fields_are_extracted():
+    profile = extract_profile(RESUME)
+
+    assert {"python", "django", "postgresql", "docker", "go", "kubernetes"} <= set(profile.skills)
+    assert profile.languages[:1] == ["pt"] and {"en", "es"} <= set(profile.languages)
+    assert profile.locations == ["sao paulo", "sp"]
+    assert profile.seniority == "senior"
+    assert profile.education == "masters"
+    assert profile.years_experience >= 9
+
+
+@pytest.mark.parametrize(
+    "query, skills",
+    [
+        ("Quem tem experiência com MS Excel?", [["excel"]]),
+        ("Preciso de alguém com Python e GO", [["python"], ["go"]]),
+        ("Quais candidatos já abriram PR em projetos open source?", []),
+        ("Conhecimento obrigatório em MS Office e Power BI", [["power bi"]]),
+    ],
+)
+def test_acronyms_outside_a_location_context_are_not_states(query, skills):
+    constraints = parse_constraints(query)
+    assert constraints.locations == []
+    assert constraints.skill_groups == skills
+
+
+@pytest.mark.parametrize(
+    "query, locations",
+    [
+        ("Vaga presencial em SP", ["sp"]),
+        ("Candidatos em SP ou RJ com Java", ["sp", "rj"]),
+        ("Alguém de Curitiba - PR com Java?", ["curitiba", "pr"]),
+        ("Moradores de Recife/PE", ["recife", "pe"]),
+        ("Desenvolvedor em Goiânia (GO)", ["goiania", "go"]),
+    ],
+)
+def test_states_are_read_in_a_location_context(query, locations):
+    assert parse_constraints(query).locations == locations
+
+
+@pytest.mark.parametrize("text", ["Go", "Golang", "golang", "GO", "Python, Go e Rust"])
+def test_go_is_recognised(text):
+    assert "go" in extract_profile(text).skills
+
+
+def test_state_code_go_is_not_the_language():
+    profile = extract_profile("Carla Dias\nGoiânia - GO\nDesenvolvedora Java")
+    assert "go" not in profile.skills
+    assert "go" in profile.locations
+
+
+def test_the_verb_go_is_not_a_skill():
+    assert "go" not in extract_profile("Ready to go the extra mile").skills
+
+
+def test_remote_queries_have_no_location_filter():
+    assert parse_constraints("Vaga remota, time em SP").locations == []
+
+
+def test_soft_clauses_are_ignored():
+    constraints = parse_constraints("Python obrigatório, com 5+ anos. Desejável Docker")
+    assert constraints.skill_groups == [["python"]]
+    assert constraints.min_years == 5
+
+
+def test_alternatives_form_one_group():
+    assert parse_constraints("Precisa ter Java ou Kotlin").skill_groups == [["java", "kotlin"]]
+
+
+@pytest.mark.parametrize(
+    "query, resume",
+    [
+        ("Quem tem experiência com SQL?", "Banco de dados: PostgreSQL e MySQL"),
+        ("Precisa ter JavaScript e Python", "Front-end em React, back-end em Django"),
+        ("Obrigatório Machine Learning", "Modelos com PyTorch e scikit-learn"),
+    ],
+)
+def test_skills_imply_their_foundations(query, resume):
+    assert matches(extract_profile(resume), parse_constraints(query))
+
+
+def test_implied_skills_are_not_demanded_by_queries():
+    assert parse_constraints("Quem tem React?").skill_groups == [["react"]]
+
+
+def test_listed_skills_rank_without_filtering():
+    constraints = parse_constraints("Tech Lead com Python, LLMs e RAG")
+    assert constraints.skill_groups == []
+    assert constraints.empty
+
+
+def test_longest_city_wins():
+    assert parse_constraints("Candidatos de Porto Alegre").locations == ["porto alegre"]
+    assert extract_profile("Ana\nPorto Alegre - RS").locations == ["porto alegre", "rs"]
+    assert parse_constraints("Candidatos do Porto").locations == ["porto"]
+
+
+def test_education_dates_are_not_experience():
+    resume = "Ana\nBacharel em Computação\n2010 - 2014 Universidade X\nExperiência\n2016 - atual Empresa Y"
+    assert extract_profile(resume).years_experience == date.today().year - 2016
+    assert extract_profile("Formação\n2010 - 2014\nEmpresa Y\n2016 - 2020").years_experience == 4
+
+
+@pytest.mark.parametrize(
+    "query", ["Quem tem menos de 2 anos de experiência?", "Até 3 anos de experiência"]
+)
+def test_upper_bounds_on_years_set_no_minimum(query):
+    assert parse_constraints(query).min_years is None
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "Quais candidatos não falam inglês?",
+        "Responda em inglês: quem é o melhor candidato?",
+        "Resumo dos currículos em inglês",
+    ],
+)
+def test_languages_need_a_requirement(query):
+    assert parse_constraints(query).language_groups == []
+
+
+def test_required_languages():
+    assert parse_constraints("Quem fala inglês e espanhol?").language_groups == [["en"], ["es"]]
+    assert parse_constraints("Responda em inglês: quem tem Python?").skill_groups == [["python"]]
+
+
+def test_language_alternatives_are_any_of():
+    constraints = parse_constraints("Quem fala inglês ou espanhol?")
+    assert constraints.language_groups == [["en", "es"]]
+    assert matches(CandidateProfile(languages=["pt", "es"]), constraints)
+    assert not matches(CandidateProfile(languages=["pt", "fr"]), constraints)
+
+
+def test_negated_skills_are_not_required():
+    assert parse_constraints("Quem não tem Java?").skill_groups == []
+
+
+def test_matches_keeps_unknown_fields():
+    constraints = ProfileConstraints(skill_groups=[["python"]], min_years=5, locations=["sp"])
+    assert matches(CandidateProfile(skills=["python"]), constraints)
+    assert not matches(CandidateProfile(skills=["java"]), constraints)
+    assert not matches(CandidateProfile(skills=["python"], years_experience=2), constraints)
+    assert not matches(CandidateProfile(skills=["python"], locations=["rj"]), constraints)
+    assert matches(CandidateProfile(skills=["python"], locations=["rj", "remoto"]), constraints)
+    assert matches(CandidateProfile(), ProfileConstraints(language_groups=[["en"]]))
+
+
+def test_stored_profiles_are_filtered_by_constraints(mongo):
+    service = CandidateService()
+    service.create("a", extract_profile(RESUME), "ana.png")
+    service.create("b", extract_profile("Bruno\nRecife - PE\nJava Júnior"), "bruno.png")
+
+    constraints = parse_constraints("Quem tem Python em SP?")
+    assert service.findAll(constraints, ["a", "b"]) == ["a"]
+    service.create("c", extract_profile("Carla\nEspanhol fluente"), "carla.png")
+    constraints = parse_constraints("Quem fala inglês ou francês?")
+    assert service.findAll(constraints, ["a", "b", "c"]) == ["a", "b"]
+    assert set(service.findMany(["a", "b", "missing"])) == {"a", "b"}
+
+
+def test_profiles_from_older_extractors_are_ignored(mongo):
+    service = CandidateService()
+    service.create("a", extract_profile(RESUME), "ana.png")
+    mongo["candidates"].update_one({"content_hash": "a"}, {"$set": {"extractor_version": 0}})
+
+    assert service.findMany(["a"]) == {}
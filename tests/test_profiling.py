@@ -0,0 +1,142 @@
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.modules.profiling import profiling_controller
+from src.modules.profiling.profiling_middleware import ProfilingMiddleware
+from src.modules.profiling.profiling_service import ProfileService, ProfilingSettings
+from src.utils import profiling
+
+TOKEN = "s3cret"
+
+
+def _busy(seconds):
+    until = time.perf_counter() + seconds
+    while time.perf_counter() < until:
+        pass
+
+
+def test_bound_work_on_other_threads_is_sampled():
+    profile = profiling.RequestProfile(interval=0.001)
+    token = profiling.activate(profile)
+    profile.start()
+    try:
+        worker = threading.Thread(target=profiling.bind(_busy), args=(0.1,), name="worker")
+        worker.start()
+        worker.join()
+    finally:
+        profile.stop()
+        profiling.deactivate(token)
+
+    report = profile.report()
+    assert report["samples"] > 0
+    assert report["threads"].keys() == {"worker"}
+    assert report["hotspots"][0]["function"] == "_busy"
+    assert report["cpu_seconds"] > 0
+
+
+def test_nothing_is_wrapped_without_an_active_profile():
+    items = iter([1, 2])
+    assert profiling.bind(_busy) is _busy
+    assert profiling.bind_iter(items) is items
+
+
+def test_bind_iter_attaches_while_each_item_is_produced():
+    profile = profiling.RequestProfile()
+    token = profiling.activate(profile)
+    try:
+        attached = []
+
+        def items():
+            for n in range(3):
+                attached.append(threading.get_ident() in profile._threads)
+                yield n
+
+        assert list(profiling.bind_iter(items())) == [0, 1, 2]
+    finally:
+        profiling.deactivate(token)
+    assert attached == [True, True, True]
+    assert not profile._threads
+
+
+@pytest.fixture
+def settings():
+    return ProfilingSettings(enabled=True, admin_token=TOKEN, interval_seconds=0.001, paths=("/api/work",))
+
+
+@pytest.fixture
+def profiles(mongo, settings):
+    return ProfileService(collection=mongo["request_profiles"], settings=settings)
+
+
+@pytest.fixture
+def client(settings, profiles):
+    app = FastAPI()
+
+    @app.get("/api/work")
+    def work():
+        _busy(0.02)
+        return {"ok": True}
+
+    @app.get("/other")
+    def other():
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware, settings=settings, service_factory=lambda: profiles)
+    app.include_router(profiling_controller.router, prefix="/api")
+    app.dependency_overrides[profiling_controller.get_settings] = lambda: settings
+    app.dependency_overrides[profiling_controller.get_service] = lambda: profiles
+    return TestClient(app)
+
+
+def test_token_header_profiles_the_request(client, profiles):
+    response = client.get("/api/work", headers={"X-Profile-Token": TOKEN})
+
+    profile_id = response.headers["X-Profile-Id"]
+    stored = profiles.findOne(profile_id)
+    assert stored["path"] == "/api/work" and stored["status_code"] == 200
+    assert client.get("/api/work?profile=1", headers={"X-Profile-Token": TOKEN}).headers.get(
+        "X-Profile-Id"
+    )
+
+
+@pytest.mark.parametrize(
+    "url, headers",
+    [
+        ("/api/work", {}),
+        ("/api/work?profile=" + TOKEN, {}),
+        ("/api/work", {"X-Profile": TOKEN}),
+        ("/api/work", {"X-Profile-Token": "wrong"}),
+        ("/api/work", {"X-Profile-Token": "s3crét".encode("latin-1")}),
+        ("/api/work?profile=0", {"X-Profile-Token": TOKEN}),
+        ("/other", {"X-Profile-Token": TOKEN}),
+    ],
+)
+def test_requests_without_a_valid_token_header_are_not_profiled(client, profiles, url, headers):
+    response = client.get(url, headers=headers)
+
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert profiles.findAll() == []
+
+
+def test_profile_endpoints_require_the_token_header(client):
+    profile_id = client.get("/api/work", headers={"X-Profile-Token": TOKEN}).headers["X-Profile-Id"]
+
+    assert client.get("/api/profiles/").status_code == 403
+    assert client.get(f"/api/profiles/?profile={TOKEN}").status_code == 403
+    non_ascii = {"X-Profile-Token": "s3crét".encode("latin-1")}
+    assert client.get("/api/profiles/", headers=non_ascii).status_code == 403
+
+    listed = client.get("/api/profiles/", headers={"X-Profile-Token": TOKEN})
+    assert [item["profile_id"] for item in listed.json()] == [profile_id]
+    found = client.get(f"/api/profiles/{profile_id}", headers={"X-Profile-Token": TOKEN})
+    assert found.json()["path"] == "/api/work"
+
+
+def test_disabled_settings_authorize_nothing():
+    assert not ProfilingSettings(enabled=False, admin_token=TOKEN).authorizes(TOKEN)
+    assert ProfilingSettings(enabled=True, admin_token=TOKEN).authorizes(TOKEN.encode())
@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+from src.utils.scheduler import (
+    FairScheduler,
+    SchedulerSaturatedError,
+    SchedulerSettings,
+    per_process,
+)
+
+
+def _scheduler(**settings):
+    return FairScheduler("test", SchedulerSettings(**settings))
+
+
+def test_users_are_served_round_robin():
+    scheduler = _scheduler(concurrency=1)
+    release = threading.Event()
+    order = []
+    blocker = scheduler.submit("heavy", lambda: release.wait(5))
+    while scheduler.stats()["running"] == 0:
+        time.sleep(0.001)
+
+    futures = [scheduler.submit("heavy", lambda n=n: order.append(f"heavy{n}")) for n in range(3)]
+    futures.append(scheduler.submit("light", lambda: order.append("light")))
+    release.set()
+    for future in [blocker, *futures]:
+        future.result(5)
+
+    assert order == ["heavy0", "light", "heavy1", "heavy2"]
+
+
+def test_results_and_exceptions_reach_the_caller():
+    scheduler = _scheduler(concurrency=1)
+    assert scheduler.run("u1", lambda: 42) == 42
+    with pytest.raises(ValueError):
+        scheduler.run("u1", lambda: (_ for _ in ()).throw(ValueError("boom")))
+
+
+def test_cancelled_tasks_are_skipped():
+    scheduler = _scheduler(concurrency=1)
+    release = threading.Event()
+    calls = []
+    blocker = scheduler.submit("u1", lambda: release.wait(5))
+    cancelled = scheduler.submit("u1", lambda: calls.append(1))
+    assert cancelled.cancel()
+    release.set()
+
+    blocker.result(5)
+    assert scheduler.run("u1", lambda: "next") == "next"
+    assert calls == []
+
+
+def test_admission_counts_every_document_of_a_request():
+    scheduler = _scheduler(max_queue_per_user=10)
+    with scheduler.admit("u1", documents=8):
+        with pytest.raises(SchedulerSaturatedError) as excinfo:
+            with scheduler.admit("u1", documents=3):
+                pass
+        assert excinfo.value.retry_after >= 1
+        with scheduler.admit("u1", documents=2):
+            assert scheduler.stats()["admitted"] == 10
+    assert scheduler.stats()["admitted"] == 0
+
+
+def test_a_flooding_user_does_not_lock_out_others():
+    scheduler = _scheduler(max_queue=64, max_queue_per_user=8)
+    with scheduler.admit("flood", documents=100):
+        with pytest.raises(SchedulerSaturatedError):
+            with scheduler.admit("flood", documents=1):
+                pass
+        with scheduler.admit("other", documents=1):
+            assert scheduler.stats()["admitted"] == 9
+
+
+def test_one_large_request_is_admitted_when_nothing_else_is_pending():
+    scheduler = _scheduler(max_queue_per_user=4)
+    with scheduler.admit("u1", documents=100):
+        assert scheduler.stats()["admitted"] == 4
+
+
+def test_the_global_limit_applies_across_users():
+    scheduler = _scheduler(max_queue=4, max_queue_per_user=4)
+    with scheduler.admit("u1", documents=3):
+        with pytest.raises(SchedulerSaturatedError):
+            with scheduler.admit("u2", documents=2):
+                pass
+        with scheduler.admit("u2", documents=1):
+            pass
+
+
+def test_admission_is_released_when_the_request_fails():
+    scheduler = _scheduler(max_queue_per_user=2)
+    with pytest.raises(RuntimeError):
+        with scheduler.admit("u1", documents=2):
+            raise RuntimeError("ocr failed")
+    with scheduler.admit("u1", documents=2):
+        pass
+
+
+def test_work_queued_outside_admission_still_counts():
+    scheduler = _scheduler(concurrency=1, max_queue_per_user=2)
+    release = threading.Event()
+    futures = [scheduler.submit("u1", lambda: release.wait(5)) for _ in range(3)]
+    while scheduler.stats()["running"] == 0:
+        time.sleep(0.001)
+    try:
+        with pytest.raises(SchedulerSaturatedError):
+            with scheduler.admit("u1"):
+                pass
+    finally:
+        release.set()
+        for future in futures:
+            future.result(5)
+
+
+@pytest.mark.parametrize("workers, expected", [(None, 8), ("1", 8), ("4", 2), ("16", 1)])
+def test_host_concurrency_is_split_across_worker_processes(monkeypatch, workers, expected):
+    if workers is None:
+        monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    else:
+        monkeypatch.setenv("WEB_CONCURRENCY", workers)
+    assert per_process(8) == expected
@@ -0,0 +1,142 @@
+import threading
+import time
+from concurrent.futures import CancelledError, Future
+
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    results = []
+
+    def call():
+        results.append(flights.do("key", compute))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    while flights.in_flight() == 0:
+        time.sleep(0.001)
+    followers = [threading.Thread(target=call) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert results == ["value"] * 5
+    assert calls == [1]
+    assert flights.in_flight() == 0
+
+
+def test_nothing_is_cached_after_the_call():
+    flights = SingleFlight()
+    calls = []
+    assert flights.do("key", lambda: calls.append(1) or len(calls)) == 1
+    assert flights.do("key", lambda: calls.append(1) or len(calls)) == 2
+
+
+def test_share_returns_the_in_flight_future():
+    flights = SingleFlight()
+    work = Future()
+    starts = []
+
+    def start():
+        starts.append(1)
+        return work
+
+    first = flights.share("key", start)
+    second = flights.share("key", start)
+    work.set_result(42)
+
+    assert first is second
+    assert first.result() == 42
+    assert starts == [1]
+    assert flights.in_flight() == 0
+
+
+def test_retry_after_failure_starts_fresh_work():
+    """Waiters woken by a failure must not get the failed future back when retrying."""
+    flights = SingleFlight()
+    works = []
+
+    def start():
+        work = Future()
+        # Runs before SingleFlight's own callback and widens the race window.
+        work.add_done_callback(lambda _done: time.sleep(0.1))
+        works.append(work)
+        return work
+
+    shared = flights.share("key", start)
+    retried = []
+    ready = threading.Barrier(4)
+
+    def waiter():
+        ready.wait()
+        try:
+            shared.result()
+        except RuntimeError:
+            retried.append(flights.share("key", start))
+
+    threads = [threading.Thread(target=waiter) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    time.sleep(0.05)
+    works[0].set_exception(RuntimeError("boom"))
+    for thread in threads:
+        thread.join()
+
+    assert len(retried) == 3
+    assert all(future is not shared and not future.done() for future in retried)
+    assert len(works) == 2
+
+
+def test_do_retry_after_failure_calls_again():
+    flights = SingleFlight()
+    with pytest.raises(ValueError):
+        flights.do("key", lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert flights.do("key", lambda: "ok") == "ok"
+
+
+def test_shared_future_cannot_be_cancelled_by_one_waiter():
+    flights = SingleFlight()
+    work = Future()
+    shared = flights.share("key", lambda: work)
+
+    assert not shared.cancel()
+    work.set_result("done")
+    assert shared.result() == "done"
+
+
+def test_cancelled_work_is_reported_and_released():
+    flights = SingleFlight()
+    work = Future()
+    shared = flights.share("key", lambda: work)
+
+    work.cancel()
+
+    with pytest.raises(CancelledError):
+        shared.result()
+    assert flights.in_flight() == 0
+
+
+def test_failing_start_does_not_leave_the_key_taken():
+    flights = SingleFlight()
+
+    def start():
+        raise RuntimeError("queue full")
+
+    with pytest.raises(RuntimeError):
+        flights.share("key", start)
+    assert flights.in_flight() == 0
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+
+from src.utils.stages import Stage, StagePipeline
+
+
+def test_items_pass_through_every_stage():
+    pipeline = StagePipeline([Stage("double", lambda n: n * 2), Stage("inc", lambda n: n + 1)])
+    assert sorted(pipeline.run(range(5))) == [1, 3, 5, 7, 9]
+
+
+def test_returning_none_drops_the_item():
+    pipeline = StagePipeline(
+        [Stage("odd", lambda n: n if n % 2 else None), Stage("str", str)]
+    )
+    assert sorted(pipeline.run(range(6))) == ["1", "3", "5"]
+
+
+def test_stages_overlap():
+    """The second stage works on item 1 while the first is still on item 2."""
+    second_started = threading.Event()
+    overlapped = []
+
+    def first(n):
+        if n == 2:
+            overlapped.append(second_started.wait(5))
+        return n
+
+    def second(n):
+        second_started.set()
+        return n
+
+    StagePipeline([Stage("first", first), Stage("second", second)]).run([1, 2])
+    assert overlapped == [True]
+
+
+def test_queues_apply_backpressure():
+    fed = []
+    release = threading.Event()
+
+    def items():
+        for n in range(20):
+            fed.append(n)
+            yield n
+
+    def slow(n):
+        release.wait(5)
+        return n
+
+    pipeline = StagePipeline([Stage("fast", lambda n: n), Stage("slow", slow)], maxsize=2)
+    runner = threading.Thread(target=pipeline.run, args=(items(),))
+    runner.start()
+    time.sleep(0.2)
+    # One item in each worker plus two in each queue, and one blocked in emit().
+    assert len(fed) <= 7
+    release.set()
+    runner.join(5)
+    assert len(fed) == 20
+
+
+def test_workers_run_a_stage_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+    pipeline = StagePipeline([Stage("parallel", lambda n: barrier.wait() or n, workers=3)])
+    assert sorted(pipeline.run(range(3))) == [0, 1, 2]
+
+
+def test_first_exception_stops_the_feed_and_is_raised():
+    fed = []
+    processed = []
+
+    def items():
+        for n in range(100):
+            fed.append(n)
+            yield n
+
+    def fail(n):
+        if n == 3:
+            raise ValueError("bad item")
+        return n
+
+    pipeline = StagePipeline([Stage("fail", fail), Stage("done", processed.append)], maxsize=1)
+    with pytest.raises(ValueError, match="bad item"):
+        pipeline.run(items())
+    assert len(fed) < 100
+    assert 3 not in processed
+
+
+def test_exception_from_the_items_is_raised():
+    def items():
+        yield 1
+        raise RuntimeError("source broke")
+
+    with pytest.raises(RuntimeError, match="source broke"):
+        StagePipeline([Stage("id", lambda n: n)]).run(items())
+
+
+def test_a_pipeline_needs_stages():
+    with pytest.raises(ValueError):
+        StagePipeline([])
@@ -0,0 +1,100 @@
+import pytest
+
+from src.utils.text_cleaning import TRUNCATION_MARK, clean_ocr_text, estimate_tokens
+
+
+def _clean(text):
+    return clean_ocr_text(text).text
+
+
+@pytest.mark.parametrize("skill", ["C++", "C#", "- C++", "• R", "R", "Go", ".NET"])
+def test_short_skill_lines_are_kept(skill):
+    text = f"Habilidades\n{skill}\nPython"
+    kept = skill.replace("•", "-")
+    assert kept in _clean(text).split("\n")
+
+
+@pytest.mark.parametrize("junk", ["----", "|||", "• • •", "~~ ~~", "*"])
+def test_lines_without_letters_or_digits_are_dropped(junk):
+    assert _clean(f"Ana Souza\n{junk}\nPython") == "Ana Souza\nPython"
+
+
+@pytest.mark.parametrize("number", ["10", "12/15"])
+def test_numbers_inside_a_page_are_content(number):
+    text = f"Ana Souza\nProjetos entregues:\n{number}\nPython"
+    assert number in _clean(text).split("\n")
+
+
+@pytest.mark.parametrize("footer", ["3", "- 3 -", "Página 3 de 5", "pág. 3", "3/5"])
+def test_page_numbers_on_page_edges_are_dropped(footer):
+    text = f"[page 1]\n{footer}\nAna Souza\nPython\n{footer}"
+    assert _clean(text) == "Ana Souza\nPython"
+
+
+def test_hyphenated_line_breaks_are_rejoined():
+    assert _clean("Experiência em desen-\nvolvimento web") == "Experiência em desenvolvimento web"
+    assert _clean("Ampla ex-\nperiência") == "Ampla experiência"
+
+
+@pytest.mark.parametrize(
+    "broken, expected",
+    [
+        ("Sócio-\nfundador da Empresa X", "Sócio-fundador da Empresa X"),
+        ("Vice-\npresidente", "Vice-presidente"),
+        ("Desenvolvedor front-\nend", "Desenvolvedor front-end"),
+        ("Pós-\ngraduação em dados", "Pós-graduação em dados"),
+        ("Palavra-\nchave", "Palavra-chave"),
+        ("Ela apresenta-\nse bem", "Ela apresenta-se bem"),
+    ],
+)
+def test_known_compounds_keep_their_hyphen(broken, expected):
+    assert _clean(broken) == expected
+
+
+def test_hyphen_before_a_capitalised_line_is_kept():
+    assert _clean("Sócio-\nFundador") == "Sócio-\nFundador"
+
+
+def _page(number, header, body, footer=""):
+    return "\n".join([f"[page {number}]", header, *body, footer])
+
+
+def test_name_heading_every_page_is_kept_once():
+    text = "\n".join(
+        [
+            _page(1, "Ana Souza", ["Desenvolvedora Python", "São Paulo/SP", "Resumo profissional"]),
+            _page(2, "Ana Souza", ["Experiência", "Empresa X", "Empresa Y"]),
+            _page(3, "Ana Souza", ["Formação", "Bacharelado", "Idiomas"]),
+        ]
+    )
+    cleaned = _clean(text)
+    assert cleaned.count("Ana Souza") == 1
+    assert cleaned.startswith("Ana Souza")
+    assert "Experiência" in cleaned and "Formação" in cleaned
+
+
+def test_repeated_footer_is_kept_once_and_page_numbers_dropped():
+    sections = ["Resumo", "Experiência", "Formação"]
+    text = "\n".join(
+        _page(n, section, ["Python", "SQL", "Curriculo - Ana Souza"], str(n))
+        for n, section in enumerate(sections, start=1)
+    )
+    cleaned = _clean(text)
+    assert cleaned.count("Curriculo - Ana Souza") == 1
+    assert all(section in cleaned for section in sections)
+    assert not any(line.isdigit() for line in cleaned.split("\n"))
+
+
+def test_whitespace_and_characters_are_normalised():
+    cleaned = _clean("Ana  Souza\r\n\n\n\nﬁnanças “Python”")
+    assert cleaned == 'Ana Souza\n\nfinanças "Python"'
+
+
+def test_text_is_truncated_to_the_token_budget():
+    text = "\n".join(f"Linha {n} com alguma experiência relevante" for n in range(200))
+    result = clean_ocr_text(text, token_budget=50)
+
+    assert result.truncated
+    assert result.text.endswith(TRUNCATION_MARK)
+    assert result.tokens_after <= 50
+    assert result.tokens_before == estimate_tokens(text)
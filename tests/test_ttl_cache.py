@@ -0,0 +1,57 @@
+from src.utils.ttl_cache import TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    cache = TTLCache(maxsize=4, ttl=10, clock=clock)
+    cache.set("key", "value")
+
+    clock.now = 9.9
+    assert cache.get("key") == "value"
+    clock.now = 10
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_setting_again_refreshes_the_ttl():
+    clock = Clock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("key", 1)
+    clock.now = 8
+    cache.set("key", 2)
+    clock.now = 15
+    assert cache.get("key") == 2
+
+
+def test_zero_size_or_ttl_disables_the_cache():
+    for cache in (TTLCache(maxsize=0, ttl=60), TTLCache(maxsize=4, ttl=0)):
+        cache.set("key", "value")
+        assert not cache.enabled
+        assert cache.get("key") is None
+
+
+def test_clear_empties_the_cache():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("key", "value")
+    cache.clear()
+    assert cache.get("key") is None
@@ -0,0 +1,80 @@
+import pytest
+from fastapi import APIRouter, FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+from starlette.formparsers import MultiPartParser
+
+from src.utils.uploads import MEGABYTE, UploadLimits, limited_upload_route
+
+BOUNDARY = "limits-test"
+
+
+def _app(limits, seen):
+    router = APIRouter(route_class=limited_upload_route(limits))
+
+    @router.post("/upload")
+    async def upload(files: list[UploadFile] = File(...)):
+        seen.extend(files)
+        return {"files": len(files)}
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def _multipart(*files):
+    body = b""
+    for name, data in files:
+        body += (
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="files"; filename="{name}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode() + data + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+def _chunked(body, size=64 * 1024):
+    """Stream the body without a Content-Length, as a chunked upload would."""
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+LIMITS = UploadLimits(max_file_bytes=MEGABYTE, max_request_bytes=2 * MEGABYTE, spool_bytes=1024)
+HEADERS = {"content-type": f"multipart/form-data; boundary={BOUNDARY}"}
+
+
+def test_content_length_over_the_limit_is_refused_before_parsing():
+    seen = []
+    body = _multipart(("a.pdf", b"x" * (3 * MEGABYTE)))
+    response = _app(LIMITS, seen).post("/upload", content=body, headers=HEADERS)
+
+    assert response.status_code == 413
+    assert "2 MB" in response.json()["detail"]
+    assert not seen
+
+
+@pytest.mark.parametrize(
+    "files, detail",
+    [
+        ([("big.pdf", b"x" * (MEGABYTE + 1))], "big.pdf"),
+        ([(f"{n}.pdf", b"x" * (MEGABYTE - 10)) for n in range(3)], "2 MB"),
+    ],
+)
+def test_limits_are_enforced_while_streaming(files, detail):
+    seen = []
+    body = _multipart(*files)
+    response = _app(LIMITS, seen).post("/upload", content=_chunked(body), headers=HEADERS)
+
+    assert response.status_code == 413
+    assert detail in response.json()["detail"]
+    assert not seen
+
+
+def test_spool_size_is_scoped_to_the_route():
+    seen = []
+    default_spool = MultiPartParser.spool_max_size
+    body = _multipart(("small.png", b"y" * 100), ("large.png", b"z" * 4096))
+    response = _app(LIMITS, seen).post("/upload", content=body, headers=HEADERS)
+
+    assert response.status_code == 200
+    assert [upload.file._rolled for upload in seen] == [False, True]
+    assert MultiPartParser.spool_max_size == default_spool
@@ -0,0 +1,20 @@
+import logging
+
+from src.modules.logs import log_controller
+from src.modules.pipeline import pipeline_controller
+from src.utils import warmup
+from src.utils.llm_settings import LLMConfigurationError
+
+
+def test_workers_boot_without_llm_settings(monkeypatch, mongo, caplog):
+    def missing_key():
+        raise LLMConfigurationError("Environment variable LLM_API_KEY is required")
+
+    monkeypatch.setattr(pipeline_controller, "get_service", missing_key)
+    log_controller.get_service.cache_clear()
+    try:
+        with caplog.at_level(logging.WARNING, logger=warmup.__name__):
+            warmup.warm_worker()
+    finally:
+        log_controller.get_service.cache_clear()
+    assert "LLM_API_KEY" in caplog.text